@@ -8,8 +8,6 @@ pip install -r requirements.txt
 # Convert static asset files
 python manage.py collectstatic --no-input
 
-# Apply any outstanding database migrations
-python manage.py migrate
-
-# Seed baseline data so new environments have restaurants/offers
-python manage.py loaddata fixtures/mock_restaurants.json fixtures/mock_offers.json
+# Apply outstanding migrations and seed baseline restaurants/offers; steps
+# with nothing new since the last boot are skipped
+python manage.py boot
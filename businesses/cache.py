@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from hartazone.cache import acache
+from hartazone.compression import compress, compressed_copies, compression_level
+
+MENU_VERSION_KEY = "menu-version:{business_id}"
+RESTAURANT_SNAPSHOT_KEY = "restaurant-detail:{business_id}:{variant}"
+# "full" is the default `RestaurantSerializer` payload; "normalized" carries
+# modifier group references plus a top-level `modifierGroups` map.
+SNAPSHOT_VARIANTS = ("full", "normalized")
+
+
+@dataclass(frozen=True)
+class RestaurantSnapshot:
+    """
+    Serialized `RestaurantSerializer` output tagged with the menu version it was built from.
+
+    When pre-rendering is enabled `body` holds the rendered JSON bytes and
+    `gzip_body`/`br_body` their gzip and Brotli encodings, so hits can skip
+    the renderer and the compressor entirely.
+    """
+
+    business_id: int
+    version: int
+    data: dict[str, Any]
+    body: bytes | None = None
+    gzip_body: bytes | None = None
+    variant: str = "full"
+    br_body: bytes | None = None
+
+    @property
+    def etag(self) -> str:
+        return restaurant_etag(self.business_id, self.version, variant=self.variant)
+
+    @property
+    def gzip_etag(self) -> str:
+        return restaurant_etag(self.business_id, self.version, variant=self.variant, encoding="gzip")
+
+    @property
+    def encoded_bodies(self) -> dict[str, bytes]:
+        """The compressed copies of `body`, by content coding."""
+        bodies = {"br": self.br_body, "gzip": self.gzip_body}
+        return {encoding: body for encoding, body in bodies.items() if body is not None}
+
+
+def restaurant_etag(
+    business_id: int,
+    version: int,
+    variant: str = "full",
+    encoding: str | None = None,
+) -> str:
+    """Strong ETag for one variant and encoding of a restaurant detail at a given menu version."""
+    parts = [f"r{business_id}", f"v{version}"]
+    if variant != "full":
+        parts.append(variant)
+    if encoding:
+        parts.append(encoding)
+    return f'"{"-".join(parts)}"'
+
+
+def _initial_version() -> int:
+    # Seeding from the clock keeps versions increasing even when the counter
+    # is evicted, so a stale snapshot can never match a re-created version.
+    return time.time_ns() // 1000
+
+
+def get_menu_version(business_id: int) -> int:
+    key = MENU_VERSION_KEY.format(business_id=business_id)
+    version = cache.get(key)
+    if version is None:
+        version = _initial_version()
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+async def aget_menu_version(business_id: int) -> int:
+    key = MENU_VERSION_KEY.format(business_id=business_id)
+    version = await acache("get", key)
+    if version is None:
+        version = _initial_version()
+        if not await acache("add", key, version, timeout=None):
+            version = await acache("get", key, version)
+    return version
+
+
+def _next_menu_version(business_id: int) -> int:
+    key = MENU_VERSION_KEY.format(business_id=business_id)
+    try:
+        version = cache.incr(key)
+    except ValueError:
+        version = _initial_version()
+        cache.set(key, version, timeout=None)
+    cache.delete_many(
+        [RESTAURANT_SNAPSHOT_KEY.format(business_id=business_id, variant=variant) for variant in SNAPSHOT_VARIANTS]
+    )
+    return version
+
+
+def bump_menu_version(business_id: int) -> int:
+    """
+    Move a business to a new menu version and drop its cached snapshot.
+
+    Inside a transaction the version moves again once it commits: until
+    then other connections still read the old rows, and anything they
+    cached under the first new version must not outlive the commit.
+    """
+    version = _next_menu_version(business_id)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(partial(_next_menu_version, business_id))
+    return version
+
+
+def get_restaurant_snapshot(business_id: int, variant: str = "full") -> RestaurantSnapshot | None:
+    return cache.get(RESTAURANT_SNAPSHOT_KEY.format(business_id=business_id, variant=variant))
+
+
+async def aget_restaurant_snapshot(business_id: int, variant: str = "full") -> RestaurantSnapshot | None:
+    return await acache("get", RESTAURANT_SNAPSHOT_KEY.format(business_id=business_id, variant=variant))
+
+
+def store_restaurant_snapshot(
+    business_id: int,
+    version: int,
+    data: dict[str, Any],
+    body: bytes | None = None,
+    variant: str = "full",
+) -> RestaurantSnapshot:
+    """
+    Cache `data` (and its rendered `body`, if given) as the snapshot for `version`.
+
+    `version` must be read before the data is built; if the menu changed in
+    the meantime the snapshot is returned but not cached.
+    """
+    copies = compressed_copies(body) if body is not None else {}
+    if body is not None and "gzip" not in copies and settings.RESTAURANT_DETAIL_PRERENDER_GZIP:
+        copies["gzip"] = compress(body, "gzip", compression_level("gzip", cached=True))
+    snapshot = RestaurantSnapshot(
+        business_id=business_id,
+        version=version,
+        data=data,
+        body=body,
+        gzip_body=copies.get("gzip"),
+        variant=variant,
+        br_body=copies.get("br"),
+    )
+    if get_menu_version(business_id) == version:
+        cache.set(
+            RESTAURANT_SNAPSHOT_KEY.format(business_id=business_id, variant=variant),
+            snapshot,
+            timeout=settings.RESTAURANT_DETAIL_CACHE_TIMEOUT,
+        )
+    return snapshot
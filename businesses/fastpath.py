@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Any
+
+from menu.fastpath import FOOD_ITEM_DETAIL_FIELDS, Row, percentage
+from menu.models import format_eta, format_price
+from .serializers import background_for
+
+# Plain-function counterparts of the home discovery serializers; see
+# `menu.fastpath` for the conventions.
+
+HOME_PRODUCT_FIELDS = FOOD_ITEM_DETAIL_FIELDS
+RESTAURANT_CARD_FIELDS = ("id", "name", "tagline", "image_url", "hero_image_url", "average_rating")
+
+
+def restaurant_card(row: Row) -> dict[str, Any]:
+    """`HomeRestaurantCardSerializer` for a row with `RESTAURANT_CARD_FIELDS`."""
+    return {
+        "id": str(row["id"]),
+        "name": row["name"],
+        "tagline": row["tagline"],
+        "image": row["hero_image_url"] or row["image_url"] or "",
+        "background": background_for(row["id"]),
+    }
+
+
+def restaurant_summary(row: Row) -> dict[str, Any]:
+    """`RestaurantSummarySerializer` for a row with `RESTAURANT_CARD_FIELDS`."""
+    rating = row["average_rating"]
+    return {
+        "id": str(row["id"]),
+        "name": row["name"],
+        "score": "" if rating is None else f"{rating:.1f}",
+        "background": background_for(row["id"]),
+        "image": row["image_url"] or row["hero_image_url"] or "",
+    }
+
+
+def home_product(row: Row, modifiers: list[dict[str, Any]]) -> dict[str, Any]:
+    """`HomeProductSerializer` for a row with `HOME_PRODUCT_FIELDS`."""
+    return {
+        "id": str(row["id"]),
+        "name": row["name"],
+        "description": row["description"],
+        "price": format_price(row["price"], row["currency"]),
+        "discount": row["is_discounted"],
+        "percentage": percentage(row["discount_percentage"]),
+        "restaurantId": str(row["business_id"]),
+        "restaurantName": row["business__name"],
+        "shop": row["business__name"],
+        "background": background_for(row["id"]),
+        "image": row["image_url"] or "",
+        "info": row["description"] or "",
+        "modifiers": modifiers,
+    }
+
+
+def most_ordered_item(row: Row, modifiers: list[dict[str, Any]]) -> dict[str, Any]:
+    """`MostOrderedItemSerializer` for a row with `HOME_PRODUCT_FIELDS`."""
+    return {
+        "id": str(row["id"]),
+        "title": row["name"],
+        "restaurantId": str(row["business_id"]),
+        "restaurant": row["business__name"],
+        "price": format_price(row["price"], row["currency"]),
+        "eta": format_eta(row["preparation_time_minutes"]) or "",
+        "description": row["description"],
+        "background": background_for(f"most-{row['id']}"),
+        "image": row["image_url"] or "",
+        "discount": row["is_discounted"],
+        "percentage": percentage(row["discount_percentage"]),
+        "modifiers": modifiers,
+    }
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import math
+from decimal import Decimal
+from typing import Any
+
+from django.db.models import Q, QuerySet
+
+# Businesses are bucketed into a fixed grid of CELL_DEGREES x CELL_DEGREES
+# cells (about 1.1 km at the equator) stored in `Business.geo_cell` as
+# `row * GRID_COLUMNS + column`, so each grid row is a contiguous range of
+# cell ids and any rectangle of cells is one indexed range per row. The grid
+# does not wrap at the antimeridian.
+CELL_DEGREES = 0.01
+GRID_ROWS = round(180 / CELL_DEGREES)
+GRID_COLUMNS = round(360 / CELL_DEGREES)
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def _row(latitude: float) -> int:
+    return min(GRID_ROWS - 1, max(0, math.floor((latitude + 90) / CELL_DEGREES)))
+
+
+def _column(longitude: float) -> int:
+    return min(GRID_COLUMNS - 1, max(0, math.floor((longitude + 180) / CELL_DEGREES)))
+
+
+def cell_for(latitude: Decimal | float | None, longitude: Decimal | float | None) -> int | None:
+    """The grid cell id for a coordinate, or None when either part is missing."""
+    if latitude is None or longitude is None:
+        return None
+    return _row(float(latitude)) * GRID_COLUMNS + _column(float(longitude))
+
+
+def distance_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two coordinates (haversine)."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _square(row: int, column: int, rings: int, column_rings: int | None = None) -> list[tuple[int, int, int]]:
+    """`(row, first column, last column)` spans of the cells within `rings` rows and `column_rings` columns of a cell."""
+    column_rings = rings if column_rings is None else column_rings
+    first, last = max(0, column - column_rings), min(GRID_COLUMNS - 1, column + column_rings)
+    return [(r, first, last) for r in range(max(0, row - rings), min(GRID_ROWS - 1, row + rings) + 1)]
+
+
+def _annulus(row: int, column: int, inner: int, outer: int, outer_columns: int | None = None) -> Q:
+    """
+    Cells within `outer` rings (and `outer_columns` columns) of a cell but not within `inner`.
+
+    `inner=-1` includes the centre. Adjacent ranges, such as rows that span
+    every column, are merged, so the condition stays short near the poles.
+    """
+    ranges: list[tuple[int, int]] = []
+    for r, first, last in _square(row, column, outer, outer_columns):
+        spans = [(first, last)]
+        if inner >= 0 and abs(r - row) <= inner:
+            spans = [(first, column - inner - 1), (column + inner + 1, last)]
+        for start, end in spans:
+            if start > end:
+                continue
+            start, end = r * GRID_COLUMNS + start, r * GRID_COLUMNS + end
+            if ranges and ranges[-1][1] + 1 == start:
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((start, end))
+    condition = Q(pk__in=[])
+    for start, end in ranges:
+        condition |= Q(geo_cell__range=(start, end))
+    return condition
+
+
+def _searched_km(latitude: float, rings: int) -> float:
+    """Distance from a point to the nearest cell outside the `rings` around its own cell."""
+    if rings < 1:
+        return 0.0
+    farthest = min(90.0, abs(latitude) + (rings + 1) * CELL_DEGREES)
+    cell_width = CELL_DEGREES * KM_PER_DEGREE * math.cos(math.radians(farthest))
+    return rings * min(CELL_DEGREES * KM_PER_DEGREE, cell_width)
+
+
+def _column_rings(latitude: float, rings: int, radius_km: float) -> int:
+    """Columns either side of a point that cover `radius_km` within `rings` rows of it."""
+    farthest = min(90.0, abs(latitude) + (rings + 1) * CELL_DEGREES)
+    cell_width = CELL_DEGREES * KM_PER_DEGREE * max(0.0, math.cos(math.radians(farthest)))
+    if cell_width * GRID_COLUMNS <= radius_km:
+        return GRID_COLUMNS
+    return min(GRID_COLUMNS, math.ceil(radius_km / cell_width))
+
+
+def nearest(
+    queryset: QuerySet, latitude: float, longitude: float, radius_km: float, limit: int
+) -> list[tuple[Any, float]]:
+    """
+    The `limit` rows of `queryset` closest to a point and within `radius_km`.
+
+    Returns `(pk, distance in km)` pairs, nearest first. The search starts
+    at the point's own grid cell and widens the square of cells around it,
+    doubling the number of rings each round, until the `limit`-th candidate
+    is closer than any cell not yet searched or the radius is covered. Each
+    round is one query over the `geo_cell` index that only reads the newly
+    added ring. Once the rings reach the radius north and south, where
+    cells narrow towards the poles, one last round reads the rest of the
+    rectangle that covers it east and west.
+    """
+    row, column = _row(latitude), _column(longitude)
+    radius_rings = max(1, math.ceil(radius_km / (CELL_DEGREES * KM_PER_DEGREE)))
+    found: list[tuple[float, Any]] = []
+    searched, rings = -1, 0
+    while True:
+        covering = rings >= radius_rings
+        if covering:
+            rings, columns = radius_rings, _column_rings(latitude, radius_rings, radius_km)
+        else:
+            columns = rings
+        candidates = queryset.filter(_annulus(row, column, searched, rings, columns)).values_list(
+            "pk", "latitude", "longitude"
+        )
+        for pk, lat, lng in candidates:
+            distance = distance_km(latitude, longitude, float(lat), float(lng))
+            if distance <= radius_km:
+                found.append((distance, pk))
+        found.sort(key=lambda entry: entry[0])
+        if covering:
+            break
+        reach = _searched_km(latitude, rings)
+        if reach >= radius_km or (len(found) >= limit and found[limit - 1][0] <= reach):
+            break
+        searched, rings = rings, max(1, rings * 2)
+    return [(pk, distance) for distance, pk in found[:limit]]
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from typing import Any, Iterable
+
+from asgiref.sync import sync_to_async
+from django.db.models import QuerySet
+
+from menu.fastpath import load_item_modifiers
+from menu.models import FoodItem
+from . import fastpath
+from .geo import nearest
+from .hours import filter_open
+from .models import Business
+
+HOME_CACHE_KEY = "home-discovery"
+HOME_SECTIONS = ("featuredRestaurants", "mostOrderedThisWeek", "nearYouRestaurants", "featuredProducts")
+
+
+def build_home(
+    sections: Iterable[str] = HOME_SECTIONS, with_modifiers: bool = True, open_at: datetime | None = None
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    The home discovery payload in at most six queries.
+
+    Each requested section is one ordered `.values()` query; both product
+    sections then share a single modifier load. Sections are returned in
+    `HOME_SECTIONS` order regardless of the order they were asked for. With
+    `open_at`, only restaurants open at that moment, and their products, are
+    included.
+    """
+    rows = {name: list(query) for name, query in _section_queries(sections, open_at).items()}
+    ids = _product_ids(rows)
+    modifiers = load_item_modifiers(ids) if with_modifiers and ids else {}
+    return _render_home(rows, modifiers, with_modifiers)
+
+
+async def abuild_home(open_at: datetime | None = None) -> dict[str, list[dict[str, Any]]]:
+    """`build_home()` for async views, with the section queries run concurrently."""
+    queries = _section_queries(HOME_SECTIONS, open_at)
+    results = await asyncio.gather(*(_alist(query) for query in queries.values()))
+    rows = dict(zip(queries, results))
+    ids = _product_ids(rows)
+    modifiers = await sync_to_async(load_item_modifiers)(ids) if ids else {}
+    return _render_home(rows, modifiers, with_modifiers=True)
+
+
+async def _alist(query: QuerySet) -> list[Any]:
+    return [row async for row in query]
+
+
+def _section_queries(sections: Iterable[str], open_at: datetime | None) -> dict[str, QuerySet]:
+    wanted = set(sections)
+    businesses = Business.objects.all()
+    available_items = FoodItem.objects.filter(is_available=True)
+    if open_at is not None:
+        businesses = filter_open(businesses, open_at)
+        available_items = filter_open(available_items, open_at, business="business")
+    businesses = businesses.values(*fastpath.RESTAURANT_CARD_FIELDS)
+    available_items = available_items.values(*fastpath.HOME_PRODUCT_FIELDS)
+
+    queries: dict[str, QuerySet] = {}
+    if "featuredRestaurants" in wanted:
+        queries["featuredRestaurants"] = businesses.order_by("-average_rating", "-review_count")[:5]
+    if "mostOrderedThisWeek" in wanted:
+        queries["mostOrderedThisWeek"] = available_items.order_by(
+            "-is_discounted", "-discount_percentage", "-created_at"
+        )[:6]
+    if "nearYouRestaurants" in wanted:
+        queries["nearYouRestaurants"] = businesses.order_by("delivery_time_minutes_min", "name")[:6]
+    if "featuredProducts" in wanted:
+        queries["featuredProducts"] = available_items.order_by("-discount_percentage", "-is_discounted", "name")[:8]
+    return queries
+
+
+def _product_ids(rows: dict[str, list[dict[str, Any]]]) -> set[int]:
+    return {row["id"] for name in ("mostOrderedThisWeek", "featuredProducts") for row in rows.get(name, ())}
+
+
+def _render_home(
+    rows: dict[str, list[dict[str, Any]]], modifiers: dict[int, list[dict[str, Any]]], with_modifiers: bool
+) -> dict[str, list[dict[str, Any]]]:
+    renderers = {
+        "featuredRestaurants": fastpath.restaurant_card,
+        "mostOrderedThisWeek": lambda row: fastpath.most_ordered_item(row, modifiers.get(row["id"], [])),
+        "nearYouRestaurants": fastpath.restaurant_summary,
+        "featuredProducts": lambda row: fastpath.home_product(row, modifiers.get(row["id"], [])),
+    }
+    payload = {name: [renderers[name](row) for row in rows[name]] for name in HOME_SECTIONS if name in rows}
+    if not with_modifiers:
+        for name in ("mostOrderedThisWeek", "featuredProducts"):
+            for entry in payload.get(name, ()):
+                del entry["modifiers"]
+    return payload
+
+
+def build_near_you(
+    latitude: float, longitude: float, radius_km: float, limit: int = 6, open_at: datetime | None = None
+) -> list[dict[str, Any]]:
+    """`nearYouRestaurants` for a point: the nearest restaurants, each with a `distanceKm`."""
+    candidates = Business.objects.all() if open_at is None else filter_open(Business.objects.all(), open_at)
+    matches = nearest(candidates, latitude, longitude, radius_km, limit)
+    rows = Business.objects.filter(pk__in=[pk for pk, _ in matches]).values(*fastpath.RESTAURANT_CARD_FIELDS)
+    rows_by_pk = {row["id"]: row for row in rows}
+    return [
+        {**fastpath.restaurant_summary(rows_by_pk[pk]), "distanceKm": round(distance, 2)}
+        for pk, distance in matches
+        if pk in rows_by_pk
+    ]
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import math
+from datetime import datetime, time, timedelta
+from typing import Iterable
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db.models import F, QuerySet
+from django.utils import timezone
+
+# A business's week is compiled into one bitmap per day, stored on
+# `Business.open_slots_<day>`: bit `n` is set when the business is open for
+# the whole of the `n`-th SLOT_MINUTES slot of that day, in
+# `settings.BUSINESS_TIME_ZONE`. Partially open slots count as closed, so a
+# business opening at 10:15 shows as open from 10:30 and is never listed as
+# open while it is closed. Answering "open now" is then one bitwise AND on a
+# column of the business row.
+SLOT_MINUTES = 30
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+OPEN_SLOT_FIELDS = (
+    "open_slots_mon",
+    "open_slots_tue",
+    "open_slots_wed",
+    "open_slots_thu",
+    "open_slots_fri",
+    "open_slots_sat",
+    "open_slots_sun",
+)
+_WEEK_SLOTS = 7 * SLOTS_PER_DAY
+
+
+def _minute(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def compile_week(hours: Iterable[tuple[int, time, time]]) -> dict[str, int]:
+    """
+    `OPEN_SLOT_FIELDS` values for `(day_of_week, open_time, close_time)` rows.
+
+    A close time at or before the open time runs past midnight into the next
+    day (Sunday into Monday), and equal times mean open around the clock.
+    """
+    week = 0
+    for day, opens, closes in hours:
+        start, end = _minute(opens), _minute(closes)
+        if end <= start:
+            end += 24 * 60
+        first = day * SLOTS_PER_DAY + math.ceil(start / SLOT_MINUTES)
+        last = day * SLOTS_PER_DAY + end // SLOT_MINUTES
+        for slot in range(first, last):
+            week |= 1 << (slot % _WEEK_SLOTS)
+    day_mask = (1 << SLOTS_PER_DAY) - 1
+    return {
+        field: (week >> (day * SLOTS_PER_DAY)) & day_mask for day, field in enumerate(OPEN_SLOT_FIELDS)
+    }
+
+
+def refresh_open_slots(business_id: int) -> None:
+    """Recompile one business's bitmaps from its `BusinessHours` rows."""
+    from .models import Business, BusinessHours
+
+    rows = BusinessHours.objects.filter(business_id=business_id).values_list(
+        "day_of_week", "open_time", "close_time"
+    )
+    Business.objects.filter(pk=business_id).update(**compile_week(rows))
+
+
+def local_slot(moment: datetime | None = None) -> tuple[int, int]:
+    """`(day_of_week, slot)` for a moment (default now) in the businesses' time zone."""
+    local = timezone.localtime(moment or timezone.now(), ZoneInfo(settings.BUSINESS_TIME_ZONE))
+    return local.weekday(), _minute(local.time()) // SLOT_MINUTES
+
+
+def seconds_left_in_slot(moment: datetime | None = None) -> float:
+    """Seconds until the slot containing `moment` (default now) ends."""
+    moment = moment or timezone.now()
+    local = timezone.localtime(moment, ZoneInfo(settings.BUSINESS_TIME_ZONE))
+    start = local.replace(minute=local.minute - local.minute % SLOT_MINUTES, second=0, microsecond=0)
+    return (start + timedelta(minutes=SLOT_MINUTES) - local).total_seconds()
+
+
+def filter_open(queryset: QuerySet, moment: datetime | None = None, business: str = "") -> QuerySet:
+    """
+    Rows of `queryset` whose business is open at `moment` (default now).
+
+    `business` is the lookup path from the queryset's model to `Business`,
+    e.g. `"business"` for menu items.
+    """
+    day, slot = local_slot(moment)
+    field = f"{business}__{OPEN_SLOT_FIELDS[day]}" if business else OPEN_SLOT_FIELDS[day]
+    return queryset.alias(open_slot=F(field).bitand(1 << slot)).filter(open_slot__gt=0)
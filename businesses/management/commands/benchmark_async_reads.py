@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from businesses.models import Business
+
+
+async def _get(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, path: str) -> int:
+    """One keep-alive GET; returns the status code once the body has been read."""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nAccept: application/json\r\n\r\n".encode())
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    elif headers.get("transfer-encoding") == "chunked":
+        while size := int((await reader.readline()).strip(), 16):
+            await reader.readexactly(size + 2)
+        await reader.readline()
+    return status
+
+
+async def _load(port: int, paths: list[str], connections: int, total: int) -> tuple[float, list[float], int]:
+    """Send `total` requests over `connections` keep-alive connections; returns (seconds, latencies, errors)."""
+    remaining = iter(range(total))
+    latencies: list[float] = []
+    errors = 0
+
+    async def client():
+        nonlocal errors
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            for index in remaining:
+                started = time.perf_counter()
+                if await _get(reader, writer, paths[index % len(paths)]) != 200:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+        finally:
+            writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(connections)))
+    return time.perf_counter() - started, latencies, errors
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares requests per second and latency of the catalogue reads under uvicorn with the sync "
+        "DRF views and with the async read views (ASYNC_READ_VIEWS). Uses the configured database; "
+        "run `manage.py boot` first so it has restaurants."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", 1)))
+        parser.add_argument("--connections", type=int, default=32)
+        parser.add_argument("--requests", type=int, default=3000)
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--paths", nargs="+")
+
+    def handle(self, *args, **options):
+        business = Business.objects.order_by("pk").first()
+        if business is None:
+            raise CommandError("No restaurants in the database; run `manage.py boot` first.")
+        paths = options["paths"] or [
+            "/api/home/",
+            "/api/offers/",
+            "/api/restaurants/",
+            f"/api/restaurants/{business.pk}/",
+        ]
+        self.stdout.write(
+            f"{options['workers']} uvicorn worker(s), {options['connections']} connections, "
+            f"{options['requests']} requests over {', '.join(paths)}"
+        )
+        for mode, flag in (("sync", "0"), ("async", "1")):
+            server = self._start(options["port"], options["workers"], flag)
+            try:
+                asyncio.run(_load(options["port"], paths, options["connections"], len(paths) * 20))
+                elapsed, latencies, errors = asyncio.run(
+                    _load(options["port"], paths, options["connections"], options["requests"])
+                )
+            finally:
+                server.terminate()
+                server.wait(timeout=10)
+            latencies.sort()
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            self.stdout.write(
+                f"{mode:<6} {len(latencies) / elapsed:8.1f} req/s   "
+                f"p50 {statistics.median(latencies) * 1000:6.1f} ms   p99 {p99 * 1000:6.1f} ms   "
+                f"errors {errors}"
+            )
+
+    @staticmethod
+    def _start(port: int, workers: int, async_reads: str) -> subprocess.Popen:
+        env = {
+            **os.environ,
+            "ASYNC_READ_VIEWS": async_reads,
+            "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "hartazone.settings"),
+        }
+        server = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "hartazone.asgi:application",
+                "--port", str(port), "--workers", str(workers), "--log-level", "warning", "--no-access-log",
+            ],
+            cwd=settings.BASE_DIR,
+            env=env,
+        )
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                return server
+            except OSError:
+                time.sleep(0.1)
+        server.terminate()
+        raise CommandError("uvicorn did not start within 30 seconds.")
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, close_old_connections, connections, transaction
+
+from hartazone.database import database_config
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares SQLite with Django's defaults (a new connection per request, rollback journal) against "
+        "the tuned configuration (persistent connections, WAL, IMMEDIATE transactions): per-request "
+        "connection overhead, and throughput of concurrent read-then-write transactions. Uses scratch "
+        "database files; the configured database is only timed for connection setup."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000, help="Simulated requests per configuration.")
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--writes", type=int, default=200, help="Transactions per thread.")
+
+    def handle(self, *args, **options):
+        # Scratch files live next to the real database, on the same disk.
+        with tempfile.TemporaryDirectory(dir=settings.BASE_DIR) as directory:
+            scratch = Path(directory)
+            aliases = {
+                "defaults": {"ENGINE": "django.db.backends.sqlite3", "NAME": scratch / "defaults.sqlite3"},
+                "tuned": database_config(None, scratch / "tuned.sqlite3"),
+            }
+            default = connections.settings["default"]
+            if default["ENGINE"] != "django.db.backends.sqlite3":
+                aliases[f"{connections['default'].vendor}, new connection"] = {**default, "CONN_MAX_AGE": 0}
+                aliases[f"{connections['default'].vendor}, configured"] = dict(default)
+            for alias, config in aliases.items():
+                connections.settings[alias] = connections.configure_settings({"default": {}, alias: config})[alias]
+            try:
+                self.stdout.write(f"Connection overhead, {options['requests']} requests running one SELECT:")
+                for alias in aliases:
+                    self._requests(alias, options["requests"])
+                self.stdout.write(
+                    f"Write contention, {options['threads']} threads x {options['writes']} read-then-write "
+                    "transactions:"
+                )
+                for alias in ("defaults", "tuned"):
+                    self._contention(alias, options["threads"], options["writes"])
+            finally:
+                for alias in aliases:
+                    connections[alias].close()
+                    del connections.settings[alias]
+                    delattr(connections._connections, alias)
+
+    def _requests(self, alias: str, count: int) -> None:
+        """Time requests the way Django runs them, closing obsolete connections at both ends."""
+        connection = connections[alias]
+        latencies = []
+        for _ in range(count):
+            started = time.perf_counter()
+            close_old_connections()
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            close_old_connections()
+            latencies.append(time.perf_counter() - started)
+        self.stdout.write(
+            f"  {alias:<22} mean {statistics.fmean(latencies) * 1e6:7.0f} us   "
+            f"p50 {statistics.median(latencies) * 1e6:7.0f} us"
+        )
+
+    def _contention(self, alias: str, threads: int, writes: int) -> None:
+        with connections[alias].cursor() as cursor:
+            cursor.execute("CREATE TABLE benchmark (id INTEGER PRIMARY KEY, total INTEGER NOT NULL)")
+        committed, locked = [0], [0]
+        lock = threading.Lock()
+
+        def worker() -> None:
+            try:
+                for _ in range(writes):
+                    try:
+                        # Read, then write: the shape of placing an order or updating stock.
+                        with transaction.atomic(using=alias), connections[alias].cursor() as cursor:
+                            cursor.execute("SELECT COUNT(*) FROM benchmark")
+                            total = cursor.fetchone()[0]
+                            cursor.execute("INSERT INTO benchmark (total) VALUES (%s)", [total])
+                    except OperationalError:
+                        with lock:
+                            locked[0] += 1
+                    else:
+                        with lock:
+                            committed[0] += 1
+            finally:
+                connections[alias].close()
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        started = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"  {alias:<22} {committed[0] / elapsed:7.0f} commits/s   {committed[0]} committed   "
+            f"{locked[0]} failed with 'database is locked'   {elapsed:.2f} s"
+        )
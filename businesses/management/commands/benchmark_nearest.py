@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from businesses.geo import distance_km, nearest
+from businesses.models import Business
+from menu.synthetic import create_synthetic_businesses
+
+
+class Command(BaseCommand):
+    help = "Compares the grid-cell nearest search with a full scan and sort on synthetic businesses (rolled back afterwards)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--businesses", type=int, default=100_000)
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("--radius", type=float, default=10)
+        parser.add_argument("--limit", type=int, default=20)
+
+    def handle(self, *args, **options):
+        rng = random.Random(1)
+        radius, limit = options["radius"], options["limit"]
+
+        with transaction.atomic():
+            create_synthetic_businesses(options["businesses"])
+            businesses = Business.objects.all()
+            points = [(12.0 + rng.random(), -86.5 + rng.random()) for _ in range(options["queries"])]
+
+            def scan(latitude: float, longitude: float) -> list[tuple[int, float]]:
+                distances = sorted(
+                    (distance_km(latitude, longitude, float(lat), float(lng)), pk)
+                    for pk, lat, lng in businesses.values_list("pk", "latitude", "longitude")
+                )
+                return [(pk, distance) for distance, pk in distances if distance <= radius][:limit]
+
+            grid_time, grid_results = self._time(lambda p: nearest(businesses, *p, radius, limit), points)
+            scan_points = points[: max(1, len(points) // 20)]
+            scan_time, scan_results = self._time(lambda p: scan(*p), scan_points)
+
+            mismatches = sum(
+                [pk for pk, _ in grid] != [pk for pk, _ in full]
+                for grid, full in zip(grid_results, scan_results)
+            )
+            self.stdout.write(f"{businesses.count()} businesses, k={limit}, radius={radius} km")
+            self.stdout.write(f"grid  {grid_time * 1000:8.2f} ms/query over {len(points)} queries")
+            self.stdout.write(
+                f"scan  {scan_time * 1000:8.2f} ms/query over {len(scan_points)} queries   "
+                f"x{scan_time / grid_time:.1f}   mismatches {mismatches}"
+            )
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def _time(func, points) -> tuple[float, list]:
+        started = time.perf_counter()
+        results = [func(point) for point in points]
+        return (time.perf_counter() - started) / len(points), results
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from businesses.home import build_home
+from businesses.models import Business
+from businesses.serializers import RestaurantSerializer
+from hartazone.fieldsets import FieldSelection
+from hartazone.renderers import FastJSONRenderer, orjson
+from menu.models import FoodItem
+from menu.synthetic import create_synthetic_catalogue
+from offers.feed import build_offers_feed
+from offers.models import Offer, OfferCategory
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares DRF's JSONRenderer with FastJSONRenderer on the restaurant detail, home and offers "
+        "payloads of a synthetic catalogue (rolled back afterwards), checking the bytes are identical."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=200, help="Menu items per restaurant.")
+        parser.add_argument("--offers", type=int, default=60)
+        parser.add_argument("--repeat", type=int, default=200)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"orjson {orjson.__version__ if orjson else 'not installed'}")
+        with transaction.atomic():
+            business_ids = create_synthetic_catalogue(businesses=12, items_per_business=options["items"])
+            now = timezone.now()
+            Offer.objects.bulk_create(
+                Offer(
+                    title=f"Oferta {index}",
+                    description="Dos por uno en platos seleccionados",
+                    image_url=f"https://example.com/offers/{index}.jpg",
+                    savings_label=f"{10 + index % 40}% menos",
+                    category=list(OfferCategory)[index % len(OfferCategory)],
+                    business_id=business_ids[index % len(business_ids)],
+                    expires_at=now + timedelta(hours=1 + index),
+                    position=index,
+                )
+                for index in range(options["offers"])
+            )
+            business = Business.objects.get(pk=business_ids[0])
+            payloads = (
+                ("restaurant detail", RestaurantSerializer(business, context={"field_selection": FieldSelection()}).data),
+                ("home", build_home()),
+                ("offers", build_offers_feed(now).payload(now)),
+                # Fast-path style rows, which carry raw Decimals and datetimes.
+                (
+                    "raw menu rows",
+                    list(FoodItem.objects.filter(business=business).values("id", "name", "price", "discount_percentage"))
+                    + [{"id": index, "at": now, "price": Decimal("99.90")} for index in range(200)],
+                ),
+            )
+            for name, data in payloads:
+                drf = JSONRenderer().render(data)
+                fast = FastJSONRenderer().render(data)
+                drf_time = self._best_of(lambda: JSONRenderer().render(data), options["repeat"])
+                fast_time = self._best_of(lambda: FastJSONRenderer().render(data), options["repeat"])
+                self.stdout.write(
+                    f"{name:<18} {len(drf):>8} bytes   drf {drf_time * 1e6:8.0f} us   "
+                    f"fast {fast_time * 1e6:7.0f} us   x{drf_time / fast_time:.1f}   "
+                    f"{'identical' if fast == drf else 'DIFFERENT'}"
+                )
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def _best_of(func, repeat: int) -> float:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.utils.crypto import salted_hmac
+
+from businesses.models import BootStamp
+
+ADMIN_ENV = ("ADMIN_EMAIL", "ADMIN_PASSWORD", "ADMIN_FIRST_NAME", "ADMIN_LAST_NAME")
+
+
+def fixture_files() -> list[Path]:
+    return sorted((Path(settings.BASE_DIR) / "fixtures").glob("*.json"))
+
+
+def fixtures_digest(paths: list[Path]) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.name.encode() + b"\0" + path.read_bytes() + b"\0")
+    return digest.hexdigest()
+
+
+def admin_digest() -> str:
+    """
+    Fingerprint of the admin settings and the admin row they produced.
+
+    Keyed with `SECRET_KEY`, since it covers `ADMIN_PASSWORD`. It changes
+    when the environment changes or the admin user is edited or removed,
+    and costs one query instead of a PBKDF2 password check.
+    """
+    User = get_user_model()
+    email = User.objects.normalize_email(os.environ.get("ADMIN_EMAIL", "admin"))
+    row = User.objects.filter(email=email).values_list("password", "is_staff", "is_superuser", "role").first()
+    values = [os.environ.get(name, "") for name in ADMIN_ENV] + [repr(row)]
+    return salted_hmac("businesses.boot.admin", "\0".join(values)).hexdigest()
+
+
+class Command(BaseCommand):
+    help = (
+        "Prepares the database in one process: migrates, loads fixtures/*.json and ensures the admin "
+        "user, skipping each step when nothing changed since the last boot."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--collectstatic", action="store_true", help="Also collect static files.")
+        parser.add_argument("--no-admin", action="store_true", help="Do not run ensure_admin_user.")
+        parser.add_argument("--force", action="store_true", help="Run every step even if nothing changed.")
+
+    def handle(self, *args, **options):
+        self.force = options["force"]
+        started = time.perf_counter()
+        self._step("migrate", self.migrate)
+        if options["collectstatic"]:
+            self._step("collectstatic", self.collectstatic)
+        self._step("fixtures", self.load_fixtures)
+        if not options["no_admin"]:
+            self._step("admin", self.ensure_admin)
+        self.stdout.write(self.style.SUCCESS(f"Boot finished in {(time.perf_counter() - started) * 1000:.0f} ms."))
+
+    def migrate(self) -> str:
+        executor = MigrationExecutor(connection)
+        plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        if not plan and not self.force:
+            return "up to date"
+        call_command("migrate", interactive=False, verbosity=0)
+        return f"applied {len(plan)} migrations"
+
+    def collectstatic(self) -> str:
+        # Unchanged files are skipped by collectstatic itself.
+        call_command("collectstatic", interactive=False, verbosity=0)
+        return "done"
+
+    def load_fixtures(self) -> str:
+        paths = fixture_files()
+        if not paths:
+            return "no fixtures"
+        digest = fixtures_digest(paths)
+        if not self._changed("fixtures", digest):
+            return "unchanged"
+        call_command("loaddata", *map(str, paths), verbosity=0)
+        self._stamp("fixtures", digest)
+        return f"loaded {len(paths)} files"
+
+    def ensure_admin(self) -> str:
+        if not self._changed("admin", admin_digest()):
+            return "unchanged"
+        call_command("ensure_admin_user", stdout=self.stdout)
+        self._stamp("admin", admin_digest())
+        return "ensured"
+
+    def _changed(self, step: str, digest: str) -> bool:
+        return self.force or not BootStamp.objects.filter(step=step, digest=digest).exists()
+
+    @staticmethod
+    def _stamp(step: str, digest: str) -> None:
+        BootStamp.objects.update_or_create(step=step, defaults={"digest": digest})
+
+    def _step(self, name: str, func) -> None:
+        started = time.perf_counter()
+        outcome = func()
+        self.stdout.write(f"{name:<14} {outcome} ({(time.perf_counter() - started) * 1000:.0f} ms)")
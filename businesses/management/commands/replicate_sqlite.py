@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from hartazone.replicas import REPLICA_DB_ALIAS, copy_sqlite_database, replica_configured
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulates a lagging read replica locally: copies the primary SQLite database over the replica "
+        "every --lag seconds. Set REPLICA_DATABASE_URL=sqlite:///replica.sqlite3 for the server too, with a "
+        "shared cache such as CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lag", type=float, default=2, help="Seconds between copies.")
+        parser.add_argument("--once", action="store_true", help="Copy once and exit.")
+
+    def handle(self, *args, **options):
+        if not replica_configured():
+            raise CommandError(f"No {REPLICA_DB_ALIAS!r} database; set REPLICA_DATABASE_URL.")
+        while True:
+            started = time.perf_counter()
+            try:
+                copy_sqlite_database()
+            except ImproperlyConfigured as error:
+                raise CommandError(error) from error
+            self.stdout.write(f"replicated in {(time.perf_counter() - started) * 1000:.0f} ms")
+            if options["once"]:
+                return
+            time.sleep(options["lag"])
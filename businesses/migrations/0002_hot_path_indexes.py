@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-17 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businesses', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='business',
+            index=models.Index(fields=['name', 'id'], name='businesses_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='business',
+            index=models.Index(fields=['-average_rating', '-review_count', 'id'], name='businesses_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='business',
+            index=models.Index(fields=['delivery_time_minutes_min', 'name', 'id'], name='businesses_delivery_time_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-17 22:44
+
+from django.db import migrations, models
+
+from businesses.geo import cell_for
+
+
+def fill_geo_cells(apps, schema_editor):
+    Business = apps.get_model("businesses", "Business")
+    businesses = list(Business.objects.exclude(latitude=None).exclude(longitude=None))
+    for business in businesses:
+        business.geo_cell = cell_for(business.latitude, business.longitude)
+    Business.objects.bulk_update(businesses, ["geo_cell"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businesses', '0002_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='business',
+            name='geo_cell',
+            field=models.BigIntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.RunPython(fill_geo_cells, migrations.RunPython.noop),
+    ]
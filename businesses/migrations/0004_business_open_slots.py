@@ -0,0 +1,68 @@
+# Generated by Django 5.2.6 on 2026-10-17 22:55
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+from businesses.hours import OPEN_SLOT_FIELDS, compile_week
+
+
+def compile_open_slots(apps, schema_editor):
+    Business = apps.get_model("businesses", "Business")
+    BusinessHours = apps.get_model("businesses", "BusinessHours")
+    hours = defaultdict(list)
+    for business_id, *row in BusinessHours.objects.values_list(
+        "business_id", "day_of_week", "open_time", "close_time"
+    ):
+        hours[business_id].append(row)
+    businesses = list(Business.objects.filter(pk__in=hours))
+    for business in businesses:
+        for field, value in compile_week(hours[business.pk]).items():
+            setattr(business, field, value)
+    Business.objects.bulk_update(businesses, OPEN_SLOT_FIELDS, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businesses', '0003_business_geo_cell'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='business',
+            name='open_slots_fri',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='business',
+            name='open_slots_mon',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='business',
+            name='open_slots_sat',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='business',
+            name='open_slots_sun',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='business',
+            name='open_slots_thu',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='business',
+            name='open_slots_tue',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='business',
+            name='open_slots_wed',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(compile_open_slots, migrations.RunPython.noop),
+    ]
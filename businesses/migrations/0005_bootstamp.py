@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-17 23:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businesses', '0004_business_open_slots'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BootStamp',
+            fields=[
+                ('step', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('digest', models.CharField(max_length=64)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
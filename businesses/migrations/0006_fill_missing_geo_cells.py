@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-18 09:12
+
+from django.db import migrations
+
+from businesses.geo import cell_for
+
+
+def fill_missing_geo_cells(apps, schema_editor):
+    # Fixtures loaded after 0003 skipped Business.save() and left the cell empty.
+    Business = apps.get_model("businesses", "Business")
+    businesses = list(Business.objects.filter(geo_cell=None).exclude(latitude=None).exclude(longitude=None))
+    for business in businesses:
+        business.geo_cell = cell_for(business.latitude, business.longitude)
+    Business.objects.bulk_update(businesses, ["geo_cell"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businesses', '0005_bootstamp'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_missing_geo_cells, migrations.RunPython.noop),
+    ]
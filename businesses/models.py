@@ -1,5 +1,8 @@
 from django.db import models
 
+from .geo import cell_for
+from .hours import compile_week
+
 
 class BusinessCategory(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -13,6 +16,42 @@ class BusinessCategory(models.Model):
         return self.name
 
 
+class BusinessQuerySet(models.QuerySet):
+    """
+    Keeps `geo_cell` in step with the coordinates on bulk writes, which skip `save()` and signals.
+
+    `update()` can only do so for plain coordinate values, so it refuses
+    other coordinate changes that do not also set `geo_cell`.
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.geo_cell = cell_for(obj.latitude, obj.longitude)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        if {"latitude", "longitude"} & set(fields):
+            for obj in objs:
+                obj.geo_cell = cell_for(obj.latitude, obj.longitude)
+            fields = [*fields, "geo_cell"]
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    def update(self, **kwargs):
+        if {"latitude", "longitude"} & set(kwargs) and "geo_cell" not in kwargs:
+            coordinates = (kwargs.get("latitude"), kwargs.get("longitude"))
+            if "latitude" not in kwargs or "longitude" not in kwargs or any(
+                hasattr(value, "resolve_expression") for value in coordinates
+            ):
+                raise ValueError(
+                    "Updating coordinates needs both latitude and longitude as values, or geo_cell too; "
+                    "otherwise save() each business."
+                )
+            kwargs["geo_cell"] = cell_for(*coordinates)
+        return super().update(**kwargs)
+
+
 class Business(models.Model):
     category = models.ForeignKey(
         BusinessCategory,
@@ -27,6 +66,17 @@ class Business(models.Model):
     address = models.TextField(null=True, blank=True)
     latitude = models.DecimalField(max_digits=10, decimal_places=7, null=True, blank=True)
     longitude = models.DecimalField(max_digits=10, decimal_places=7, null=True, blank=True)
+    # Derived from latitude/longitude by a pre_save receiver (which also covers
+    # fixture loads) and by `BusinessQuerySet`; see `businesses.geo`.
+    geo_cell = models.BigIntegerField(null=True, blank=True, editable=False, db_index=True)
+    # Compiled from `hours` whenever they change; see `businesses.hours`.
+    open_slots_mon = models.BigIntegerField(default=0, editable=False)
+    open_slots_tue = models.BigIntegerField(default=0, editable=False)
+    open_slots_wed = models.BigIntegerField(default=0, editable=False)
+    open_slots_thu = models.BigIntegerField(default=0, editable=False)
+    open_slots_fri = models.BigIntegerField(default=0, editable=False)
+    open_slots_sat = models.BigIntegerField(default=0, editable=False)
+    open_slots_sun = models.BigIntegerField(default=0, editable=False)
     image_url = models.URLField(max_length=300, null=True, blank=True)
     hero_image_url = models.URLField(max_length=300, null=True, blank=True)
     average_rating = models.DecimalField(max_digits=3, decimal_places=2, null=True, blank=True)
@@ -36,13 +86,35 @@ class Business(models.Model):
     delivery_time_minutes_max = models.PositiveSmallIntegerField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = BusinessQuerySet.as_manager()
+
     class Meta:
         db_table = "businesses"
         ordering = ("name",)
+        # One index per `RestaurantPagination` ordering; the home sections use
+        # prefixes of the rating and delivery time ones.
+        indexes = [
+            models.Index(fields=["name", "id"], name="businesses_name_idx"),
+            models.Index(fields=["-average_rating", "-review_count", "id"], name="businesses_rating_idx"),
+            models.Index(
+                fields=["delivery_time_minutes_min", "name", "id"], name="businesses_delivery_time_idx"
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.name
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "geo_cell"}
+        if update_fields is None and self.pk is not None:
+            # Recompile rather than write back bitmaps loaded before an hours edit.
+            hours = self.hours.values_list("day_of_week", "open_time", "close_time")
+            for field, value in compile_week(hours).items():
+                setattr(self, field, value)
+        super().save(*args, **kwargs)
+
     def formatted_delivery_eta(self) -> str | None:
         if self.delivery_time_minutes_min and self.delivery_time_minutes_max:
             return f"{self.delivery_time_minutes_min}-{self.delivery_time_minutes_max} min"
@@ -77,3 +149,14 @@ class BusinessHours(models.Model):
     def __str__(self) -> str:
         day_label = dict(self.DAY_OF_WEEK_CHOICES).get(self.day_of_week, "Unknown")
         return f"{self.business.name} - {day_label}"
+
+
+class BootStamp(models.Model):
+    """Digest of what `manage.py boot` last applied for a step, so unchanged steps are skipped."""
+
+    step = models.CharField(max_length=50, primary_key=True)
+    digest = models.CharField(max_length=64)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return self.step
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from typing import Any, Sequence
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opt-in cursor pagination that seeks on the full ordering key.
+
+    Unlike DRF's `CursorPagination`, which seeks on the first ordering field
+    and falls back to an offset for ties, the cursor stores every value of the
+    ordering key and the next page is selected with a lexicographic
+    "greater than" filter, so deep pages cost the same as the first one.
+    Requests without `cursor` or `page_size` are left unpaginated.
+
+    NULL placement follows the database's natural index order rather than
+    forcing NULLS FIRST/LAST, so ordering stays index-friendly.
+    """
+
+    orderings: dict[str, Sequence[str]] = {}
+    default_ordering = ""
+    ordering_query_param = "ordering"
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = 20
+    max_page_size = 100
+    invalid_cursor_message = "Invalid cursor."
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None) -> list[Any] | None:
+        if (
+            self.cursor_query_param not in request.query_params
+            and self.page_size_query_param not in request.query_params
+        ):
+            return None
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        self.ordering = cursor[0] if cursor else self.get_ordering_name(request)
+        fields = self.orderings[self.ordering]
+
+        queryset = self.order_queryset(queryset, request, ordering=self.ordering)
+        if cursor:
+            queryset = queryset.filter(self._after(queryset, fields, cursor[1]))
+
+        rows = list(queryset[: page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+        return self.page
+
+    def get_paginated_response(self, data) -> Response:
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_ordering_name(self, request) -> str:
+        ordering = request.query_params.get(self.ordering_query_param, self.default_ordering)
+        return ordering if ordering in self.orderings else self.default_ordering
+
+    def order_queryset(self, queryset: QuerySet, request, ordering: str | None = None) -> QuerySet:
+        fields = self.orderings[ordering or self.get_ordering_name(request)]
+        return queryset.order_by(*fields)
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        values = [getattr(last, field.lstrip("-")) for field in self.orderings[self.ordering]]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.ordering, values))
+
+    def encode_cursor(self, ordering: str, values: list[Any]) -> str:
+        payload = json.dumps({"o": ordering, "v": [None if value is None else str(value) for value in values]})
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, request) -> tuple[str, list[str | None]] | None:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)))
+            ordering, values = payload["o"], payload["v"]
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if ordering not in self.orderings or len(values) != len(self.orderings[ordering]):
+            raise NotFound(self.invalid_cursor_message)
+        return ordering, values
+
+    def _after(self, queryset: QuerySet, fields: Sequence[str], raw_values: list[str | None]) -> Q:
+        """Rows strictly after `raw_values` in the ordering given by `fields`."""
+        model = queryset.model
+        nulls_largest = connections[queryset.db].features.nulls_order_largest
+        condition = Q(pk__in=[])
+        equal_prefix = Q()
+        leading_bound = Q()
+        for position, (field, raw) in enumerate(zip(fields, raw_values)):
+            descending = field.startswith("-")
+            name = field.lstrip("-")
+            model_field = model._meta.get_field(name)
+            try:
+                value = None if raw is None else model_field.to_python(raw)
+            except ValidationError:
+                raise NotFound(self.invalid_cursor_message)
+            # NULLs come last when they sort as the largest value ascending,
+            # or as the smallest value descending.
+            nulls_last = nulls_largest != descending
+
+            if value is None:
+                after = Q(pk__in=[]) if nulls_last else Q(**{f"{name}__isnull": False})
+                equal = Q(**{f"{name}__isnull": True})
+            else:
+                after = Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+                if nulls_last and model_field.null:
+                    after |= Q(**{f"{name}__isnull": True})
+                equal = Q(**{name: value})
+                if position == 0:
+                    leading_bound = after | equal
+
+            condition |= equal_prefix & after
+            equal_prefix &= equal
+        # The bound on the leading field is implied by `condition`, but unlike
+        # the OR-expansion it lets the database walk the ordering index from
+        # the cursor instead of collecting every match and sorting it.
+        return leading_bound & condition
+
+
+class RestaurantPagination(KeysetPagination):
+    orderings = {
+        "name": ("name", "id"),
+        "rating": ("-average_rating", "-review_count", "id"),
+        "delivery_time": ("delivery_time_minutes_min", "name", "id"),
+    }
+    default_ordering = "name"
+
@@ -4,8 +4,10 @@ from typing import Any
 
 from rest_framework import serializers
 
-from menu.serializers import MenuSectionSerializer, MysteryBoxSerializer, ModifierSerializer
+from hartazone.fieldsets import SparseFieldsMixin
+from menu.serializers import ModifierSerializer
 from menu.models import FoodItem
+from menu.tree import MenuTree, build_menu_tree
 from .models import Business, BusinessCategory
 
 CARD_BACKGROUNDS = [
@@ -32,7 +34,7 @@ class BusinessCategorySerializer(serializers.ModelSerializer):
         fields = ("id", "name")
 
 
-class RestaurantListSerializer(serializers.ModelSerializer):
+class RestaurantListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     id = serializers.CharField(source="pk", read_only=True)
     heroImage = serializers.SerializerMethodField()
     rating = serializers.SerializerMethodField()
@@ -66,7 +68,7 @@ class RestaurantListSerializer(serializers.ModelSerializer):
         return obj.formatted_delivery_eta() or ""
 
 
-class RestaurantSerializer(serializers.ModelSerializer):
+class RestaurantSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     id = serializers.CharField(source="pk", read_only=True)
     heroImage = serializers.SerializerMethodField()
     rating = serializers.SerializerMethodField()
@@ -90,6 +92,7 @@ class RestaurantSerializer(serializers.ModelSerializer):
             "menu",
             "mysteryBox",
         )
+        expandable_fields = ("menu", "mysteryBox")
 
     def get_heroImage(self, obj: Business) -> str | None:
         return obj.hero_image_url or obj.image_url or ""
@@ -114,18 +117,25 @@ class RestaurantSerializer(serializers.ModelSerializer):
         }
 
     def get_menu(self, obj: Business) -> list[dict[str, Any]]:
-        sections = obj.menu_sections.prefetch_related("food_items__extra_groups__group__extras")
-        return MenuSectionSerializer(sections, many=True).data
+        return self.menu_tree(obj).menu
 
     def get_mysteryBox(self, obj: Business) -> dict[str, Any] | None:
-        mystery = (
-            obj.mystery_boxes.filter(is_active=True)
-            .prefetch_related("extra_group_links__group__extras")
-            .first()
-        )
-        if not mystery:
-            return None
-        return MysteryBoxSerializer(mystery).data
+        return self.menu_tree(obj).mystery_box
+
+    def menu_tree(self, obj: Business) -> MenuTree:
+        """
+        The bulk-loaded menu shared by `menu` and `mysteryBox`.
+
+        With `context["normalized_modifiers"]` set, modifiers are group
+        references and the groups themselves are in `modifier_groups`.
+        """
+        if not hasattr(self, "_menu_trees"):
+            self._menu_trees: dict[int, MenuTree] = {}
+        if obj.pk not in self._menu_trees:
+            self._menu_trees[obj.pk] = build_menu_tree(
+                obj.pk, normalized=bool(self.context.get("normalized_modifiers"))
+            )
+        return self._menu_trees[obj.pk]
 
 
 class RestaurantCreateSerializer(serializers.ModelSerializer):
@@ -304,9 +314,3 @@ class MostOrderedItemSerializer(serializers.ModelSerializer):
             return []
         return ModifierSerializer(links, many=True).data
 
-
-class HomeDiscoverySerializer(serializers.Serializer):
-    featuredRestaurants = HomeRestaurantCardSerializer(many=True)
-    mostOrderedThisWeek = MostOrderedItemSerializer(many=True)
-    nearYouRestaurants = RestaurantSummarySerializer(many=True)
-    featuredProducts = HomeProductSerializer(many=True)
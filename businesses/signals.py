@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.conf import settings
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from hartazone.replicas import pin_catalogue
+from menu.models import (
+    ExtraGroup,
+    ExtraItem,
+    FoodItem,
+    FoodItemExtraGroup,
+    FoodItemTag,
+    FoodTag,
+    FoodVariant,
+    MenuSection,
+    MysteryBox,
+    MysteryBoxExtraGroup,
+)
+from .cache import bump_menu_version
+from .geo import cell_for
+from .hours import refresh_open_slots
+from .models import Business, BusinessCategory, BusinessHours
+
+# Signals only fire for model-level saves and deletes; `QuerySet.update()`
+# and `bulk_create()` callers must call `bump_menu_version` (or, for hours,
+# `refresh_open_slots`) and `pin_catalogue` themselves.
+
+
+def _bump(business_ids: Iterable[int | None]) -> None:
+    for business_id in set(business_ids):
+        if business_id is not None:
+            bump_menu_version(business_id)
+
+
+@receiver([post_save, post_delete, m2m_changed])
+def catalogue_changed(sender, **kwargs) -> None:
+    # Keeps readers on the primary until the replica has the change.
+    if sender._meta.app_label in settings.REPLICA_APPS:
+        pin_catalogue()
+
+
+@receiver(pre_save, sender=Business)
+def business_saving(sender, instance: Business, **kwargs) -> None:
+    # Runs for raw fixture saves too, which bypass `Business.save()`.
+    instance.geo_cell = cell_for(instance.latitude, instance.longitude)
+
+
+@receiver([post_save, post_delete], sender=Business)
+def business_changed(sender, instance: Business, **kwargs) -> None:
+    _bump([instance.pk])
+
+
+@receiver([post_save, post_delete], sender=BusinessHours)
+def hours_changed(sender, instance: BusinessHours, **kwargs) -> None:
+    refresh_open_slots(instance.business_id)
+
+
+@receiver(post_save, sender=BusinessCategory)
+@receiver(pre_delete, sender=BusinessCategory)
+def category_changed(sender, instance: BusinessCategory, **kwargs) -> None:
+    _bump(Business.objects.filter(category_id=instance.pk).values_list("pk", flat=True))
+
+
+@receiver([post_save, post_delete], sender=MenuSection)
+@receiver([post_save, post_delete], sender=FoodItem)
+@receiver([post_save, post_delete], sender=ExtraGroup)
+@receiver([post_save, post_delete], sender=MysteryBox)
+def menu_object_changed(sender, instance, **kwargs) -> None:
+    _bump([instance.business_id])
+
+
+@receiver([post_save, post_delete], sender=FoodVariant)
+@receiver([post_save, post_delete], sender=FoodItemExtraGroup)
+@receiver([post_save, post_delete], sender=FoodItemTag)
+def food_item_child_changed(sender, instance, **kwargs) -> None:
+    _bump(FoodItem.objects.filter(pk=instance.food_item_id).values_list("business_id", flat=True))
+
+
+@receiver([post_save, post_delete], sender=ExtraItem)
+def extra_item_changed(sender, instance: ExtraItem, **kwargs) -> None:
+    _bump(ExtraGroup.objects.filter(pk=instance.group_id).values_list("business_id", flat=True))
+
+
+@receiver([post_save, post_delete], sender=MysteryBoxExtraGroup)
+def mystery_box_link_changed(sender, instance: MysteryBoxExtraGroup, **kwargs) -> None:
+    _bump(MysteryBox.objects.filter(pk=instance.mystery_box_id).values_list("business_id", flat=True))
+
+
+@receiver(m2m_changed, sender=MysteryBox.extra_groups.through)
+def mystery_box_groups_changed(sender, instance, action: str, reverse: bool, pk_set, **kwargs) -> None:
+    if not action.startswith("post_"):
+        return
+    if reverse and pk_set:
+        _bump(MysteryBox.objects.filter(pk__in=pk_set).values_list("business_id", flat=True))
+    else:
+        _bump([instance.business_id])
+
+
+@receiver(post_save, sender=FoodTag)
+@receiver(pre_delete, sender=FoodTag)
+def food_tag_changed(sender, instance: FoodTag, **kwargs) -> None:
+    _bump(
+        FoodItem.objects.filter(tags__tag_id=instance.pk).values_list("business_id", flat=True)
+    )
@@ -1,7 +1,15 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
 
-from .views import HomeDiscoveryViewSet, RestaurantViewSet, api_root
+from hartazone.asyncviews import use_async_reads
+from .views import (
+    HomeDiscoveryViewSet,
+    RestaurantViewSet,
+    api_root,
+    read_home,
+    read_restaurant_detail,
+    read_restaurant_list,
+)
 
 router = DefaultRouter()
 router.register(r"restaurants", RestaurantViewSet, basename="restaurant")
@@ -14,3 +22,11 @@ urlpatterns = [
 ]
 
 urlpatterns += router.urls
+use_async_reads(
+    urlpatterns,
+    {
+        "home-discovery": read_home,
+        "restaurant-list": read_restaurant_list,
+        "restaurant-detail": read_restaurant_detail,
+    },
+)
@@ -1,20 +1,93 @@
 from __future__ import annotations
 
-from django.db.models import Prefetch
+import math
+from datetime import datetime
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
 from rest_framework import permissions, viewsets
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
 from rest_framework.reverse import reverse
 from rest_framework.response import Response
 
-from menu.models import FoodItem, MenuSection, MysteryBox
+from hartazone.asyncviews import json_response
+from hartazone.cache import aget_or_rebuild, get_or_rebuild, peek
+from hartazone.compression import ENCODINGS, accepted_encoding, mark_cached
+from hartazone.fieldsets import FieldSelection
+from users.authentication import READ_AUTHENTICATION_CLASSES
 from users.permissions import RolePermission
-from .models import Business
-from .serializers import (
-    HomeDiscoverySerializer,
-    RestaurantCreateSerializer,
-    RestaurantListSerializer,
-    RestaurantSerializer,
+from .cache import (
+    RestaurantSnapshot,
+    aget_menu_version,
+    aget_restaurant_snapshot,
+    get_menu_version,
+    get_restaurant_snapshot,
+    restaurant_etag,
+    store_restaurant_snapshot,
 )
+from .geo import nearest
+from .home import HOME_CACHE_KEY, HOME_SECTIONS, abuild_home, build_home, build_near_you
+from .hours import filter_open, local_slot, seconds_left_in_slot
+from .models import Business
+from .pagination import RestaurantPagination
+from .serializers import RestaurantCreateSerializer, RestaurantListSerializer, RestaurantSerializer
+
+
+def _nearby(request) -> tuple[float, float, float] | None:
+    """`(lat, lng, radius_km)` from `?lat=&lng=&radius=`, or None when no point is given."""
+    params = request.query_params
+    if "lat" not in params and "lng" not in params:
+        return None
+    try:
+        latitude, longitude = float(params["lat"]), float(params["lng"])
+        radius = float(params.get("radius", settings.NEARBY_RADIUS_KM))
+    except (KeyError, ValueError):
+        raise ValidationError("lat and lng must both be given as numbers, and radius as kilometres.")
+    if not all(map(math.isfinite, (latitude, longitude, radius))):
+        raise ValidationError("lat, lng and radius must be finite numbers.")
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180) or radius <= 0:
+        raise ValidationError("lat, lng or radius is out of range.")
+    return latitude, longitude, min(radius, settings.NEARBY_MAX_RADIUS_KM)
+
+
+def _open_now(request) -> bool:
+    return request.query_params.get("open_now") in {"1", "true"}
+
+
+def _home_cache(request) -> tuple[str, float, datetime | None]:
+    """The cache key and timeout of the home payload for `request`, and the moment `?open_now=1` refers to."""
+    if not _open_now(request):
+        return HOME_CACHE_KEY, settings.HOME_CACHE_TIMEOUT, None
+    open_at = timezone.now()
+    key = "{}:open:{}:{}".format(HOME_CACHE_KEY, *local_slot(open_at))
+    return key, min(settings.HOME_CACHE_TIMEOUT, seconds_left_in_slot(open_at)), open_at
+
+
+def restaurant_cards():
+    """Restaurants with just the columns `RestaurantListSerializer` reads."""
+    return (
+        Business.objects.all()
+        .select_related("category")
+        .only(
+            "id",
+            "name",
+            "tagline",
+            "hero_image_url",
+            "image_url",
+            "average_rating",
+            "review_count",
+            "delivery_time_minutes_min",
+            "delivery_time_minutes_max",
+            "delivery_available",
+            "category__name",
+        )
+    )
 
 
 class RestaurantViewSet(viewsets.ModelViewSet):
@@ -22,48 +95,143 @@ class RestaurantViewSet(viewsets.ModelViewSet):
     Restaurant catalogue endpoint.
 
     - GET endpoints are publicly accessible.
+    - The list is unpaginated unless `cursor` or `page_size` is given, in
+      which case it is keyset-paginated by `ordering` (name, rating or
+      delivery_time).
+    - `?lat=&lng=` (and optionally `radius`, in km) lists the `page_size`
+      restaurants nearest to the point instead, each with a `distanceKm`.
+    - `?open_now=1` keeps only restaurants whose hours say they are open.
+    - `?modifiers=normalized` on the detail emits each modifier group once in
+      a top-level `modifierGroups` map and has items reference groups by id.
     - Mutation endpoints (POST/PATCH/PUT/DELETE) require an admin user.
     """
 
+    authentication_classes = READ_AUTHENTICATION_CLASSES
     permission_classes = [permissions.AllowAny]
+    pagination_class = RestaurantPagination
 
     def get_queryset(self):
         if self.action == "list":
-            return (
-                Business.objects.all()
-                .select_related("category")
-                .only(
-                    "id",
-                    "name",
-                    "tagline",
-                    "hero_image_url",
-                    "image_url",
-                    "average_rating",
-                    "review_count",
-                    "delivery_time_minutes_min",
-                    "delivery_time_minutes_max",
-                    "delivery_available",
-                    "category__name",
-                )
-            )
+            queryset = restaurant_cards()
+            if _open_now(self.request):
+                queryset = filter_open(queryset)
+            return self.paginator.order_queryset(queryset, self.request)
 
-        menu_section_qs = (
-            MenuSection.objects.order_by("position", "id")
-            .prefetch_related("food_items__extra_groups__group__extras")
-            .prefetch_related("food_items__section")
-        )
-        mystery_box_qs = MysteryBox.objects.filter(is_active=True).prefetch_related(
-            "extra_group_links__group__extras"
-        )
+        # The detail payload assembles its menu with `build_menu_tree`, which
+        # loads the whole tree in a fixed number of queries on its own.
+        return Business.objects.all().select_related("category")
+
+    def list(self, request, *args, **kwargs):
+        nearby = _nearby(request)
+        if nearby is None:
+            return super().list(request, *args, **kwargs)
+
+        candidates = filter_open(Business.objects.all()) if _open_now(request) else Business.objects.all()
+        matches = nearest(candidates, *nearby, limit=self.paginator.get_page_size(request))
+        businesses = self.get_queryset().in_bulk([pk for pk, _ in matches])
+        found = [(businesses[pk], distance) for pk, distance in matches if pk in businesses]
+        data = self.get_serializer([business for business, _ in found], many=True).data
+        if FieldSelection.from_request(request).includes("distanceKm"):
+            for entry, (_, distance) in zip(data, found):
+                entry["distanceKm"] = round(distance, 2)
+        return Response(data)
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            business_id = int(self.kwargs[self.lookup_field])
+        except (TypeError, ValueError):
+            return super().retrieve(request, *args, **kwargs)
+
+        variant = "normalized" if self._normalized_modifiers() else "full"
+        selection = FieldSelection.from_request(request)
+        if selection.is_default:
+            return self._retrieve_full(request, business_id, variant)
+
+        expandable = RestaurantSerializer.Meta.expandable_fields
+        snapshot = get_restaurant_snapshot(business_id, variant)
+        if snapshot is None:
+            if not any(selection.includes(name, expandable) for name in expandable):
+                # Header-only views are serialized without touching the menu tables.
+                return super().retrieve(request, *args, **kwargs)
+            snapshot = self._build_snapshot(business_id, variant)
+        data = selection.apply(snapshot.data, expandable)
+        if "modifierGroups" in snapshot.data and ("menu" in data or "mysteryBox" in data):
+            data["modifierGroups"] = snapshot.data["modifierGroups"]
+        return Response(data)
+
+    def _retrieve_full(self, request, business_id: int, variant: str):
+        prerender = settings.RESTAURANT_DETAIL_PRERENDER
+        if prerender and "If-None-Match" in request.headers:
+            # Revalidation only needs the menu version, so a matching client
+            # is answered without touching the database or the renderer.
+            etag = self._matching_etag(request, business_id, get_menu_version(business_id), variant)
+            if etag is not None:
+                response = HttpResponseNotModified()
+                response["ETag"] = etag
+                return response
+
+        snapshot = get_restaurant_snapshot(business_id, variant)
+        if snapshot is None or (prerender and snapshot.body is None):
+            snapshot = self._build_snapshot(business_id, variant)
+
+        renderer = request.accepted_renderer
+        if snapshot.body is None or renderer.format != "json" or request.accepted_media_type != renderer.media_type:
+            return Response(snapshot.data)
+        return self._snapshot_response(request, snapshot, renderer.media_type)
+
+    def _build_snapshot(self, business_id: int, variant: str) -> RestaurantSnapshot:
+        # Read the version before building so an edit that lands mid-build
+        # is never cached under the new version.
+        version = get_menu_version(business_id)
+        instance = self.get_object()
+        context = {**self.get_serializer_context(), "field_selection": FieldSelection()}
+        serializer = self.get_serializer(instance, context=context)
+        data = serializer.data
+        if variant == "normalized":
+            data["modifierGroups"] = serializer.menu_tree(instance).modifier_groups
+        body = self._json_renderer().render(data) if settings.RESTAURANT_DETAIL_PRERENDER else None
+        return store_restaurant_snapshot(business_id, version, data, body=body, variant=variant)
+
+    def _normalized_modifiers(self) -> bool:
+        return self.request.query_params.get("modifiers") == "normalized"
 
-        return (
-            Business.objects.all()
-            .select_related("category")
-            .prefetch_related(
-                Prefetch("menu_sections", queryset=menu_section_qs),
-                Prefetch("mystery_boxes", queryset=mystery_box_qs),
+    def _json_renderer(self) -> JSONRenderer:
+        return next(renderer for renderer in self.get_renderers() if renderer.format == "json")
+
+    @staticmethod
+    def _matching_etag(request, business_id: int, version: int, variant: str) -> str | None:
+        current = {
+            restaurant_etag(business_id, version, variant=variant, encoding=encoding)
+            for encoding in (None, *ENCODINGS)
+        }
+        for etag in parse_etags(request.headers["If-None-Match"]):
+            etag = etag.removeprefix("W/")
+            if etag in current:
+                return etag
+        return None
+
+    @staticmethod
+    def _snapshot_response(request, snapshot: RestaurantSnapshot, content_type: str) -> HttpResponse:
+        bodies = snapshot.encoded_bodies
+        encoding = accepted_encoding(request.headers.get("Accept-Encoding", ""), bodies)
+        if encoding is not None:
+            response = HttpResponse(bodies[encoding], content_type=content_type)
+            response["Content-Encoding"] = encoding
+            response["ETag"] = restaurant_etag(
+                snapshot.business_id, snapshot.version, variant=snapshot.variant, encoding=encoding
             )
-        )
+        else:
+            response = HttpResponse(snapshot.body, content_type=content_type)
+            response["ETag"] = snapshot.etag
+        if bodies:
+            patch_vary_headers(response, ("Accept-Encoding",))
+        return response
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["field_selection"] = FieldSelection.from_request(self.request)
+        context["normalized_modifiers"] = self._normalized_modifiers()
+        return context
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -79,35 +247,112 @@ class RestaurantViewSet(viewsets.ModelViewSet):
 
 
 class HomeDiscoveryViewSet(viewsets.ViewSet):
+    """
+    Landing page sections.
+
+    The full payload is cached for `HOME_CACHE_TIMEOUT` seconds and served
+    stale while a single worker rebuilds it. `?fields=` picks which sections
+    to return and `?expand=` without `modifiers` drops product modifiers;
+    these are cut from the cached payload when there is one, and otherwise
+    only the requested sections are queried. With `?lat=&lng=` the
+    `nearYouRestaurants` section holds the restaurants nearest to that point,
+    computed per request, instead of the fastest-delivering ones.
+    `?open_now=1` limits every section to restaurants open right now; that
+    payload is cached per opening-hours slot.
+    """
+
+    authentication_classes = READ_AUTHENTICATION_CLASSES
     permission_classes = [permissions.AllowAny]
 
     def list(self, request):
-        businesses = Business.objects.select_related("category")
-        featured = businesses.order_by("-average_rating", "-review_count")[:5]
-        near_you = businesses.order_by("delivery_time_minutes_min", "name")[:6]
-        most_ordered_items = (
-            FoodItem.objects.select_related("business")
-            .filter(is_available=True)
-            .order_by("-is_discounted", "-discount_percentage", "-created_at")[:6]
-        )
-        featured_products = (
-            FoodItem.objects.select_related("business")
-            .filter(is_available=True)
-            .order_by("-discount_percentage", "-is_discounted", "name")[:8]
-        )
-
-        serializer = HomeDiscoverySerializer(
+        selection = FieldSelection.from_request(request)
+        item_selection = FieldSelection(expand=selection.expand)
+        nearby = _nearby(request)
+        key, timeout, open_at = _home_cache(request)
+        if selection.is_default:
+            payload = get_or_rebuild(
+                key,
+                lambda: build_home(open_at=open_at),
+                timeout=timeout,
+                stale_timeout=settings.HOME_CACHE_STALE_TIMEOUT,
+            )
+        else:
+            payload = peek(key) or build_home(
+                (
+                    name
+                    for name in HOME_SECTIONS
+                    if selection.includes(name) and not (nearby and name == "nearYouRestaurants")
+                ),
+                with_modifiers=item_selection.includes("modifiers", ("modifiers",)),
+                open_at=open_at,
+            )
+        if nearby is not None and selection.includes("nearYouRestaurants"):
+            payload = {**payload, "nearYouRestaurants": build_near_you(*nearby, open_at=open_at)}
+        response = Response(
             {
-                "featuredRestaurants": featured,
-                "mostOrderedThisWeek": most_ordered_items,
-                "nearYouRestaurants": near_you,
-                "featuredProducts": featured_products,
+                name: [item_selection.apply(entry, ("modifiers",)) for entry in entries]
+                for name, entries in payload.items()
+                if selection.includes(name)
             }
         )
-        return Response(serializer.data)
+        return mark_cached(response) if selection.is_default and nearby is None else response
+
+
+# Async versions of the common GETs above, used under ASGI (see
+# `hartazone.asyncviews`). Each returns None for anything it does not cover,
+# which the sync view then handles.
+
+
+async def read_restaurant_list(request):
+    request = Request(request)
+    if request.query_params.keys() - {"ordering", "open_now"}:
+        return None
+    queryset = filter_open(restaurant_cards()) if _open_now(request) else restaurant_cards()
+    queryset = RestaurantPagination().order_queryset(queryset, request)
+    businesses = [business async for business in queryset]
+    return json_response(RestaurantListSerializer(businesses, many=True).data)
+
+
+async def read_restaurant_detail(request, pk):
+    """Pre-rendered restaurant details and 304s, straight from the cache."""
+    variant = "normalized" if request.GET.get("modifiers") == "normalized" else "full"
+    if request.GET.keys() - {"modifiers"} or not settings.RESTAURANT_DETAIL_PRERENDER:
+        return None
+    try:
+        business_id = int(pk)
+    except ValueError:
+        return None
+
+    if "If-None-Match" in request.headers:
+        version = await aget_menu_version(business_id)
+        etag = RestaurantViewSet._matching_etag(request, business_id, version, variant)
+        if etag is not None:
+            response = HttpResponseNotModified()
+            response["ETag"] = etag
+            return response
+
+    snapshot = await aget_restaurant_snapshot(business_id, variant)
+    if snapshot is None or snapshot.body is None:
+        return None
+    return RestaurantViewSet._snapshot_response(request, snapshot, JSONRenderer.media_type)
+
+
+async def read_home(request):
+    request = Request(request)
+    if request.query_params.keys() - {"open_now"}:
+        return None
+    key, timeout, open_at = _home_cache(request)
+    payload = await aget_or_rebuild(
+        key,
+        lambda: abuild_home(open_at=open_at),
+        timeout=timeout,
+        stale_timeout=settings.HOME_CACHE_STALE_TIMEOUT,
+    )
+    return mark_cached(json_response(payload))
 
 
 @api_view(["GET"])
+@authentication_classes(READ_AUTHENTICATION_CLASSES)
 @permission_classes([permissions.AllowAny])
 def api_root(request, format=None):
     return Response(
@@ -116,5 +361,6 @@ def api_root(request, format=None):
             "restaurants": reverse("restaurant-list", request=request, format=format),
             "products": reverse("product-list", request=request, format=format),
             "offers": reverse("offer-list", request=request, format=format),
+            "search": reverse("search-list", request=request, format=format),
         }
     )
@@ -1,16 +1,8 @@
 #!/usr/bin/env sh
 set -e
 
-python manage.py migrate --no-input
-
-if [ -f "fixtures/mock_restaurants.json" ]; then
-    python manage.py loaddata fixtures/mock_restaurants.json
-fi
-
-if [ -f "fixtures/mock_offers.json" ]; then
-    python manage.py loaddata fixtures/mock_offers.json
-fi
-
-python manage.py collectstatic --no-input
+# Migrate, collect static files and load fixtures/*.json in one process,
+# skipping steps with nothing new since the last boot.
+python manage.py boot --collectstatic --no-admin
 
 exec "$@"
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from functools import wraps
+from typing import Any, Awaitable, Callable, Iterable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.urls import URLPattern
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.settings import api_settings
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from users.authentication import ClaimsJWTAuthentication
+
+AsyncRead = Callable[..., Awaitable[HttpResponse | None]]
+
+_renderer = next(renderer() for renderer in api_settings.DEFAULT_RENDERER_CLASSES if renderer.format == "json")
+
+
+def json_response(data: Any) -> HttpResponse:
+    """`data` rendered the way DRF renders it for a JSON client."""
+    return HttpResponse(_renderer.render(data), content_type=_renderer.media_type)
+
+
+def _servable(request: HttpRequest, kwargs: dict[str, Any]) -> bool:
+    """
+    Whether an async read may answer `request` without DRF, going by its method and format.
+
+    Requests for another format, such as the browsable API, go through DRF.
+    """
+    if request.method != "GET" or kwargs.get("format") or "format" in request.GET:
+        return False
+    accept = request.headers.get("Accept", "")
+    return not accept or ("text/html" not in accept and ("application/json" in accept or "*/*" in accept))
+
+
+def _authenticates(header: str) -> bool:
+    """
+    Whether the read endpoints' `ClaimsJWTAuthentication` accepts an Authorization header.
+
+    Runs the same checks, including its database lookups for revoked users
+    and stale claims, so call it from the sync thread. Credentials other
+    than a bearer token count as rejected.
+    """
+    authentication = ClaimsJWTAuthentication()
+    raw_token = authentication.get_raw_token(header.encode())
+    if raw_token is None:
+        return False
+    try:
+        authentication.get_user(authentication.get_validated_token(raw_token))
+    except (AuthenticationFailed, InvalidToken, TokenError):
+        return False
+    return True
+
+
+async def _credentials_accepted(request: HttpRequest) -> bool:
+    """
+    Whether `request` is anonymous or its credentials would pass DRF's authentication.
+
+    The public read endpoints allow anonymous access, so authentication only
+    matters when it fails; DRF then produces the error response.
+    """
+    header = request.META.get("HTTP_AUTHORIZATION")
+    return not header or await sync_to_async(_authenticates)(header)
+
+
+def async_read(view: Callable[..., HttpResponse], read: AsyncRead) -> Callable[..., Awaitable[HttpResponse]]:
+    """
+    An async view answering GETs with `read` and everything else with the sync `view`.
+
+    `read` returns None for requests it does not handle (unsupported query
+    parameters, cache misses that need the full serializer), which are then
+    passed to `view` in the sync thread as before.
+    """
+
+    @csrf_exempt
+    @wraps(view)
+    async def async_view(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        if _servable(request, kwargs) and await _credentials_accepted(request):
+            response = await read(request, *args, **kwargs)
+            if response is not None:
+                # DRF varies every response on Accept, since it negotiates the renderer.
+                patch_vary_headers(response, ("Accept",))
+                return response
+        return await sync_to_async(view)(request, *args, **kwargs)
+
+    return async_view
+
+
+def use_async_reads(patterns: Iterable[URLPattern], reads: dict[str, AsyncRead]) -> None:
+    """Serve the GETs of the named URL patterns with async reads, when `ASYNC_READ_VIEWS` is on."""
+    if not settings.ASYNC_READ_VIEWS:
+        return
+    for pattern in patterns:
+        if pattern.name in reads:
+            pattern.callback = async_read(pattern.callback, reads[pattern.name])
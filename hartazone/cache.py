@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, TypeVar
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class _Entry:
+    fresh_until: float
+    value: Any
+
+
+def get_or_rebuild(
+    key: str,
+    build: Callable[[], T],
+    timeout: float | Callable[[T], float],
+    stale_timeout: float,
+    lock_timeout: float = 30,
+) -> T:
+    """
+    Serve `key` from the cache, rebuilding it at most once across workers.
+
+    Entries stay fresh for `timeout` seconds (or `timeout(value)` when it is a
+    callable), then remain in the cache as a stale copy for `stale_timeout`
+    more seconds. The first request to see a stale entry takes a short
+    `cache.add` lock and rebuilds; everyone else keeps getting the stale
+    copy until the new one is stored. Only a cold cache makes callers build
+    concurrently, since there is nothing to serve in the meantime.
+    """
+    entry: _Entry | None = cache.get(key)
+    if entry is not None and entry.fresh_until > time.time():
+        return entry.value
+
+    lock_key = f"{key}:rebuild"
+    locked = cache.add(lock_key, True, timeout=lock_timeout)
+    if not locked and entry is not None:
+        return entry.value
+    try:
+        value = build()
+        fresh_for = timeout(value) if callable(timeout) else timeout
+        cache.set(key, _Entry(time.time() + fresh_for, value), timeout=fresh_for + stale_timeout)
+    finally:
+        if locked:
+            cache.delete(lock_key)
+    return value
+
+
+def peek(key: str) -> Any | None:
+    """The cached value for `key`, fresh or stale, without triggering a rebuild."""
+    entry: _Entry | None = cache.get(key)
+    return None if entry is None else entry.value
+
+
+async def acache(method: str, *args: Any, **kwargs: Any) -> Any:
+    """
+    Call a cache method from async code.
+
+    Django's async cache methods run the sync ones in the sync thread. The
+    local-memory backend is a dict behind a lock, so it is called directly
+    instead of leaving the event loop; other backends use the `a*` methods.
+    """
+    backend = caches[DEFAULT_CACHE_ALIAS]
+    if isinstance(backend, LocMemCache):
+        return getattr(backend, method)(*args, **kwargs)
+    return await getattr(backend, f"a{method}")(*args, **kwargs)
+
+
+async def aget_or_rebuild(
+    key: str,
+    build: Callable[[], Awaitable[T]],
+    timeout: float | Callable[[T], float],
+    stale_timeout: float,
+    lock_timeout: float = 30,
+) -> T:
+    """`get_or_rebuild` for async views, with an async `build`."""
+    entry: _Entry | None = await acache("get", key)
+    if entry is not None and entry.fresh_until > time.time():
+        return entry.value
+
+    lock_key = f"{key}:rebuild"
+    locked = await acache("add", lock_key, True, timeout=lock_timeout)
+    if not locked and entry is not None:
+        return entry.value
+    try:
+        value = await build()
+        fresh_for = timeout(value) if callable(timeout) else timeout
+        await acache("set", key, _Entry(time.time() + fresh_for, value), timeout=fresh_for + stale_timeout)
+    finally:
+        if locked:
+            await acache("delete", lock_key)
+    return value
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+from typing import Iterable
+
+from django.conf import settings
+from django.http import HttpResponse
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - Brotli is in requirements.txt, but stay usable without it
+    brotli = None
+
+# In order of preference, for clients that accept several equally.
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "+json")
+COMPRESSED_BODY_KEY = "compressed:{encoding}:{level}:{digest}"
+
+
+def accepted_encoding(header: str, available: Iterable[str] = ENCODINGS) -> str | None:
+    """The encoding in `available` an `Accept-Encoding` header prefers, or None for identity."""
+    weights: dict[str, float] = {}
+    for part in header.split(","):
+        name, _, params = part.partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if name := name.strip().lower():
+            weights[name] = weight
+    best, best_weight = None, 0.0
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    # mtime=0 keeps the output, and so ETags derived from it, stable.
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def compression_level(encoding: str, url_name: str | None = None, cached: bool = False) -> int:
+    """
+    The level for `encoding` on the endpoint named `url_name`.
+
+    Bodies that are compressed once and cached use `API_COMPRESSION_CACHED_LEVELS`;
+    the rest use `API_COMPRESSION_LEVELS`, per URL name with a "default" entry.
+    """
+    if cached:
+        return settings.API_COMPRESSION_CACHED_LEVELS[encoding]
+    levels = settings.API_COMPRESSION_LEVELS
+    return levels.get(url_name, levels["default"])[encoding]
+
+
+def compressed_copies(body: bytes) -> dict[str, bytes]:
+    """`body` in every available encoding at the cached levels; empty when it is below the size threshold."""
+    if not settings.API_COMPRESSION or len(body) < settings.API_COMPRESSION_MIN_SIZE:
+        return {}
+    return {encoding: compress(body, encoding, compression_level(encoding, cached=True)) for encoding in ENCODINGS}
+
+
+def compressed_body_key(body: bytes, encoding: str, level: int) -> str:
+    digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+    return COMPRESSED_BODY_KEY.format(encoding=encoding, level=level, digest=digest)
+
+
+def compressible(response: HttpResponse) -> bool:
+    content_type = response.get("Content-Type", "").split(";")[0]
+    return (
+        not response.streaming
+        and not response.has_header("Content-Encoding")
+        and "no-transform" not in response.get("Cache-Control", "")
+        and any(kind in content_type for kind in COMPRESSIBLE_TYPES)
+        and len(response.content) >= settings.API_COMPRESSION_MIN_SIZE
+    )
+
+
+def mark_cached(response: HttpResponse) -> HttpResponse:
+    """
+    Flag `response` as rendered from cached data.
+
+    `CompressionMiddleware` then caches its compressed body, keyed by a hash
+    of the uncompressed one, and compresses at the higher cached levels.
+    """
+    response.compress_once = True
+    return response
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+
+@dataclass(frozen=True)
+class FieldSelection:
+    """
+    Client-requested response shape from `?fields=` and `?expand=`.
+
+    `fields` limits each object to the listed keys. Expandable fields (heavy
+    nested data such as a restaurant's `menu` or a product's `modifiers`)
+    are included by default, but once either parameter is given they are only
+    included when listed in `fields` or `expand`. So `?expand=` on its own
+    returns everything except the expandable fields.
+    """
+
+    fields: frozenset[str] | None = None
+    expand: frozenset[str] | None = None
+
+    @classmethod
+    def from_request(cls, request) -> FieldSelection:
+        return cls(
+            fields=_split(request.query_params.get("fields")),
+            expand=_split(request.query_params.get("expand")),
+        )
+
+    @property
+    def is_default(self) -> bool:
+        return self.fields is None and self.expand is None
+
+    def includes(self, name: str, expandable: Iterable[str] = ()) -> bool:
+        if name in expandable:
+            if self.is_default:
+                return True
+            return name in (self.fields or ()) or name in (self.expand or ())
+        return self.fields is None or name in self.fields
+
+    def apply(self, data: dict[str, Any], expandable: Iterable[str] = ()) -> dict[str, Any]:
+        if self.is_default:
+            return data
+        return {name: value for name, value in data.items() if self.includes(name, expandable)}
+
+
+def _split(value: str | None) -> frozenset[str] | None:
+    if value is None:
+        return None
+    return frozenset(part.strip() for part in value.split(",") if part.strip())
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin that drops fields excluded by `context["field_selection"]`.
+
+    Excluded fields are removed before serialization, so their
+    `SerializerMethodField` getters, and any queries inside them, never run.
+    Expandable fields are declared with `Meta.expandable_fields`.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selection = self.context.get("field_selection")
+        if selection is None or selection.is_default:
+            return fields
+        expandable = getattr(self.Meta, "expandable_fields", ())
+        return {name: field for name, field in fields.items() if selection.includes(name, expandable)}
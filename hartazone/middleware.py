@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import patch_vary_headers
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoiseMiddleware
+
+from hartazone.cache import acache
+from hartazone.compression import (
+    accepted_encoding,
+    compress,
+    compressed_body_key,
+    compressible,
+    compression_level,
+)
+
+
+class WhiteNoiseMiddleware(BaseWhiteNoiseMiddleware):
+    """
+    WhiteNoise that also runs as async middleware.
+
+    The stock middleware is sync-only, which makes Django run everything
+    below it, including async views, through the sync thread under ASGI.
+    Here only static file responses go there.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+class CompressionMiddleware:
+    """
+    Brotli or gzip compression for API responses, negotiated from `Accept-Encoding`.
+
+    Only responses under `API_COMPRESSION_PREFIX` of at least
+    `API_COMPRESSION_MIN_SIZE` bytes are compressed, at the level configured
+    for their URL name. Responses flagged with
+    `hartazone.compression.mark_cached` have their compressed body cached,
+    so each version of a cached payload is compressed once. Responses that
+    already carry a `Content-Encoding`, such as pre-compressed restaurant
+    snapshots, pass through untouched.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        encoding = self._encoding(request, response)
+        if encoding is None:
+            return response
+        key, level = self._cache_key(request, response, encoding)
+        body = cache.get(key) if key else None
+        if body is None:
+            body = compress(response.content, encoding, level)
+            if key:
+                cache.set(key, body, settings.API_COMPRESSION_CACHE_TIMEOUT)
+        return self._encode(response, body, encoding)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        response = await self.get_response(request)
+        encoding = self._encoding(request, response)
+        if encoding is None:
+            return response
+        key, level = self._cache_key(request, response, encoding)
+        body = await acache("get", key) if key else None
+        if body is None:
+            body = compress(response.content, encoding, level)
+            if key:
+                await acache("set", key, body, settings.API_COMPRESSION_CACHE_TIMEOUT)
+        return self._encode(response, body, encoding)
+
+    @staticmethod
+    def _encoding(request: HttpRequest, response: HttpResponse) -> str | None:
+        if not (
+            settings.API_COMPRESSION
+            and request.path_info.startswith(settings.API_COMPRESSION_PREFIX)
+            and compressible(response)
+        ):
+            return None
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return accepted_encoding(request.headers.get("Accept-Encoding", ""))
+
+    @staticmethod
+    def _cache_key(request: HttpRequest, response: HttpResponse, encoding: str) -> tuple[str | None, int]:
+        cached = getattr(response, "compress_once", False)
+        url_name = request.resolver_match.url_name if request.resolver_match else None
+        level = compression_level(encoding, url_name, cached=cached)
+        return (compressed_body_key(response.content, encoding, level) if cached else None), level
+
+    @staticmethod
+    def _encode(response: HttpResponse, body: bytes, encoding: str) -> HttpResponse:
+        response.content = body
+        response["Content-Length"] = str(len(body))
+        response["Content-Encoding"] = encoding
+        # The compressed body is a different representation; as Django's
+        # GZipMiddleware does, weaken a strong ETag rather than reuse it.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        return response
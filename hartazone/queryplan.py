@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+from django.db import connections
+
+_FULL_SCAN = re.compile(r"SCAN (?!CONSTANT ROW)\S+( LEFT-JOIN)?$")
+_SORT = "USE TEMP B-TREE FOR ORDER BY"
+
+
+def query_plan(sql: str, using: str = "default") -> list[str]:
+    """SQLite's `EXPLAIN QUERY PLAN` steps for `sql`, one detail string per step."""
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return [row[3] for row in cursor.fetchall()]
+
+
+def plan_problems(
+    queries: Iterable[dict[str, str]], allow_sort: bool = True, using: str = "default"
+) -> dict[str, list[str]]:
+    """
+    Captured SELECTs whose plan reads a whole table, keyed by SQL.
+
+    `queries` is `CaptureQueriesContext.captured_queries`. With
+    `allow_sort=False`, sorting the result in a temporary b-tree also counts
+    as a problem, for ordered queries that an index should return in order.
+    """
+    problems: dict[str, list[str]] = {}
+    for query in queries:
+        sql = query["sql"]
+        if not sql.lstrip().upper().startswith("SELECT"):
+            continue
+        steps = [
+            step
+            for step in query_plan(sql, using)
+            if _FULL_SCAN.match(step) or (not allow_sort and step == _SORT)
+        ]
+        if steps:
+            problems[sql] = steps
+    return problems
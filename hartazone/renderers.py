@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import datetime
+import decimal
+import re
+from typing import Any
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt, but stay usable without it
+    orjson = None
+
+# orjson and `float.__repr__` format some floats differently: orjson drops
+# the exponent's sign and padding (1e16 vs 1e+16) and writes values just
+# below 1e-4 without one (0.00001 vs 1e-05). Two substring checks rule both
+# out for almost every body; the second runs on a copy with every digit
+# turned into "0", which is cheaper than a regular expression over the body.
+_DIGITS_TO_ZERO = bytes.maketrans(b"0123456789", b"0" * 10)
+_EXPONENT = re.compile(rb"e(?<=\de)-?\d")
+_NUMBER_BYTES = b"0123456789.-"
+_VALUE_STARTS = b":,["
+_LINE_SEPARATORS = ((b"\xe2\x80\xa8", b"\\u2028"), (b"\xe2\x80\xa9", b"\\u2029"))
+_encoder = encoders.JSONEncoder()
+
+
+def _unlike_python_floats(body: bytes) -> bool:
+    """Whether orjson output `body` may hold a float that `json.dumps` writes differently."""
+    if b"0.0000" in body:
+        return True
+    if b"0e" not in body.translate(_DIGITS_TO_ZERO):
+        return False
+    for match in _EXPONENT.finditer(body):
+        start = match.start()
+        while start and body[start - 1] in _NUMBER_BYTES:
+            start -= 1
+        # Inside a string, such as "f6e1472" in a URL, the run starts after a letter.
+        if start == 0 or body[start - 1] in _VALUE_STARTS:
+            return True
+    return False
+
+
+def _default(obj: Any) -> Any:
+    """DRF's `JSONEncoder.default`, with the common Decimal and datetime cases checked first."""
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, datetime.datetime):
+        representation = obj.isoformat()
+        return representation[:-6] + "Z" if representation.endswith("+00:00") else representation
+    return _encoder.default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    `JSONRenderer` that encodes with orjson when it is installed, byte for byte as DRF would.
+
+    Dates and times go through DRF's encoder rather than orjson's own
+    formatting, which rounds sub-minute UTC offsets. Anything orjson
+    cannot encode identically falls back to the stdlib encoder: non-string
+    keys, integers beyond 64 bits, nesting deeper than 254 levels, floats
+    that format differently, and indented or ASCII-only output. What is
+    left differs only where DRF raises: NaN and infinity become null and
+    plain `Enum` members their value. Serializers produce neither.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.encoder_class is not encoders.JSONEncoder
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            body = orjson.dumps(
+                data,
+                default=_default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if _unlike_python_floats(body):
+            return super().render(data, accepted_media_type, renderer_context)
+        for separator, escaped in _LINE_SEPARATORS:
+            if separator in body:
+                body = body.replace(separator, escaped)
+        return body
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import hashlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.http import HttpRequest, HttpResponse
+
+from hartazone.cache import acache
+
+REPLICA_DB_ALIAS = "replica"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Set on responses to writes; while present, the client reads from the primary.
+PIN_COOKIE = "read_primary"
+# Set after any catalogue write (see `pin_catalogue`), so that nobody rebuilds
+# a cache entry from replica rows that do not have the write yet.
+CATALOGUE_PIN_KEY = "replica:pin:catalogue"
+
+_read_replica: ContextVar[bool] = ContextVar("read_replica", default=False)
+
+
+def replica_configured() -> bool:
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def read_from_replica(enabled: bool = True) -> Iterator[None]:
+    """Route reads of the `REPLICA_APPS` models inside the block to the replica, when there is one."""
+    token = _read_replica.set(enabled and replica_configured())
+    try:
+        yield
+    finally:
+        _read_replica.reset(token)
+
+
+def pin_catalogue() -> None:
+    """
+    Read the catalogue from the primary for `REPLICA_PIN_SECONDS` once the current transaction commits.
+
+    Called for model saves and deletes in `REPLICA_APPS` by a signal receiver
+    in `businesses.signals`; `QuerySet.update()` and `bulk_create()` callers
+    must call it themselves.
+    """
+    if replica_configured():
+        transaction.on_commit(lambda: cache.set(CATALOGUE_PIN_KEY, True, settings.REPLICA_PIN_SECONDS))
+
+
+class ReplicaRouter:
+    """
+    Sends catalogue reads to the replica inside `read_from_replica`, everything else to the primary.
+
+    Writes always go to the primary, including saves of instances that were
+    loaded from the replica.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _read_replica.get() and model._meta.app_label in settings.REPLICA_APPS:
+            return REPLICA_DB_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return {obj1._state.db, obj2._state.db} <= {DEFAULT_DB_ALIAS, REPLICA_DB_ALIAS} or None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema from the primary.
+        return False if db == REPLICA_DB_ALIAS else None
+
+
+def _client_pin_key(request: HttpRequest) -> str | None:
+    header = request.META.get("HTTP_AUTHORIZATION")
+    if not header:
+        return None
+    return f"replica:pin:{hashlib.sha256(header.encode()).hexdigest()}"
+
+
+class ReplicaMiddleware:
+    """
+    Serves safe requests from the replica unless the client wrote recently.
+
+    A client that sends a write is pinned to the primary for
+    `REPLICA_PIN_SECONDS`, so it reads its own writes: by a cookie, and for
+    API clients without a cookie jar by a cache entry keyed on their
+    Authorization header.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        keys = self._pin_keys(request)
+        with read_from_replica(keys is not None and not cache.get_many(keys)):
+            response = self.get_response(request)
+        if self._writes(request):
+            self._pin_cookie(response)
+            if key := _client_pin_key(request):
+                cache.set(key, True, settings.REPLICA_PIN_SECONDS)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        keys = self._pin_keys(request)
+        with read_from_replica(keys is not None and not await acache("get_many", keys)):
+            response = await self.get_response(request)
+        if self._writes(request):
+            self._pin_cookie(response)
+            if key := _client_pin_key(request):
+                await acache("set", key, True, settings.REPLICA_PIN_SECONDS)
+        return response
+
+    @staticmethod
+    def _pin_keys(request: HttpRequest) -> list[str] | None:
+        """Cache keys that pin `request` to the primary, or None when it cannot use the replica at all."""
+        if request.method not in SAFE_METHODS or PIN_COOKIE in request.COOKIES or not replica_configured():
+            return None
+        client_key = _client_pin_key(request)
+        return [CATALOGUE_PIN_KEY, client_key] if client_key else [CATALOGUE_PIN_KEY]
+
+    @staticmethod
+    def _writes(request: HttpRequest) -> bool:
+        return request.method not in SAFE_METHODS and replica_configured()
+
+    @staticmethod
+    def _pin_cookie(response: HttpResponse) -> None:
+        response.set_cookie(
+            PIN_COOKIE, "1", max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite="Lax"
+        )
+
+
+def copy_sqlite_database(source: str = DEFAULT_DB_ALIAS, target: str = REPLICA_DB_ALIAS) -> None:
+    """Replace the SQLite database `target` with a copy of `source`: one round of simulated replication."""
+    for alias in (source, target):
+        if connections[alias].vendor != "sqlite":
+            raise ImproperlyConfigured(f"Database {alias!r} is not SQLite.")
+        connections[alias].ensure_connection()
+    connections[source].connection.backup(connections[target].connection)
@@ -14,6 +14,10 @@ from datetime import timedelta
 from pathlib import Path
 import os
 
+from django.core.exceptions import ImproperlyConfigured
+
+from hartazone.database import database_config
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -60,17 +64,21 @@ INSTALLED_APPS = [
     'businesses.apps.BusinessesConfig',
     'menu.apps.MenuConfig',
     'offers.apps.OffersConfig',
+    'orders.apps.OrdersConfig',
+    'search.apps.SearchConfig',
     'users.apps.UsersConfig',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'hartazone.middleware.CompressionMiddleware',
+    'hartazone.replicas.ReplicaMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware', 
+    'hartazone.middleware.WhiteNoiseMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -96,13 +104,114 @@ WSGI_APPLICATION = 'hartazone.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+# DATABASE_URL selects Postgres (Render sets it); without it, SQLite in WAL mode.
+# Under ASGI every request runs in a new thread, so persistent connections are
+# never reused and only pile up: connections close after each request unless
+# DB_CONN_MAX_AGE is set, which WSGI deployments (the Docker image) do. On
+# Postgres, DB_POOL=1 uses psycopg's pool instead, under either server.
 
 DATABASES = {
+    'default': database_config(
+        os.getenv('DATABASE_URL'),
+        BASE_DIR / 'db.sqlite3',
+        conn_max_age=int(os.getenv('DB_CONN_MAX_AGE', 0)),
+        pool=os.getenv('DB_POOL', '0') == '1',
+    )
+}
+
+# Optional read replica (REPLICA_DATABASE_URL) for safe requests to the catalogue
+# apps. A client that writes reads from the primary for REPLICA_PIN_SECONDS, and
+# so does everyone after a catalogue write, so caches are not rebuilt from rows
+# the replica does not have yet. Set it to at least the usual replication lag.
+if os.getenv('REPLICA_DATABASE_URL'):
+    DATABASES['replica'] = {
+        **database_config(
+            os.getenv('REPLICA_DATABASE_URL'),
+            BASE_DIR / 'replica.sqlite3',
+            conn_max_age=int(os.getenv('DB_CONN_MAX_AGE', 0)),
+            pool=os.getenv('DB_POOL', '0') == '1',
+        ),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['hartazone.replicas.ReplicaRouter']
+REPLICA_APPS = ('businesses', 'menu', 'offers')
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 5))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Menu versions, price tables, the search index generation and replica pins
+# live in the cache, so every worker process must share it. The local-memory
+# default is per process and is only allowed with a single worker
+# (WEB_CONCURRENCY, which gunicorn reads too); Render uses Redis.
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'hartazone'),
     }
 }
+SHARED_CACHE = CACHES['default']['BACKEND'] != 'django.core.cache.backends.locmem.LocMemCache'
+if int(os.getenv('WEB_CONCURRENCY', 1)) > 1 and not SHARED_CACHE:
+    raise ImproperlyConfigured('WEB_CONCURRENCY > 1 needs a shared CACHE_BACKEND, such as Redis.')
+# Replica pins must reach every worker, and the process that replicates.
+if 'replica' in DATABASES and not SHARED_CACHE:
+    raise ImproperlyConfigured('REPLICA_DATABASE_URL needs a shared CACHE_BACKEND, such as Redis.')
+
+# Seconds a serialized restaurant detail stays cached; menu edits invalidate it sooner.
+RESTAURANT_DETAIL_CACHE_TIMEOUT = int(os.getenv('RESTAURANT_DETAIL_CACHE_TIMEOUT', 60 * 60 * 24))
+
+# Store restaurant details as rendered JSON bytes served with an ETag (and
+# optionally a gzip copy), answering matching If-None-Match with 304.
+RESTAURANT_DETAIL_PRERENDER = os.getenv('RESTAURANT_DETAIL_PRERENDER', '1') == '1'
+RESTAURANT_DETAIL_PRERENDER_GZIP = os.getenv('RESTAURANT_DETAIL_PRERENDER_GZIP', '0') == '1'
+
+# Brotli/gzip compression of API responses (hartazone.middleware.CompressionMiddleware).
+# Levels are per URL name for bodies compressed on each request; cached payloads
+# (restaurant snapshots, home, offers) are compressed once per version, so they
+# use the slower, smaller levels. Compressed copies are cached for
+# API_COMPRESSION_CACHE_TIMEOUT seconds.
+API_COMPRESSION = os.getenv('API_COMPRESSION', '1') == '1'
+API_COMPRESSION_PREFIX = '/api/'
+API_COMPRESSION_MIN_SIZE = int(os.getenv('API_COMPRESSION_MIN_SIZE', 1024))
+API_COMPRESSION_LEVELS = {
+    'default': {'br': 5, 'gzip': 6},
+    # The largest uncached payloads; level 4 is about as fast as gzip -6.
+    'product-list': {'br': 4, 'gzip': 6},
+    'search-list': {'br': 4, 'gzip': 6},
+}
+API_COMPRESSION_CACHED_LEVELS = {'br': 11, 'gzip': 9}
+API_COMPRESSION_CACHE_TIMEOUT = int(os.getenv('API_COMPRESSION_CACHE_TIMEOUT', 10 * 60))
+
+# Seconds the home payload stays fresh, and how much longer a stale copy is
+# served while one worker rebuilds it.
+HOME_CACHE_TIMEOUT = int(os.getenv('HOME_CACHE_TIMEOUT', 60))
+HOME_CACHE_STALE_TIMEOUT = int(os.getenv('HOME_CACHE_STALE_TIMEOUT', 5 * 60))
+
+# Upper bound on how long the offers feed is cached; it is also refreshed when
+# the next offer expires and cleared when offers change.
+OFFERS_CACHE_TIMEOUT = int(os.getenv('OFFERS_CACHE_TIMEOUT', 10 * 60))
+
+# Default and maximum search radius, in km, for `?lat=&lng=` nearby lookups.
+NEARBY_RADIUS_KM = float(os.getenv('NEARBY_RADIUS_KM', 10))
+NEARBY_MAX_RADIUS_KM = float(os.getenv('NEARBY_MAX_RADIUS_KM', 50))
+
+# Seconds a compiled cart price table stays cached; it is keyed by menu
+# version, so menu edits retire it sooner.
+PRICE_TABLE_CACHE_TIMEOUT = int(os.getenv('PRICE_TABLE_CACHE_TIMEOUT', 60 * 60 * 24))
+
+# Rebuild a worker's stale search index in a background thread, serving the
+# previous one meanwhile, rather than in the request that noticed.
+SEARCH_INDEX_BACKGROUND_REBUILD = os.getenv('SEARCH_INDEX_BACKGROUND_REBUILD', '1') == '1'
+
+# Time zone that `BusinessHours` are written in, used by `?open_now=1`.
+BUSINESS_TIME_ZONE = os.getenv('BUSINESS_TIME_ZONE', 'America/Managua')
+
+# Answer the common catalogue GETs (home, offers, restaurant list and detail)
+# with async views, so ASGI workers serve them without the sync thread. Turn
+# off under WSGI, where async views only add overhead.
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', '1') == '1'
 
 
 # Password validation
@@ -156,6 +265,11 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # Same bytes as DRF's JSONRenderer, encoded with orjson when it is installed.
+    'DEFAULT_RENDERER_CLASSES': (
+        'hartazone.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 }
 
 
@@ -166,8 +280,21 @@ SIMPLE_JWT = {
     'BLACKLIST_AFTER_ROTATION': True,
     'UPDATE_LAST_LOGIN': True,
     'AUTH_HEADER_TYPES': ('Bearer',),
+    'TOKEN_REFRESH_SERIALIZER': 'users.serializers.UserTokenRefreshSerializer',
 }
 
+# Read-heavy views authenticate JWTs from their claims instead of loading the
+# user (see `users.authentication`). Recent role changes and deactivations
+# are picked up within this many seconds; set CLAIMS_AUTH_CHECK_REVOCATIONS=0
+# to trust the claims until the access token expires.
+CLAIMS_AUTH_CHECK_REVOCATIONS = os.getenv('CLAIMS_AUTH_CHECK_REVOCATIONS', '1') == '1'
+CLAIMS_AUTH_REVOCATION_TTL = int(os.getenv('CLAIMS_AUTH_REVOCATION_TTL', 30))
+
+# Seconds between fetches of newly blacklisted refresh tokens into each
+# worker's in-memory blacklist. Run `manage.py prune_tokens` regularly to
+# delete expired rows.
+TOKEN_BLACKLIST_SYNC_INTERVAL = int(os.getenv('TOKEN_BLACKLIST_SYNC_INTERVAL', 5))
+
 
 # Social login configuration placeholders
 GOOGLE_CLIENT_ID = os.getenv('GOOGLE_CLIENT_ID', '')
@@ -22,5 +22,7 @@ urlpatterns = [
     path('api/', include('businesses.urls')),
     path('api/', include('menu.urls')),
     path('api/', include('offers.urls')),
+    path('api/', include('orders.urls')),
+    path('api/', include('search.urls')),
     path('api/auth/', include('users.urls')),
 ]
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any, Iterable
+
+from django.db.models import QuerySet
+
+from .models import ExtraItem, FoodItemExtraGroup, MysteryBoxExtraGroup, format_eta, format_price
+
+# Plain-function renderers for the read-only catalogue payloads. Each takes a
+# `.values()` row (plus its pre-loaded modifiers) and returns exactly the dict
+# the matching DRF serializer would, without DRF's per-field machinery.
+# `menu/tests.py` keeps them byte-identical to the serializers.
+
+FOOD_ITEM_FIELDS = (
+    "id",
+    "name",
+    "description",
+    "image_url",
+    "price",
+    "currency",
+    "preparation_time_minutes",
+    "is_discounted",
+    "discount_percentage",
+)
+FOOD_ITEM_DETAIL_FIELDS = FOOD_ITEM_FIELDS + ("business_id", "business__name")
+MYSTERY_BOX_FIELDS = ("id", "title", "description", "highlight", "image_url", "price", "currency")
+
+Row = dict[str, Any]
+
+
+def percentage(value: Decimal | None) -> float | None:
+    if value is None:
+        return None
+    return float(value)
+
+
+def extra_item(row: Row) -> dict[str, Any]:
+    """`ExtraItemSerializer` for a row with id, name and price_delta."""
+    return {
+        "id": str(row["id"]),
+        "label": row["name"],
+        "priceDelta": float(row["price_delta"] or Decimal("0.00")),
+    }
+
+
+def modifier(group_id: int, group_name: str, options: list[dict[str, Any]]) -> dict[str, Any]:
+    """`ModifierSerializer` / `MysteryBoxModifierSerializer` for one group link."""
+    return {"id": str(group_id), "name": group_name, "options": options}
+
+
+def modifier_ref(link: Row) -> dict[str, Any]:
+    """Item-side reference to a group in the normalized `modifierGroups` layout."""
+    return {
+        "id": str(link["group_id"]),
+        "required": link["required"],
+        "minChoices": link["min_choices"],
+        "maxChoices": link["max_choices"],
+    }
+
+
+def food_item(row: Row, modifiers: list[dict[str, Any]]) -> dict[str, Any]:
+    """`FoodItemSerializer` for a row with `FOOD_ITEM_FIELDS`."""
+    return {
+        "id": str(row["id"]),
+        "name": row["name"],
+        "description": row["description"],
+        "price": format_price(row["price"], row["currency"]),
+        "image": row["image_url"] or "",
+        "eta": format_eta(row["preparation_time_minutes"]),
+        "discount": row["is_discounted"],
+        "percentage": percentage(row["discount_percentage"]),
+        "modifiers": modifiers,
+    }
+
+
+def food_item_detail(row: Row, modifiers: list[dict[str, Any]]) -> dict[str, Any]:
+    """`FoodItemDetailSerializer` for a row with `FOOD_ITEM_DETAIL_FIELDS`."""
+    return {
+        "id": str(row["id"]),
+        "name": row["name"],
+        "description": row["description"],
+        "price": format_price(row["price"], row["currency"]),
+        "image": row["image_url"] or "",
+        "info": row["description"] or "",
+        "eta": format_eta(row["preparation_time_minutes"]) or "",
+        "restaurantId": str(row["business_id"]),
+        "restaurantName": row["business__name"],
+        "discount": row["is_discounted"],
+        "percentage": percentage(row["discount_percentage"]),
+        "modifiers": modifiers,
+    }
+
+
+def mystery_box(row: Row, modifiers: list[dict[str, Any]]) -> dict[str, Any]:
+    """`MysteryBoxSerializer` for a row with `MYSTERY_BOX_FIELDS`."""
+    return {
+        "id": str(row["id"]),
+        "title": row["title"],
+        "description": row["description"],
+        "highlight": row["highlight"],
+        "price": format_price(row["price"], row["currency"]),
+        "image": row["image_url"] or "",
+        "modifiers": modifiers,
+    }
+
+
+def group_options(group_ids) -> dict[int, list[dict[str, Any]]]:
+    """Available extras for `group_ids` (a list or a `values("group_id")` subquery), by group."""
+    options: dict[int, list[dict[str, Any]]] = {}
+    extras = (
+        ExtraItem.objects.filter(group_id__in=group_ids, is_available=True)
+        .order_by("group_id", "id")
+        .values("id", "group_id", "name", "price_delta")
+    )
+    for row in extras:
+        options.setdefault(row["group_id"], []).append(extra_item(row))
+    return options
+
+
+def _ids(ids: Iterable[int] | QuerySet) -> list[int] | QuerySet:
+    # Querysets stay lazy and become a subquery, which keeps large id sets
+    # clear of the database's bound-parameter limit.
+    return ids if isinstance(ids, QuerySet) else list(ids)
+
+
+def load_item_modifiers(item_ids: Iterable[int] | QuerySet) -> dict[int, list[dict[str, Any]]]:
+    """Modifiers for many food items in two queries, keyed by food item id."""
+    links = list(
+        FoodItemExtraGroup.objects.filter(food_item_id__in=_ids(item_ids))
+        .order_by("food_item_id", "group_id")
+        .values("food_item_id", "group_id", "group__name")
+    )
+    if not links:
+        return {}
+    options = group_options({link["group_id"] for link in links})
+    modifiers: dict[int, list[dict[str, Any]]] = {}
+    for link in links:
+        modifiers.setdefault(link["food_item_id"], []).append(
+            modifier(link["group_id"], link["group__name"], options.get(link["group_id"], []))
+        )
+    return modifiers
+
+
+def load_box_modifiers(box_ids: Iterable[int] | QuerySet) -> dict[int, list[dict[str, Any]]]:
+    """Modifiers for many mystery boxes in two queries, keyed by mystery box id."""
+    links = list(
+        MysteryBoxExtraGroup.objects.filter(mystery_box_id__in=_ids(box_ids))
+        .order_by("mystery_box_id", "group_id")
+        .values("mystery_box_id", "group_id", "group__name")
+    )
+    if not links:
+        return {}
+    options = group_options({link["group_id"] for link in links})
+    modifiers: dict[int, list[dict[str, Any]]] = {}
+    for link in links:
+        modifiers.setdefault(link["mystery_box_id"], []).append(
+            modifier(link["group_id"], link["group__name"], options.get(link["group_id"], []))
+        )
+    return modifiers
+
+
+def load_item_modifier_refs(
+    item_ids: Iterable[int] | QuerySet,
+) -> tuple[dict[int, list[dict[str, Any]]], dict[str, dict[str, Any]]]:
+    """
+    Normalized modifiers for many food items in two queries.
+
+    Returns group references keyed by food item id, plus each referenced
+    group (with its options) exactly once, keyed by group id.
+    """
+    links = list(
+        FoodItemExtraGroup.objects.filter(food_item_id__in=_ids(item_ids))
+        .order_by("food_item_id", "group_id")
+        .values("food_item_id", "group_id", "group__name", "required", "min_choices", "max_choices")
+    )
+    if not links:
+        return {}, {}
+    options = group_options({link["group_id"] for link in links})
+    refs: dict[int, list[dict[str, Any]]] = {}
+    groups: dict[str, dict[str, Any]] = {}
+    for link in links:
+        refs.setdefault(link["food_item_id"], []).append(modifier_ref(link))
+        groups.setdefault(
+            str(link["group_id"]),
+            modifier(link["group_id"], link["group__name"], options.get(link["group_id"], [])),
+        )
+    return refs, groups
+
+
+def render_food_items(queryset, detail: bool = False, with_modifiers: bool = True) -> list[dict[str, Any]]:
+    """
+    Render a `FoodItem` queryset as `FoodItemSerializer` (or detail) output in three queries.
+
+    With `with_modifiers=False` the modifier queries are skipped and every item
+    gets an empty list, for callers that drop the key anyway.
+    """
+    fields = FOOD_ITEM_DETAIL_FIELDS if detail else FOOD_ITEM_FIELDS
+    queryset = queryset.prefetch_related(None)
+    rows = list(queryset.values(*fields))
+    modifiers = load_item_modifiers(queryset.values("id")) if rows and with_modifiers else {}
+    render = food_item_detail if detail else food_item
+    return [render(row, modifiers.get(row["id"], [])) for row in rows]
+
+
+def render_food_items_normalized(
+    queryset, detail: bool = False, with_modifiers: bool = True
+) -> tuple[list[dict[str, Any]], dict[str, dict[str, Any]]]:
+    """Like `render_food_items`, but with group references and a separate `modifierGroups` map."""
+    fields = FOOD_ITEM_DETAIL_FIELDS if detail else FOOD_ITEM_FIELDS
+    queryset = queryset.prefetch_related(None)
+    rows = list(queryset.values(*fields))
+    refs, groups = load_item_modifier_refs(queryset.values("id")) if rows and with_modifiers else ({}, {})
+    render = food_item_detail if detail else food_item
+    return [render(row, refs.get(row["id"], [])) for row in rows], groups
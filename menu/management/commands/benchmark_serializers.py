@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from businesses import fastpath as home_fastpath
+from businesses.serializers import HomeProductSerializer, MostOrderedItemSerializer
+from menu import fastpath
+from menu.models import FoodItem, MysteryBox
+from menu.serializers import FoodItemDetailSerializer, FoodItemSerializer, MysteryBoxSerializer
+from menu.synthetic import create_synthetic_catalogue
+
+
+class Command(BaseCommand):
+    help = "Compares DRF serializers with the fast-path renderers on a synthetic catalogue (rolled back afterwards)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        items = options["items"]
+        businesses = max(items // 100, 1)
+
+        with transaction.atomic():
+            business_ids = create_synthetic_catalogue(
+                businesses=businesses, items_per_business=max(items // businesses, 1)
+            )
+            food_items = FoodItem.objects.filter(business_id__in=business_ids).select_related("business")
+            boxes = MysteryBox.objects.filter(business_id__in=business_ids)
+
+            def fast_home(render):
+                rows = list(food_items.values(*home_fastpath.HOME_PRODUCT_FIELDS))
+                modifiers = fastpath.load_item_modifiers(food_items.values("id"))
+                return [render(row, modifiers.get(row["id"], [])) for row in rows]
+
+            def fast_boxes():
+                modifiers = fastpath.load_box_modifiers(boxes.values("id"))
+                return [
+                    fastpath.mystery_box(row, modifiers.get(row["id"], []))
+                    for row in boxes.values(*fastpath.MYSTERY_BOX_FIELDS)
+                ]
+
+            cases = (
+                (
+                    "FoodItemSerializer",
+                    lambda: FoodItemSerializer(food_items, many=True).data,
+                    lambda: fastpath.render_food_items(food_items),
+                ),
+                (
+                    "FoodItemDetailSerializer",
+                    lambda: FoodItemDetailSerializer(food_items, many=True).data,
+                    lambda: fastpath.render_food_items(food_items, detail=True),
+                ),
+                (
+                    "HomeProductSerializer",
+                    lambda: HomeProductSerializer(food_items, many=True).data,
+                    lambda: fast_home(home_fastpath.home_product),
+                ),
+                (
+                    "MostOrderedItemSerializer",
+                    lambda: MostOrderedItemSerializer(food_items, many=True).data,
+                    lambda: fast_home(home_fastpath.most_ordered_item),
+                ),
+                (
+                    "MysteryBoxSerializer",
+                    lambda: MysteryBoxSerializer(boxes, many=True).data,
+                    fast_boxes,
+                ),
+            )
+
+            self.stdout.write(f"{food_items.count()} food items, {boxes.count()} mystery boxes")
+            for name, drf, fast in cases:
+                drf_time = self._best_of(drf, options["repeat"])
+                fast_time = self._best_of(fast, options["repeat"])
+                self.stdout.write(
+                    f"{name:<28} drf {drf_time * 1000:9.1f} ms   fast {fast_time * 1000:8.1f} ms   "
+                    f"x{drf_time / fast_time:.1f}"
+                )
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def _best_of(func, repeat: int) -> float:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-17 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businesses', '0002_hot_path_indexes'),
+        ('menu', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fooditem',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['section', 'name', 'id'], name='food_items_available_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fooditem',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['-is_discounted', '-discount_percentage', '-created_at'], name='food_items_most_ordered_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fooditem',
+            index=models.Index(condition=models.Q(('is_available', True)), fields=['-discount_percentage', '-is_discounted', 'name'], name='food_items_featured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='menusection',
+            index=models.Index(fields=['business', 'position', 'id'], name='menu_sections_business_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mysterybox',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['business', 'id'], name='mystery_boxes_active_idx'),
+        ),
+    ]
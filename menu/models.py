@@ -22,6 +22,7 @@ class MenuSection(models.Model):
     class Meta:
         db_table = "menu_sections"
         ordering = ("position", "id")
+        indexes = [models.Index(fields=["business", "position", "id"], name="menu_sections_business_idx")]
 
     def __str__(self) -> str:
         return f"{self.business.name} - {self.name}"
@@ -72,19 +73,34 @@ class FoodItem(models.Model):
     class Meta:
         db_table = "food_items"
         ordering = ("section_id", "name")
+        # Only available items are ever listed, so these are partial indexes:
+        # the product list and menu tree order, then the two home sections.
+        indexes = [
+            models.Index(
+                fields=["section", "name", "id"],
+                condition=models.Q(is_available=True),
+                name="food_items_available_idx",
+            ),
+            models.Index(
+                fields=["-is_discounted", "-discount_percentage", "-created_at"],
+                condition=models.Q(is_available=True),
+                name="food_items_most_ordered_idx",
+            ),
+            models.Index(
+                fields=["-discount_percentage", "-is_discounted", "name"],
+                condition=models.Q(is_available=True),
+                name="food_items_featured_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.name} ({self.business.name})"
 
     def price_with_currency(self) -> str:
-        amount = self.price.quantize(Decimal("0.01"))
-        symbol = currency_symbol(self.currency)
-        return f"{symbol}{amount}"
+        return format_price(self.price, self.currency)
 
     def eta_display(self) -> Optional[str]:
-        if self.preparation_time_minutes:
-            return f"{self.preparation_time_minutes} min"
-        return None
+        return format_eta(self.preparation_time_minutes)
 
 
 class FoodVariant(models.Model):
@@ -216,14 +232,19 @@ class MysteryBox(models.Model):
     class Meta:
         db_table = "mystery_boxes"
         ordering = ("business_id", "id")
+        indexes = [
+            models.Index(
+                fields=["business", "id"],
+                condition=models.Q(is_active=True),
+                name="mystery_boxes_active_idx",
+            )
+        ]
 
     def __str__(self) -> str:
         return f"{self.business.name} - {self.title}"
 
     def price_with_currency(self) -> str:
-        amount = self.price.quantize(Decimal("0.01"))
-        symbol = currency_symbol(self.currency)
-        return f"{symbol}{amount}"
+        return format_price(self.price, self.currency)
 
 
 class MysteryBoxExtraGroup(models.Model):
@@ -254,3 +275,13 @@ def currency_symbol(currency_code: str | None) -> str:
         "NIO": "C$",
     }
     return symbols.get(code, "C$")
+
+
+def format_price(amount: Decimal, currency_code: str | None) -> str:
+    return f"{currency_symbol(currency_code)}{amount.quantize(Decimal('0.01'))}"
+
+
+def format_eta(minutes: int | None) -> Optional[str]:
+    if minutes:
+        return f"{minutes} min"
+    return None
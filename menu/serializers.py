@@ -5,6 +5,7 @@ from typing import Any
 
 from rest_framework import serializers
 
+from hartazone.fieldsets import SparseFieldsMixin
 from .models import (
     ExtraItem,
     ExtraGroup,
@@ -148,7 +149,7 @@ class MysteryBoxSerializer(serializers.ModelSerializer):
         return MysteryBoxModifierSerializer(links, many=True).data
 
 
-class FoodItemDetailSerializer(serializers.ModelSerializer):
+class FoodItemDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     id = serializers.CharField(source="pk", read_only=True)
     price = serializers.SerializerMethodField()
     image = serializers.SerializerMethodField()
@@ -176,6 +177,7 @@ class FoodItemDetailSerializer(serializers.ModelSerializer):
             "percentage",
             "modifiers",
         )
+        expandable_fields = ("modifiers",)
 
     def get_price(self, obj: FoodItem) -> str:
         return obj.price_with_currency()
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import random
+from decimal import Decimal
+
+from businesses.models import Business, BusinessCategory
+from .models import (
+    ExtraGroup,
+    ExtraItem,
+    FoodItem,
+    FoodItemExtraGroup,
+    MenuSection,
+    MysteryBox,
+    MysteryBoxExtraGroup,
+)
+
+DISHES = ("Vigorón", "Nacatamal", "Indio Viejo", "Quesillo", "Gallo Pinto", "Baho", "Rondón", "Sopa de Mondongo")
+SECTIONS = ("Entradas", "Platos fuertes", "Sopas", "Postres", "Bebidas")
+CATEGORIES = ("Fritangas", "Cafeterías", "Mariscos", "Panaderías", "Asados", "Comida rápida", "Pizzerías")
+
+
+def create_synthetic_businesses(count: int, seed: int = 0) -> list[Business]:
+    """
+    Bulk-insert `count` businesses spread over a 1° x 1° area.
+
+    `bulk_create` skips `Business.save`, so `geo_cell` is filled in here.
+    """
+    rng = random.Random(seed)
+    categories = [BusinessCategory.objects.get_or_create(name=name)[0] for name in CATEGORIES]
+    businesses = []
+    for index in range(count):
+        latitude = Decimal(f"{12.0 + rng.random():.7f}")
+        longitude = Decimal(f"{-86.5 + rng.random():.7f}")
+        businesses.append(
+            Business(
+                category=rng.choice(categories),
+                name=f"Restaurante {index:06d}",
+                tagline="Sabor sintético",
+                latitude=latitude,
+                longitude=longitude,
+                average_rating=Decimal(f"{rng.uniform(3, 5):.2f}"),
+                review_count=rng.randint(0, 5000),
+                delivery_available=True,
+                delivery_time_minutes_min=rng.randint(10, 40),
+                delivery_time_minutes_max=rng.randint(40, 70),
+            )
+        )
+    return Business.objects.bulk_create(businesses, batch_size=2000)
+
+
+def create_synthetic_catalogue(
+    businesses: int = 10,
+    items_per_business: int = 100,
+    groups_per_business: int = 4,
+    extras_per_group: int = 4,
+    seed: int = 0,
+) -> list[int]:
+    """
+    Bulk-insert a synthetic catalogue for benchmarks and query-plan tests.
+
+    Uses `bulk_create` throughout, so menu version signals do not fire.
+    Returns the ids of the created businesses.
+    """
+    rng = random.Random(seed)
+    created = create_synthetic_businesses(businesses, seed=seed)
+
+    sections = MenuSection.objects.bulk_create(
+        MenuSection(business=business, name=name, position=position)
+        for business in created
+        for position, name in enumerate(SECTIONS)
+    )
+    groups = ExtraGroup.objects.bulk_create(
+        ExtraGroup(business=business, name=f"Grupo {index}")
+        for business in created
+        for index in range(groups_per_business)
+    )
+    ExtraItem.objects.bulk_create(
+        ExtraItem(
+            group=group,
+            name=f"Extra {index}",
+            price_delta=Decimal(rng.randint(0, 60)),
+            is_available=rng.random() > 0.1,
+        )
+        for group in groups
+        for index in range(extras_per_group)
+    )
+
+    sections_by_business: dict[int, list[MenuSection]] = {}
+    for section in sections:
+        sections_by_business.setdefault(section.business_id, []).append(section)
+    groups_by_business: dict[int, list[ExtraGroup]] = {}
+    for group in groups:
+        groups_by_business.setdefault(group.business_id, []).append(group)
+
+    items = FoodItem.objects.bulk_create(
+        (
+            FoodItem(
+                business=business,
+                section=rng.choice(sections_by_business[business.pk]),
+                name=f"{rng.choice(DISHES)} {index:05d}",
+                description="Receta de la casa" if rng.random() > 0.2 else None,
+                image_url=f"https://example.com/{business.pk}/{index}.jpg",
+                price=Decimal(rng.randint(5000, 90000)) / 100,
+                preparation_time_minutes=rng.choice((None, 10, 15, 20, 30)),
+                is_available=rng.random() > 0.05,
+                is_discounted=(discounted := rng.random() > 0.7),
+                discount_percentage=Decimal(rng.randint(5, 40)) if discounted else None,
+            )
+            for business in created
+            for index in range(items_per_business)
+        ),
+        batch_size=2000,
+    )
+    FoodItemExtraGroup.objects.bulk_create(
+        (
+            FoodItemExtraGroup(food_item=item, group=group, min_choices=0, max_choices=2)
+            for item in items
+            for group in rng.sample(
+                groups_by_business[item.business_id],
+                min(rng.randint(0, 2), len(groups_by_business[item.business_id])),
+            )
+        ),
+        batch_size=2000,
+    )
+
+    boxes = MysteryBox.objects.bulk_create(
+        MysteryBox(
+            business=business,
+            title="Caja sorpresa",
+            description="Lo mejor del día",
+            price=Decimal("250.00"),
+        )
+        for business in created
+    )
+    MysteryBoxExtraGroup.objects.bulk_create(
+        MysteryBoxExtraGroup(mystery_box=box, group=groups_by_business[box.business_id][0])
+        for box in boxes
+        if groups_by_business.get(box.business_id)
+    )
+    return [business.pk for business in created]
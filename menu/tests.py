@@ -1,3 +1,180 @@
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from businesses.models import Business
+from hartazone.queryplan import plan_problems
+from . import fastpath
+from .models import (
+    ExtraGroup,
+    ExtraItem,
+    FoodItem,
+    FoodItemExtraGroup,
+    MenuSection,
+    MysteryBox,
+    MysteryBoxExtraGroup,
+)
+from .serializers import FoodItemDetailSerializer, FoodItemSerializer, MysteryBoxSerializer
+from .synthetic import create_synthetic_catalogue
+
+
+def create_catalogue(items=12):
+    business = Business.objects.create(name="Fritanga Doña Ñoña")
+    section = MenuSection.objects.create(business=business, name="Platos")
+    groups = [
+        ExtraGroup.objects.create(business=business, name="Salsas"),
+        ExtraGroup.objects.create(business=business, name="Bebidas", description="Frías"),
+    ]
+    ExtraItem.objects.create(group=groups[0], name="Chilero", price_delta=Decimal("0.00"))
+    ExtraItem.objects.create(group=groups[0], name="Agotada", is_available=False)
+    ExtraItem.objects.create(group=groups[1], name="Cacao", price_delta=Decimal("35.50"))
+    ExtraItem.objects.create(group=groups[1], name="Pitahaya", price_delta=Decimal("0.25"))
+
+    for index in range(items):
+        item = FoodItem.objects.create(
+            business=business,
+            section=section if index % 4 else None,
+            name=f"Vigorón {index:02d}",
+            description=None if index % 3 == 0 else f"Yuca con chicharrón “{index}”",
+            image_url="" if index % 2 else f"https://example.com/{index}.jpg",
+            price=Decimal("85") + Decimal(index) / 3,
+            currency="NIO" if index % 5 else "usd",
+            preparation_time_minutes=None if index % 3 == 1 else index,
+            is_discounted=index % 2 == 0,
+            discount_percentage=Decimal("12.50") if index % 2 == 0 else None,
+        )
+        for group in groups[: index % 3]:
+            FoodItemExtraGroup.objects.create(food_item=item, group=group)
+
+    box = MysteryBox.objects.create(
+        business=business,
+        title="Caja",
+        description="Sorpresa",
+        highlight="Solo hoy",
+        price=Decimal("199.999"),
+        image_url=None,
+    )
+    MysteryBoxExtraGroup.objects.create(mystery_box=box, group=groups[1])
+    MysteryBox.objects.create(business=business, title="Vacía", description="", price=Decimal("1"))
+    return business
+
+
+class FastPathParityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.business = create_catalogue()
+
+    def assertSameBytes(self, fast, serialized):
+        renderer = JSONRenderer()
+        self.assertEqual(renderer.render(fast), renderer.render(serialized))
+
+    def test_food_item_matches_serializer(self):
+        queryset = FoodItem.objects.filter(business=self.business)
+
+        self.assertSameBytes(
+            fastpath.render_food_items(queryset),
+            FoodItemSerializer(queryset, many=True).data,
+        )
+
+    def test_food_item_detail_matches_serializer(self):
+        queryset = FoodItem.objects.filter(business=self.business).select_related("business")
+
+        self.assertSameBytes(
+            fastpath.render_food_items(queryset, detail=True),
+            FoodItemDetailSerializer(queryset, many=True).data,
+        )
+
+    def test_mystery_box_matches_serializer(self):
+        boxes = MysteryBox.objects.filter(business=self.business)
+        modifiers = fastpath.load_box_modifiers(boxes.values("id"))
+
+        fast = [
+            fastpath.mystery_box(row, modifiers.get(row["id"], []))
+            for row in boxes.values(*fastpath.MYSTERY_BOX_FIELDS)
+        ]
+
+        self.assertSameBytes(fast, MysteryBoxSerializer(boxes, many=True).data)
+
+    def test_sliced_queryset(self):
+        queryset = FoodItem.objects.filter(business=self.business).order_by("-price")[:3]
+
+        self.assertSameBytes(
+            fastpath.render_food_items(queryset, detail=True),
+            FoodItemDetailSerializer(queryset, many=True).data,
+        )
+
+
+class ProductListTests(APITestCase):
+    def test_query_count_does_not_grow_with_items(self):
+        create_catalogue(items=4)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(reverse("product-list"))
+        create_catalogue(items=40)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(reverse("product-list"))
+
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(len(response.json()), 44)
+
+    def test_expand_without_modifiers_skips_modifier_queries(self):
+        create_catalogue(items=6)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("product-list"), {"fields": "id,name,price"})
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(sorted(response.json()[0]), ["id", "name", "price"])
+
+    def test_normalized_modifiers(self):
+        create_catalogue(items=9)
+        full = self.client.get(reverse("product-list")).json()
+
+        response = self.client.get(reverse("product-list"), {"modifiers": "normalized"}).json()
+
+        groups = response["modifierGroups"]
+        self.assertEqual(len(groups), 2)
+        for full_item, item in zip(full, response["results"]):
+            self.assertEqual([groups[ref["id"]] for ref in item["modifiers"]], full_item["modifiers"])
+
+    def test_normalized_modifiers_honour_fields(self):
+        create_catalogue(items=6)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse("product-list"), {"modifiers": "normalized", "fields": "id,name"}
+            ).json()
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(sorted(response["results"][0]), ["id", "name"])
+        self.assertEqual(response["modifierGroups"], {})
+
+        response = self.client.get(
+            reverse("product-list"), {"modifiers": "normalized", "fields": "id", "expand": "modifiers"}
+        ).json()
+
+        self.assertEqual(sorted(response["results"][0]), ["id", "modifiers"])
+        self.assertEqual(len(response["modifierGroups"]), 2)
+
+
+@skipUnless(connection.vendor == "sqlite", "query plans are checked with SQLite's EXPLAIN QUERY PLAN")
+class ProductListQueryPlanTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_synthetic_catalogue(businesses=200, items_per_business=50)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def test_product_rows_come_from_the_available_items_index(self):
+        # Without modifiers: loading modifiers for the whole, unpaginated
+        # list reads every link row, so a scan there is expected.
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("product-list"), {"expand": ""})
 
-# Create your tests here.
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(plan_problems(queries.captured_queries, allow_sort=False), {})
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from django.db.models import Q
+
+from . import fastpath
+from .models import (
+    ExtraItem,
+    FoodItem,
+    FoodItemExtraGroup,
+    MenuSection,
+    MysteryBox,
+    MysteryBoxExtraGroup,
+)
+
+
+@dataclass
+class MenuTree:
+    """Nested menu payload for a single business, shaped like the DRF serializers."""
+
+    menu: list[dict[str, Any]]
+    mystery_box: dict[str, Any] | None
+    modifier_groups: dict[str, dict[str, Any]] | None = None
+
+
+def build_menu_tree(business_id: int, normalized: bool = False) -> MenuTree:
+    """
+    Assemble the restaurant detail menu with a fixed number of queries.
+
+    Sections, available items, item/group links, the active mystery box, its
+    group links and the available extras are each loaded with one flat query,
+    so the cost does not grow with the size of the menu. The result matches
+    `MenuSectionSerializer(many=True)` and `MysteryBoxSerializer` output.
+
+    With `normalized=True` items and the mystery box carry group references
+    (id, required, minChoices, maxChoices) and each group's options are
+    emitted once in `modifier_groups`.
+    """
+    sections = list(
+        MenuSection.objects.filter(business_id=business_id)
+        .order_by("position", "id")
+        .values("id", "name", "description")
+    )
+    items = list(
+        FoodItem.objects.filter(section__business_id=business_id, is_available=True)
+        .order_by("section_id", "name", "id")
+        .values("section_id", *fastpath.FOOD_ITEM_FIELDS)
+    )
+    mystery_box = (
+        MysteryBox.objects.filter(business_id=business_id, is_active=True)
+        .order_by("business_id", "id")
+        .values(*fastpath.MYSTERY_BOX_FIELDS)
+        .first()
+    )
+
+    item_links = FoodItemExtraGroup.objects.filter(
+        food_item__section__business_id=business_id,
+        food_item__is_available=True,
+    )
+    box_links = MysteryBoxExtraGroup.objects.filter(
+        mystery_box__business_id=business_id,
+        mystery_box__is_active=True,
+    )
+    extras = ExtraItem.objects.filter(
+        Q(group_id__in=item_links.values("group_id")) | Q(group_id__in=box_links.values("group_id")),
+        is_available=True,
+    ).order_by("group_id", "id")
+
+    options_by_group: dict[int, list[dict[str, Any]]] = {}
+    for extra in extras.values("id", "group_id", "name", "price_delta"):
+        options_by_group.setdefault(extra["group_id"], []).append(fastpath.extra_item(extra))
+
+    modifier_groups: dict[str, dict[str, Any]] = {}
+
+    def modifier(link: dict[str, Any]) -> dict[str, Any]:
+        group = fastpath.modifier(
+            link["group_id"], link["group__name"], options_by_group.get(link["group_id"], [])
+        )
+        if not normalized:
+            return group
+        modifier_groups.setdefault(group["id"], group)
+        return fastpath.modifier_ref(link)
+
+    link_fields = ("group_id", "group__name", "required", "min_choices", "max_choices")
+    modifiers_by_item: dict[int, list[dict[str, Any]]] = {}
+    for link in item_links.order_by("food_item_id", "group_id").values("food_item_id", *link_fields):
+        modifiers_by_item.setdefault(link["food_item_id"], []).append(modifier(link))
+
+    items_by_section: dict[int, list[dict[str, Any]]] = {}
+    for item in items:
+        items_by_section.setdefault(item["section_id"], []).append(
+            fastpath.food_item(item, modifiers_by_item.get(item["id"], []))
+        )
+
+    menu = [
+        {
+            "id": str(section["id"]),
+            "title": section["name"],
+            "description": section["description"],
+            "items": items_by_section.get(section["id"], []),
+        }
+        for section in sections
+    ]
+
+    box_link_rows = list(
+        box_links.order_by("mystery_box_id", "group_id").values("mystery_box_id", *link_fields)
+    )
+
+    box_payload = None
+    if mystery_box is not None:
+        box_modifiers = [
+            modifier(link)
+            for link in box_link_rows
+            if link["mystery_box_id"] == mystery_box["id"]
+        ]
+        box_payload = fastpath.mystery_box(mystery_box, box_modifiers)
+
+    return MenuTree(
+        menu=menu,
+        mystery_box=box_payload,
+        modifier_groups=modifier_groups if normalized else None,
+    )
+
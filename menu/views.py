@@ -1,5 +1,9 @@
 from rest_framework import permissions, viewsets
+from rest_framework.response import Response
 
+from hartazone.fieldsets import FieldSelection
+from users.authentication import READ_AUTHENTICATION_CLASSES
+from .fastpath import render_food_items, render_food_items_normalized
 from .models import FoodItem
 from .serializers import FoodItemDetailSerializer
 
@@ -7,8 +11,13 @@ from .serializers import FoodItemDetailSerializer
 class ProductViewSet(viewsets.ReadOnlyModelViewSet):
     """
     Read-only endpoint for individual menu items with full modifier information.
+
+    Supports `?fields=` / `?expand=`; modifiers are only loaded when selected.
+    `?modifiers=normalized` returns `{"results", "modifierGroups"}` with each
+    modifier group serialized once, and takes the same parameters.
     """
 
+    authentication_classes = READ_AUTHENTICATION_CLASSES
     permission_classes = [permissions.AllowAny]
     serializer_class = FoodItemDetailSerializer
     queryset = (
@@ -16,3 +25,27 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
         .prefetch_related("extra_groups__group__extras")
         .filter(is_available=True)
     )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["field_selection"] = FieldSelection.from_request(self.request)
+        return context
+
+    def list(self, request, *args, **kwargs):
+        selection = FieldSelection.from_request(request)
+        expandable = FoodItemDetailSerializer.Meta.expandable_fields
+        with_modifiers = selection.includes("modifiers", expandable)
+        if request.query_params.get("modifiers") == "normalized":
+            items, groups = render_food_items_normalized(
+                self.filter_queryset(self.get_queryset()), detail=True, with_modifiers=with_modifiers
+            )
+            return Response(
+                {
+                    "results": [selection.apply(item, expandable) for item in items],
+                    "modifierGroups": groups,
+                }
+            )
+        items = render_food_items(
+            self.filter_queryset(self.get_queryset()), detail=True, with_modifiers=with_modifiers
+        )
+        return Response([selection.apply(item, expandable) for item in items])
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from django.db.models import Q, QuerySet
+
+from .models import Offer, OfferCategory, OfferInterestTag
+from .serializers import OfferSerializer
+
+OFFERS_CACHE_KEY = "offers-feed"
+FEED_SECTIONS = {
+    OfferCategory.HERO: "heroOffers",
+    OfferCategory.FLASH: "flashDeals",
+    OfferCategory.CURATED: "curatedCollections",
+}
+
+
+@dataclass(frozen=True)
+class OffersFeed:
+    """
+    Serialized active offers, kept with their expiry so the cached copy can
+    be cut to what is still live at the moment it is served.
+    """
+
+    offers: list[tuple[str, datetime | None, dict[str, Any]]]
+    interest_tags: list[str]
+
+    @property
+    def next_expiry(self) -> datetime | None:
+        return min((expires_at for _, expires_at, _ in self.offers if expires_at), default=None)
+
+    def fresh_for(self, now: datetime, timeout: float) -> float:
+        """`timeout`, capped at the seconds left until the next offer expires."""
+        if self.next_expiry is None:
+            return timeout
+        return max(0, min(timeout, math.ceil((self.next_expiry - now).total_seconds())))
+
+    def payload(self, now: datetime) -> dict[str, list[Any]]:
+        payload: dict[str, list[Any]] = {name: [] for name in FEED_SECTIONS.values()}
+        for category, expires_at, data in self.offers:
+            if expires_at is None or expires_at > now:
+                payload[FEED_SECTIONS[category]].append(data)
+        payload["interestTags"] = self.interest_tags
+        return payload
+
+
+def build_offers_feed(now: datetime) -> OffersFeed:
+    """Active, unexpired offers in one query, plus the interest tags."""
+    return _feed(list(_active_offers(now)), list(_interest_tags()))
+
+
+async def abuild_offers_feed(now: datetime) -> OffersFeed:
+    """`build_offers_feed()` for async views, with both queries run concurrently."""
+    offers, interest_tags = await asyncio.gather(_alist(_active_offers(now)), _alist(_interest_tags()))
+    return _feed(offers, interest_tags)
+
+
+async def _alist(query: QuerySet) -> list[Any]:
+    return [row async for row in query]
+
+
+def _active_offers(now: datetime) -> QuerySet:
+    return (
+        Offer.objects.filter(is_active=True, category__in=FEED_SECTIONS)
+        .filter(Q(expires_at__isnull=True) | Q(expires_at__gt=now))
+        .select_related("business")
+        .order_by("position", "id")
+    )
+
+
+def _interest_tags() -> QuerySet:
+    return OfferInterestTag.objects.order_by("position", "name").values_list("name", flat=True)
+
+
+def _feed(offers: list[Offer], interest_tags: list[str]) -> OffersFeed:
+    return OffersFeed(
+        offers=[
+            (offer.category, offer.expires_at, data)
+            for offer, data in zip(offers, OfferSerializer(offers, many=True).data)
+        ],
+        interest_tags=interest_tags,
+    )
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.6 on 2026-10-17 22:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('businesses', '0002_hot_path_indexes'),
+        ('offers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['position', 'id'], name='offers_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offerinteresttag',
+            index=models.Index(fields=['position', 'name'], name='offer_interest_tags_order_idx'),
+        ),
+    ]
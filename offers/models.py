@@ -31,6 +31,13 @@ class Offer(models.Model):
     class Meta:
         db_table = "offers"
         ordering = ("category", "position", "id")
+        indexes = [
+            models.Index(
+                fields=["position", "id"],
+                condition=models.Q(is_active=True),
+                name="offers_active_idx",
+            )
+        ]
 
     def __str__(self) -> str:
         return f"{self.title} ({self.get_category_display()})"
@@ -43,6 +50,7 @@ class OfferInterestTag(models.Model):
     class Meta:
         db_table = "offer_interest_tags"
         ordering = ("position", "name")
+        indexes = [models.Index(fields=["position", "name"], name="offer_interest_tags_order_idx")]
 
     def __str__(self) -> str:
         return self.name
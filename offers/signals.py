@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from businesses.models import Business
+from .feed import OFFERS_CACHE_KEY
+from .models import Offer, OfferInterestTag
+
+
+@receiver([post_save, post_delete], sender=Offer)
+@receiver([post_save, post_delete], sender=OfferInterestTag)
+@receiver([post_save, post_delete], sender=Business)
+def offers_changed(sender, instance, **kwargs) -> None:
+    cache.delete(OFFERS_CACHE_KEY)
+    # Again once the write commits: a feed rebuilt in between saw the old rows.
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(partial(cache.delete, OFFERS_CACHE_KEY))
@@ -1,3 +1,175 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from businesses.models import Business
+from hartazone.queryplan import plan_problems
+from menu.synthetic import create_synthetic_catalogue
+from .feed import OFFERS_CACHE_KEY
+from .models import Offer, OfferCategory, OfferInterestTag
+
+
+class OffersFeedTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("offer-list")
+        self.now = timezone.now()
+        self.business = Business.objects.create(name="Ofertas")
+        OfferInterestTag.objects.create(name="Nacatamal", position=1)
+        OfferInterestTag.objects.create(name="Café", position=0)
+
+    def _offer(self, title, category, expires_in=None, **kwargs):
+        return Offer.objects.create(
+            title=title,
+            description="",
+            image_url="https://example.com/offer.jpg",
+            savings_label="-20%",
+            category=category,
+            business=self.business,
+            expires_at=None if expires_in is None else self.now + expires_in,
+            **kwargs,
+        )
+
+    def _titles(self, payload):
+        return {
+            name: [offer["title"] for offer in payload[name]]
+            for name in ("heroOffers", "flashDeals", "curatedCollections")
+        }
+
+    def test_partitions_active_unexpired_offers(self):
+        self._offer("Hero", OfferCategory.HERO)
+        self._offer("Flash", OfferCategory.FLASH, expires_in=timedelta(hours=1), position=2)
+        self._offer("Flash primero", OfferCategory.FLASH, expires_in=timedelta(hours=2), position=1)
+        self._offer("Vencida", OfferCategory.FLASH, expires_in=-timedelta(minutes=1))
+        self._offer("Inactiva", OfferCategory.CURATED, is_active=False)
+        self._offer("Colección", OfferCategory.CURATED)
+
+        with CaptureQueriesContext(connection) as queries:
+            payload = self.client.get(self.url).json()
+
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(
+            self._titles(payload),
+            {
+                "heroOffers": ["Hero"],
+                "flashDeals": ["Flash primero", "Flash"],
+                "curatedCollections": ["Colección"],
+            },
+        )
+        self.assertEqual(payload["interestTags"], ["Café", "Nacatamal"])
+        self.assertEqual(payload["flashDeals"][1]["restaurantName"], "Ofertas")
+
+    def test_cached_until_next_expiry(self):
+        self._offer("Pronto", OfferCategory.FLASH, expires_in=timedelta(seconds=30))
+        self._offer("Después", OfferCategory.FLASH, expires_in=timedelta(hours=1))
+        self.client.get(self.url)
+
+        with CaptureQueriesContext(connection) as queries:
+            cached = self.client.get(self.url).json()
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(self._titles(cached)["flashDeals"], ["Pronto", "Después"])
+
+        later = self.now + timedelta(seconds=31)
+        with mock.patch("django.utils.timezone.now", return_value=later), mock.patch(
+            "hartazone.cache.time.time", return_value=later.timestamp()
+        ):
+            with CaptureQueriesContext(connection) as queries:
+                refreshed = self.client.get(self.url).json()
+
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(self._titles(refreshed)["flashDeals"], ["Después"])
+
+    def test_stale_copy_never_shows_expired_offers(self):
+        self._offer("Pronto", OfferCategory.FLASH, expires_in=timedelta(seconds=30))
+        self.client.get(self.url)
+        cache.add("offers-feed:rebuild", True)
+
+        later = self.now + timedelta(seconds=31)
+        with mock.patch("django.utils.timezone.now", return_value=later), mock.patch(
+            "hartazone.cache.time.time", return_value=later.timestamp()
+        ):
+            with CaptureQueriesContext(connection) as queries:
+                payload = self.client.get(self.url).json()
+
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(payload["flashDeals"], [])
+
+    def test_async_feed_matches_drf(self):
+        self._offer("Hero", OfferCategory.HERO)
+        self._offer("Flash", OfferCategory.FLASH, expires_in=timedelta(hours=1))
+
+        response = self.client.get(self.url)
+        cache.clear()
+        drf = self.client.get(self.url, {"format": "json"})
+
+        self.assertEqual(response.content, drf.content)
+        self.assertEqual(response["Content-Type"], drf["Content-Type"])
+
+    def test_edits_clear_the_cache(self):
+        offer = self._offer("Antes", OfferCategory.HERO)
+        self.client.get(self.url)
+
+        offer.title = "Después"
+        offer.save()
+        self.assertEqual(self._titles(self.client.get(self.url).json())["heroOffers"], ["Después"])
+
+        self.business.name = "Renombrado"
+        self.business.save()
+        payload = self.client.get(self.url).json()
+        self.assertEqual(payload["heroOffers"][0]["restaurantName"], "Renombrado")
+
+        OfferInterestTag.objects.create(name="Quesillo", position=2)
+        payload = self.client.get(self.url).json()
+        self.assertEqual(payload["interestTags"], ["Café", "Nacatamal", "Quesillo"])
+
+    def test_feed_cached_before_commit_is_cleared_on_commit(self):
+        offer = self._offer("Antes", OfferCategory.HERO)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            offer.title = "Después"
+            offer.save()
+            # A reader between the save and the commit caches whatever it saw.
+            self.client.get(self.url)
+            self.assertIsNotNone(cache.get(OFFERS_CACHE_KEY))
+
+        self.assertIsNone(cache.get(OFFERS_CACHE_KEY))
+
+
+@skipUnless(connection.vendor == "sqlite", "query plans are checked with SQLite's EXPLAIN QUERY PLAN")
+class OffersQueryPlanTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        categories = list(OfferCategory)
+        business_ids = create_synthetic_catalogue(businesses=500, items_per_business=1)
+        Offer.objects.bulk_create(
+            Offer(
+                title=f"Oferta {index}",
+                description="",
+                image_url="https://example.com/offer.jpg",
+                savings_label="-10%",
+                category=categories[index % len(categories)],
+                business_id=business_id,
+                is_active=index % 4 != 0,
+                position=index % 10,
+                expires_at=None if index % 2 else now + timedelta(hours=index),
+            )
+            for index, business_id in enumerate(business_ids)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_active_offers_come_from_the_partial_index(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("offer-list"))
+
+        self.assertEqual(plan_problems(queries.captured_queries, allow_sort=False), {})
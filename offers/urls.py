@@ -1,8 +1,11 @@
 from rest_framework.routers import DefaultRouter
 
-from .views import OffersViewSet
+from hartazone.asyncviews import use_async_reads
+from .views import OffersViewSet, read_offers
 
 router = DefaultRouter()
 router.register(r"offers", OffersViewSet, basename="offer")
 
 urlpatterns = router.urls
+
+use_async_reads(urlpatterns, {"offer-list": read_offers})
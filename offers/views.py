@@ -1,41 +1,48 @@
 from __future__ import annotations
 
+from django.conf import settings
+from django.utils import timezone
 from rest_framework import permissions, viewsets
 from rest_framework.response import Response
 
-from .models import Offer, OfferCategory, OfferInterestTag
-from .serializers import OfferSerializer, OffersResponseSerializer
+from hartazone.asyncviews import json_response
+from hartazone.cache import aget_or_rebuild, get_or_rebuild
+from hartazone.compression import mark_cached
+from users.authentication import READ_AUTHENTICATION_CLASSES
+from .feed import OFFERS_CACHE_KEY, abuild_offers_feed, build_offers_feed
 
 
 class OffersViewSet(viewsets.ViewSet):
+    """
+    Offers feed.
+
+    Built from a single active-offers query and cached until the next offer
+    expires (at most `OFFERS_CACHE_TIMEOUT` seconds). Expired offers are also
+    dropped from the cached copy when it is served, so a stale copy never
+    shows them. Offer, interest tag and restaurant edits clear the cache.
+    """
+
+    authentication_classes = READ_AUTHENTICATION_CLASSES
     permission_classes = [permissions.AllowAny]
 
     def list(self, request):
-        offers = (
-            Offer.objects.filter(is_active=True)
-            .select_related("business")
-            .order_by("position", "id")
+        feed = get_or_rebuild(
+            OFFERS_CACHE_KEY,
+            lambda: build_offers_feed(timezone.now()),
+            timeout=lambda feed: feed.fresh_for(timezone.now(), settings.OFFERS_CACHE_TIMEOUT),
+            stale_timeout=settings.OFFERS_CACHE_TIMEOUT,
         )
-
-        interest_tags = list(
-            OfferInterestTag.objects.order_by("position", "name").values_list("name", flat=True)
-        )
-
-        hero_offers = OfferSerializer(
-            offers.filter(category=OfferCategory.HERO), many=True
-        ).data
-        flash_deals = OfferSerializer(
-            offers.filter(category=OfferCategory.FLASH), many=True
-        ).data
-        curated_collections = OfferSerializer(
-            offers.filter(category=OfferCategory.CURATED), many=True
-        ).data
-
-        payload = {
-            "heroOffers": hero_offers,
-            "flashDeals": flash_deals,
-            "curatedCollections": curated_collections,
-            "interestTags": interest_tags,
-        }
-
-        return Response(payload)
+        return mark_cached(Response(feed.payload(timezone.now())))
+
+
+async def read_offers(request):
+    """`OffersViewSet.list` for async views (see `hartazone.asyncviews`)."""
+    if request.GET:
+        return None
+    feed = await aget_or_rebuild(
+        OFFERS_CACHE_KEY,
+        lambda: abuild_offers_feed(timezone.now()),
+        timeout=lambda feed: feed.fresh_for(timezone.now(), settings.OFFERS_CACHE_TIMEOUT),
+        stale_timeout=settings.OFFERS_CACHE_TIMEOUT,
+    )
+    return mark_cached(json_response(feed.payload(timezone.now())))
@@ -1,3 +1,21 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Order, OrderItem
+
+
+class OrderItemInline(admin.TabularInline):
+    model = OrderItem
+    extra = 0
+    fields = ("name", "variant_name", "quantity", "unit_price", "line_total", "notes")
+    readonly_fields = fields
+
+
+@admin.register(Order)
+class OrderAdmin(admin.ModelAdmin):
+    list_display = ("id", "business", "user", "status", "total", "created_at")
+    list_filter = ("status",)
+    search_fields = ("business__name", "user__email")
+    autocomplete_fields = ("business", "user")
+    readonly_fields = ("currency", "total", "idempotency_key", "request_hash", "created_at", "updated_at")
+    inlines = [OrderItemInline]
+
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import random
+import statistics
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from rest_framework.test import APIClient
+
+from businesses.models import Business
+from menu.models import ExtraItem, FoodItem, FoodItemExtraGroup
+from menu.synthetic import create_synthetic_catalogue
+from orders.models import Order
+
+
+class Command(BaseCommand):
+    help = (
+        "Places orders from concurrent threads against synthetic restaurants, retrying some with the "
+        "same Idempotency-Key. Writes to the configured database and deletes its data afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--orders", type=int, default=50, help="Orders per thread.")
+        parser.add_argument("--businesses", type=int, default=20)
+        parser.add_argument("--retry-rate", type=float, default=0.3)
+
+    def handle(self, *args, **options):
+        # Threads use their own connections, so the data has to be committed.
+        run = uuid.uuid4().hex[:8]
+        business_ids = create_synthetic_catalogue(businesses=options["businesses"], items_per_business=40)
+        users = [
+            get_user_model().objects.create_user(email=f"benchmark-{run}-{index}@example.com", password=None)
+            for index in range(options["threads"])
+        ]
+        try:
+            menus = self._menus(business_ids)
+            latencies: list[float] = []
+            outcomes: Counter[str] = Counter()
+            lock = threading.Lock()
+
+            def worker(index: int) -> None:
+                client = APIClient(SERVER_NAME="127.0.0.1")
+                client.force_authenticate(user=users[index])
+                rng = random.Random(index)
+                try:
+                    for number in range(options["orders"]):
+                        business_id = rng.choice(business_ids)
+                        payload = {"restaurantId": business_id, "items": self._lines(rng, menus[business_id])}
+                        headers = {"Idempotency-Key": f"{run}-{index}-{number}"}
+                        attempts = 2 if rng.random() < options["retry_rate"] else 1
+                        for _ in range(attempts):
+                            started = time.perf_counter()
+                            try:
+                                status_code = client.post(
+                                    "/api/orders/", payload, format="json", headers=headers
+                                ).status_code
+                                outcome = str(status_code)
+                            except Exception as error:  # noqa: BLE001 - reported, not raised
+                                outcome = type(error).__name__
+                            with lock:
+                                latencies.append(time.perf_counter() - started)
+                                outcomes[outcome] += 1
+                finally:
+                    connection.close()
+
+            threads = [threading.Thread(target=worker, args=(index,)) for index in range(options["threads"])]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+
+            placed = Order.objects.filter(user__in=users)
+            duplicates = placed.count() - placed.values("user", "idempotency_key").distinct().count()
+            latencies.sort()
+            self.stdout.write(
+                f"{len(latencies)} requests from {options['threads']} threads in {elapsed:.2f} s "
+                f"({len(latencies) / elapsed:.0f} req/s, {connection.vendor})"
+            )
+            self.stdout.write(
+                f"latency p50 {statistics.median(latencies) * 1000:.1f} ms   "
+                f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:.1f} ms   "
+                f"max {latencies[-1] * 1000:.1f} ms"
+            )
+            self.stdout.write(f"outcomes {dict(outcomes)}   orders {placed.count()}   duplicates {duplicates}")
+        finally:
+            Order.objects.filter(user__in=users).delete()
+            get_user_model().objects.filter(pk__in=[user.pk for user in users]).delete()
+            Business.objects.filter(pk__in=business_ids).delete()
+
+    @staticmethod
+    def _menus(business_ids: list[int]) -> dict[int, list[tuple[int, list[list[int]]]]]:
+        """Per business, its available items with the available extras of each linked group."""
+        extras: dict[int, list[int]] = defaultdict(list)
+        for pk, group_id in ExtraItem.objects.filter(
+            group__business_id__in=business_ids, is_available=True
+        ).values_list("pk", "group_id"):
+            extras[group_id].append(pk)
+        groups: dict[int, list[list[int]]] = defaultdict(list)
+        for item_id, group_id in FoodItemExtraGroup.objects.filter(
+            food_item__business_id__in=business_ids
+        ).values_list("food_item_id", "group_id"):
+            groups[item_id].append(extras[group_id])
+        menus: dict[int, list[tuple[int, list[list[int]]]]] = defaultdict(list)
+        for pk, business_id in FoodItem.objects.filter(
+            business_id__in=business_ids, is_available=True
+        ).values_list("pk", "business_id"):
+            menus[business_id].append((pk, groups[pk]))
+        return menus
+
+    @staticmethod
+    def _lines(rng: random.Random, menu: list[tuple[int, list[list[int]]]]) -> list[dict]:
+        lines = []
+        for item_id, groups in rng.sample(menu, rng.randint(1, 4)):
+            chosen = [extra for options in groups for extra in rng.sample(options, min(len(options), 1))]
+            lines.append({"productId": item_id, "quantity": rng.randint(1, 3), "extras": chosen})
+        return lines
@@ -1,3 +1,86 @@
+from __future__ import annotations
+
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+from menu.models import CURRENCY_FALLBACK, format_price
+
+
+class OrderStatus(models.TextChoices):
+    PLACED = "placed", "Placed"
+    ACCEPTED = "accepted", "Accepted"
+    PREPARING = "preparing", "Preparing"
+    ON_THE_WAY = "on_the_way", "On the way"
+    DELIVERED = "delivered", "Delivered"
+    CANCELLED = "cancelled", "Cancelled"
+
+
+class Order(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="orders")
+    business = models.ForeignKey(
+        "businesses.Business", on_delete=models.PROTECT, related_name="orders"
+    )
+    status = models.CharField(max_length=20, choices=OrderStatus.choices, default=OrderStatus.PLACED)
+    notes = models.TextField(blank=True)
+    currency = models.CharField(max_length=3, default=CURRENCY_FALLBACK)
+    total = models.DecimalField(max_digits=12, decimal_places=2)
+    # Client-chosen `Idempotency-Key`, with a hash of the request it came
+    # with so a reused key with a different body can be refused.
+    idempotency_key = models.CharField(max_length=64, null=True, blank=True)
+    request_hash = models.CharField(max_length=64, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "orders"
+        ordering = ("-created_at", "-id")
+        constraints = [
+            models.UniqueConstraint(fields=["user", "idempotency_key"], name="orders_idempotency_key_unique")
+        ]
+
+    def __str__(self) -> str:
+        return f"Order {self.pk} ({self.get_status_display()})"
+
+    def total_with_currency(self) -> str:
+        return format_price(self.total, self.currency)
+
+
+class OrderItem(models.Model):
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="items")
+    # Names and prices are copied at placement so later menu edits do not
+    # rewrite past orders.
+    food_item = models.ForeignKey(
+        "menu.FoodItem", on_delete=models.SET_NULL, null=True, blank=True, related_name="order_items"
+    )
+    variant = models.ForeignKey(
+        "menu.FoodVariant", on_delete=models.SET_NULL, null=True, blank=True, related_name="order_items"
+    )
+    name = models.CharField(max_length=150)
+    variant_name = models.CharField(max_length=100, blank=True)
+    quantity = models.PositiveSmallIntegerField()
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2)
+    line_total = models.DecimalField(max_digits=12, decimal_places=2)
+    notes = models.CharField(max_length=300, blank=True)
+
+    class Meta:
+        db_table = "order_items"
+        ordering = ("order_id", "id")
+
+    def __str__(self) -> str:
+        return f"{self.quantity} x {self.name}"
+
+
+class OrderItemExtra(models.Model):
+    order_item = models.ForeignKey(OrderItem, on_delete=models.CASCADE, related_name="extras")
+    extra_item = models.ForeignKey(
+        "menu.ExtraItem", on_delete=models.SET_NULL, null=True, blank=True, related_name="order_extras"
+    )
+    name = models.CharField(max_length=100)
+    price_delta = models.DecimalField(max_digits=7, decimal_places=2)
+
+    class Meta:
+        db_table = "order_item_extras"
+        ordering = ("order_item_id", "id")
+
+    def __str__(self) -> str:
+        return f"{self.name} (+{self.price_delta})"
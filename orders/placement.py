@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any
+
+from django.db import IntegrityError, transaction
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from businesses.cache import get_menu_version
+from .models import Order, OrderItem, OrderItemExtra
+from .pricing import compile_price_table, quote_cart
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "This Idempotency-Key was already used for a different order."
+    default_code = "idempotency_key_reused"
+
+
+@dataclass
+class PricedLine:
+    item: OrderItem
+    extras: list[OrderItemExtra] = field(default_factory=list)
+
+
+def request_hash(data: dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def price_lines(business_id: int, lines: list[dict[str, Any]]) -> tuple[list[PricedLine], str]:
+    """
+    Validate the requested lines against the menu and price them.
+
+    Compiles a fresh price table (see `orders.pricing`) rather than using a
+    cached one, so orders are always priced from committed rows; that costs
+    one query however many lines there are. Raises `ValidationError` with
+    one error dict per line (empty for valid lines) when anything is wrong.
+    Returns the unsaved lines and the order currency.
+    """
+    quote = quote_cart(compile_price_table(business_id, get_menu_version(business_id)), lines)
+    if quote.errors:
+        raise ValidationError({"items": quote.errors})
+    priced = [
+        PricedLine(
+            item=OrderItem(
+                food_item_id=line.item_id,
+                variant_id=line.variant_id,
+                name=line.name,
+                variant_name=line.variant_name,
+                quantity=line.quantity,
+                unit_price=_amount(line.unit_cents),
+                line_total=_amount(line.total_cents),
+                notes=line.notes,
+            ),
+            extras=[
+                OrderItemExtra(extra_item_id=extra_id, name=name, price_delta=_amount(delta))
+                for extra_id, name, delta in line.extras
+            ],
+        )
+        for line in quote.lines
+    ]
+    return priced, quote.currency
+
+
+def _amount(cents: int) -> Decimal:
+    return Decimal(cents) / 100
+
+
+def _replay(user, idempotency_key: str, fingerprint: str) -> Order | None:
+    order = Order.objects.filter(user=user, idempotency_key=idempotency_key).first()
+    if order is not None and order.request_hash != fingerprint:
+        raise IdempotencyKeyReused()
+    return order
+
+
+def place_order(
+    user, data: dict[str, Any], idempotency_key: str | None = None
+) -> tuple[Order, list[PricedLine] | None]:
+    """
+    Place an order from validated `OrderCreateSerializer` data.
+
+    The order, its items and their extras are written in one transaction
+    with one INSERT per table. With an `idempotency_key`, a retry of a
+    request that already produced an order returns that order, including
+    when both attempts race, and reusing the key for a different request
+    raises `IdempotencyKeyReused`. Returns the order and its lines, or
+    `None` for the lines when the order was replayed.
+    """
+    fingerprint = request_hash(data) if idempotency_key else ""
+    if idempotency_key and (existing := _replay(user, idempotency_key, fingerprint)) is not None:
+        return existing, None
+
+    try:
+        with transaction.atomic():
+            # Priced inside the transaction that writes the order.
+            lines, currency = price_lines(data["restaurantId"], data["items"])
+            order = Order.objects.create(
+                user=user,
+                business_id=data["restaurantId"],
+                notes=data["notes"],
+                currency=currency,
+                total=sum((line.item.line_total for line in lines), Decimal("0.00")),
+                idempotency_key=idempotency_key,
+                request_hash=fingerprint,
+            )
+            for line in lines:
+                line.item.order = order
+            OrderItem.objects.bulk_create([line.item for line in lines])
+            for line in lines:
+                for extra in line.extras:
+                    extra.order_item = line.item
+            OrderItemExtra.objects.bulk_create([extra for line in lines for extra in line.extras])
+    except IntegrityError:
+        if not idempotency_key or (existing := _replay(user, idempotency_key, fingerprint)) is None:
+            raise
+        return existing, None
+    return order, lines
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import BigIntegerField, Case, CharField, DecimalField, F, Value, When
+from django.db.models.functions import Cast
+
+from businesses.cache import get_menu_version
+from menu.models import CURRENCY_FALLBACK, ExtraItem, FoodItem, FoodItemExtraGroup, FoodVariant
+
+PRICE_TABLE_KEY = "price-table:{business_id}:{version}"
+_ITEM, _VARIANT, _RULE, _EXTRA = range(4)
+_COLUMNS = (
+    "row_kind", "row_id", "row_owner", "row_name", "row_code", "row_amount", "row_original", "row_low", "row_high"
+)
+LOCAL_TABLES = 256
+
+
+def cents(amount: Decimal | None) -> int:
+    return int((amount or Decimal("0")) * 100)
+
+
+@dataclass(frozen=True)
+class PriceTable:
+    """
+    Everything needed to validate and price a cart for one business, in integer cents.
+
+    Only available items, variants and extras are present.
+    """
+
+    business_id: int
+    version: int
+    # item id -> (name, currency, price, original price or 0 when not discounted)
+    items: dict[int, tuple[str, str, int, int]] = field(default_factory=dict)
+    # variant id -> (item id, name, price)
+    variants: dict[int, tuple[int, str, int]] = field(default_factory=dict)
+    # item id -> {group id: (group name, minimum choices, maximum choices)}
+    rules: dict[int, dict[int, tuple[str, int, int]]] = field(default_factory=dict)
+    # extra id -> (group id, name, price delta)
+    extras: dict[int, tuple[int, str, int]] = field(default_factory=dict)
+
+
+# Tables already unpickled by this worker, so repeated quotes for the same
+# menu version skip the shared cache as well as the database.
+_local_tables: dict[tuple[int, int], PriceTable] = {}
+
+
+def _rows(queryset, **columns):
+    typed_nulls = {
+        "row_owner": Cast(Value(None), BigIntegerField()),
+        "row_code": Cast(Value(None), CharField()),
+        "row_amount": Cast(Value(None), DecimalField(max_digits=10, decimal_places=2)),
+        "row_original": Cast(Value(None), DecimalField(max_digits=10, decimal_places=2)),
+        "row_low": Cast(Value(None), BigIntegerField()),
+        "row_high": Cast(Value(None), BigIntegerField()),
+    }
+    return queryset.annotate(**{**typed_nulls, **columns}).values_list(*_COLUMNS).order_by()
+
+
+def compile_price_table(business_id: int, version: int) -> PriceTable:
+    """Load a business's prices and modifier rules in one query (a UNION of the four tables)."""
+    money = DecimalField(max_digits=10, decimal_places=2)
+    queries = [
+        _rows(
+            FoodItem.objects.filter(business_id=business_id, is_available=True),
+            row_kind=Value(_ITEM),
+            row_id=F("id"),
+            row_name=F("name"),
+            row_code=F("currency"),
+            row_amount=F("price"),
+            row_original=Case(When(is_discounted=True, then=F("original_price")), output_field=money),
+        ),
+        _rows(
+            FoodVariant.objects.filter(
+                food_item__business_id=business_id, food_item__is_available=True, is_available=True
+            ),
+            row_kind=Value(_VARIANT),
+            row_id=F("id"),
+            row_owner=F("food_item_id"),
+            row_name=F("name"),
+            row_amount=F("price"),
+        ),
+        _rows(
+            FoodItemExtraGroup.objects.filter(food_item__business_id=business_id, food_item__is_available=True),
+            row_kind=Value(_RULE),
+            row_id=F("group_id"),
+            row_owner=F("food_item_id"),
+            row_name=F("group__name"),
+            row_low=Case(
+                When(required=True, min_choices=0, then=Value(1)),
+                default=F("min_choices"),
+                output_field=BigIntegerField(),
+            ),
+            row_high=F("max_choices"),
+        ),
+        _rows(
+            ExtraItem.objects.filter(group__business_id=business_id, is_available=True),
+            row_kind=Value(_EXTRA),
+            row_id=F("id"),
+            row_owner=F("group_id"),
+            row_name=F("name"),
+            row_amount=F("price_delta"),
+        ),
+    ]
+
+    table = PriceTable(business_id=business_id, version=version)
+    for kind, pk, owner, name, code, amount, original, low, high in queries[0].union(*queries[1:], all=True):
+        if kind == _ITEM:
+            original_cents = cents(original) if original is not None and original > amount else 0
+            table.items[pk] = (name, code, cents(amount), original_cents)
+        elif kind == _VARIANT:
+            table.variants[pk] = (owner, name, cents(amount))
+        elif kind == _RULE:
+            table.rules.setdefault(owner, {})[pk] = (name, low, high)
+        else:
+            table.extras[pk] = (owner, name, cents(amount))
+    return table
+
+
+def get_price_table(business_id: int) -> PriceTable:
+    """
+    The price table for a business's current menu version.
+
+    Costs one cache read when this worker already holds the table, one
+    more for a table another worker compiled, and one query to compile it.
+    Tables are keyed by menu version, so menu edits retire them. Used for
+    quotes; order placement compiles a fresh table inside its transaction.
+    """
+    version = get_menu_version(business_id)
+    table = _local_tables.get((business_id, version))
+    if table is not None:
+        return table
+
+    key = PRICE_TABLE_KEY.format(business_id=business_id, version=version)
+    table = cache.get(key)
+    if table is None:
+        table = compile_price_table(business_id, version)
+        cache.set(key, table, timeout=settings.PRICE_TABLE_CACHE_TIMEOUT)
+    if len(_local_tables) >= LOCAL_TABLES:
+        _local_tables.pop(next(iter(_local_tables)), None)
+    _local_tables[(business_id, version)] = table
+    return table
+
+
+@dataclass
+class QuotedLine:
+    item_id: int
+    name: str
+    quantity: int
+    unit_cents: int
+    savings_cents: int
+    variant_id: int | None = None
+    variant_name: str = ""
+    # (extra id, name, price delta)
+    extras: list[tuple[int, str, int]] = field(default_factory=list)
+    notes: str = ""
+
+    @property
+    def total_cents(self) -> int:
+        return self.unit_cents * self.quantity
+
+
+@dataclass
+class Quote:
+    lines: list[QuotedLine]
+    currency: str
+    # One error dict per requested line, empty for valid lines.
+    errors: list[dict[str, list[str]]]
+
+    @property
+    def total_cents(self) -> int:
+        return sum(line.total_cents for line in self.lines)
+
+    @property
+    def savings_cents(self) -> int:
+        return sum(line.savings_cents * line.quantity for line in self.lines)
+
+
+def quote_cart(table: PriceTable, lines: list[dict[str, Any]]) -> Quote:
+    """
+    Validate and price `OrderLineSerializer` lines against a price table.
+
+    Items must be available and sold by the business, variants must be
+    available variants of their item, and extras must be available options
+    of a group linked to the item, chosen within that link's `required`,
+    `min_choices` and `max_choices`. All items must share one currency,
+    that of the first item.
+    """
+    quoted: list[QuotedLine] = []
+    errors: list[dict[str, list[str]]] = []
+    cart_currency: str | None = None
+    for line in lines:
+        line_errors: dict[str, list[str]] = defaultdict(list)
+        item = table.items.get(line["productId"])
+        if item is None:
+            errors.append({"productId": ["This product is not available from this restaurant."]})
+            continue
+        name, currency, unit_cents, original_cents = item
+        cart_currency = cart_currency or currency
+        if currency != cart_currency:
+            line_errors["productId"].append(
+                f"This product is priced in {currency}; the rest of the order is in {cart_currency}."
+            )
+        savings_cents = max(0, original_cents - unit_cents) if original_cents else 0
+
+        result = QuotedLine(
+            item_id=line["productId"],
+            name=name,
+            quantity=line["quantity"],
+            unit_cents=unit_cents,
+            savings_cents=savings_cents,
+            notes=line.get("notes", ""),
+        )
+        variant_id = line.get("variantId")
+        if variant_id:
+            variant = table.variants.get(variant_id)
+            if variant is None or variant[0] != result.item_id:
+                line_errors["variantId"].append("This variant is not available for this product.")
+            else:
+                result.variant_id, result.variant_name, result.unit_cents = variant_id, variant[1], variant[2]
+                result.savings_cents = 0
+
+        rules = table.rules.get(result.item_id, {})
+        chosen: dict[int, int] = defaultdict(int)
+        for extra_id in line["extras"]:
+            extra = table.extras.get(extra_id)
+            if extra is None or extra[0] not in rules:
+                line_errors["extras"].append(f"Extra {extra_id} is not available for this product.")
+                continue
+            chosen[extra[0]] += 1
+            result.extras.append((extra_id, extra[1], extra[2]))
+            result.unit_cents += extra[2]
+        for group_id, (group_name, minimum, maximum) in rules.items():
+            if not minimum <= chosen[group_id] <= maximum:
+                line_errors["extras"].append(f"Choose between {minimum} and {maximum} options for {group_name}.")
+
+        errors.append(dict(line_errors))
+        if not line_errors:
+            quoted.append(result)
+
+    return Quote(lines=quoted, currency=cart_currency or CURRENCY_FALLBACK, errors=errors if any(errors) else [])
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+from rest_framework import serializers
+
+from menu.models import format_price
+from .models import Order
+from .placement import PricedLine
+from .pricing import Quote
+
+MAX_LINES = 50
+MAX_QUANTITY = 99
+MAX_EXTRAS_PER_LINE = 20
+
+
+class OrderLineSerializer(serializers.Serializer):
+    productId = serializers.IntegerField(min_value=1)
+    variantId = serializers.IntegerField(min_value=1, required=False, allow_null=True)
+    quantity = serializers.IntegerField(min_value=1, max_value=MAX_QUANTITY, default=1)
+    extras = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), max_length=MAX_EXTRAS_PER_LINE, default=list
+    )
+    notes = serializers.CharField(max_length=300, allow_blank=True, default="")
+
+    def validate_extras(self, value: list[int]) -> list[int]:
+        if len(set(value)) != len(value):
+            raise serializers.ValidationError("Each extra can only be chosen once.")
+        return value
+
+
+class CartQuoteSerializer(serializers.Serializer):
+    restaurantId = serializers.IntegerField(min_value=1)
+    items = OrderLineSerializer(many=True, allow_empty=False, max_length=MAX_LINES)
+
+
+class OrderCreateSerializer(CartQuoteSerializer):
+    notes = serializers.CharField(allow_blank=True, default="")
+
+
+def order_lines(order: Order) -> list[PricedLine]:
+    """The saved lines of an order, in two queries."""
+    return [
+        PricedLine(item=item, extras=list(item.extras.all()))
+        for item in order.items.prefetch_related("extras")
+    ]
+
+
+def order_payload(order: Order, lines: Iterable[PricedLine]) -> dict[str, Any]:
+    return {
+        "id": str(order.pk),
+        "restaurantId": str(order.business_id),
+        "status": order.status,
+        "total": order.total_with_currency(),
+        "notes": order.notes,
+        "createdAt": serializers.DateTimeField().to_representation(order.created_at),
+        "items": [
+            {
+                "id": str(line.item.pk),
+                "productId": str(line.item.food_item_id) if line.item.food_item_id else None,
+                "variantId": str(line.item.variant_id) if line.item.variant_id else None,
+                "name": line.item.name,
+                "variant": line.item.variant_name or None,
+                "quantity": line.item.quantity,
+                "unitPrice": format_price(line.item.unit_price, order.currency),
+                "lineTotal": format_price(line.item.line_total, order.currency),
+                "notes": line.item.notes,
+                "extras": [
+                    {"id": str(extra.extra_item_id), "label": extra.name, "priceDelta": float(extra.price_delta)}
+                    for extra in line.extras
+                ],
+            }
+            for line in lines
+        ],
+    }
+
+
+def quote_payload(business_id: int, quote: Quote) -> dict[str, Any]:
+    """A priced cart with every amount in integer cents."""
+    return {
+        "restaurantId": str(business_id),
+        "currency": quote.currency,
+        "lines": [
+            {
+                "productId": str(line.item_id),
+                "variantId": str(line.variant_id) if line.variant_id else None,
+                "name": line.name,
+                "variant": line.variant_name or None,
+                "quantity": line.quantity,
+                "modifiers": [
+                    {"id": str(extra_id), "label": label, "priceDeltaCents": delta}
+                    for extra_id, label, delta in line.extras
+                ],
+                "unitPriceCents": line.unit_cents,
+                "savingsCents": line.savings_cents * line.quantity,
+                "lineTotalCents": line.total_cents,
+            }
+            for line in quote.lines
+        ],
+        "savingsCents": quote.savings_cents,
+        "totalCents": quote.total_cents,
+    }
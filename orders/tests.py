@@ -1,3 +1,232 @@
-from django.test import TestCase
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from businesses.models import Business
+from menu.models import ExtraGroup, ExtraItem, FoodItem, FoodItemExtraGroup, FoodVariant
+from . import placement
+from .models import Order, OrderItem, OrderItemExtra
+
+
+class OrderTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("order-list")
+        self.user = get_user_model().objects.create_user(email="cliente@example.com", password="pass1234")
+        self.client.force_authenticate(user=self.user)
+
+        self.business = Business.objects.create(name="Fritanga")
+        self.other = Business.objects.create(name="Otra")
+        self.gallo = FoodItem.objects.create(business=self.business, name="Gallo pinto", price=Decimal("80"))
+        self.quesillo = FoodItem.objects.create(business=self.business, name="Quesillo", price=Decimal("60"))
+        self.grande = FoodVariant.objects.create(food_item=self.gallo, name="Grande", price=Decimal("110"))
+        salsas = ExtraGroup.objects.create(business=self.business, name="Salsas")
+        self.chile = ExtraItem.objects.create(group=salsas, name="Chile", price_delta=Decimal("5"))
+        self.curtido = ExtraItem.objects.create(group=salsas, name="Curtido", price_delta=Decimal("10"))
+        FoodItemExtraGroup.objects.create(
+            food_item=self.gallo, group=salsas, required=True, min_choices=1, max_choices=2
+        )
+        self.foreign = FoodItem.objects.create(business=self.other, name="Pizza", price=Decimal("200"))
+
+    def payload(self, *lines, **overrides):
+        return {"restaurantId": str(self.business.pk), "items": list(lines), **overrides}
+
+    def gallo_line(self, **overrides):
+        return {
+            "productId": str(self.gallo.pk),
+            "variantId": str(self.grande.pk),
+            "quantity": 2,
+            "extras": [str(self.chile.pk), str(self.curtido.pk)],
+            **overrides,
+        }
+
+
+class OrderPlacementTests(OrderTestCase):
+    def test_places_order_in_a_fixed_number_of_queries(self):
+        lines = [self.gallo_line(), {"productId": str(self.quesillo.pk)}]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, self.payload(*lines, notes="Sin cebolla"), format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        body = response.json()
+        self.assertEqual(body["total"], "C$310.00")
+        self.assertEqual(
+            [(item["name"], item["variant"], item["quantity"], item["unitPrice"]) for item in body["items"]],
+            [("Gallo pinto", "Grande", 2, "C$125.00"), ("Quesillo", None, 1, "C$60.00")],
+        )
+        self.assertEqual([extra["label"] for extra in body["items"][0]["extras"]], ["Chile", "Curtido"])
+
+        # One price-table query, then one INSERT per table inside a savepoint.
+        writes = [query["sql"] for query in queries.captured_queries if query["sql"].startswith("INSERT")]
+        self.assertEqual(len(writes), 3)
+        self.assertLessEqual(len(queries), 1 + 3 + 2)
+        order = Order.objects.get()
+        self.assertEqual((order.user, order.notes, order.total), (self.user, "Sin cebolla", Decimal("310.00")))
+        self.assertEqual(OrderItem.objects.count(), 2)
+        self.assertEqual(OrderItemExtra.objects.filter(order_item__order=order).count(), 2)
+
+    def test_rejects_invalid_lines(self):
+        self.grande.is_available = False
+        self.grande.save()
+        response = self.client.post(
+            self.url,
+            self.payload(
+                self.gallo_line(extras=[]),
+                {"productId": str(self.foreign.pk)},
+                {"productId": str(self.quesillo.pk), "extras": [str(self.chile.pk)]},
+                {"productId": str(self.quesillo.pk)},
+            ),
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.json()["items"]
+        self.assertEqual(set(errors[0]), {"variantId", "extras"})
+        self.assertIn("Salsas", errors[0]["extras"][0])
+        self.assertIn("productId", errors[1])
+        self.assertIn("extras", errors[2])
+        self.assertEqual(errors[3], {})
+        self.assertFalse(Order.objects.exists())
+
+    def test_enforces_max_choices_and_quantity(self):
+        third = ExtraItem.objects.create(group=self.chile.group, name="Limón", price_delta=Decimal("0"))
+        too_many = self.gallo_line(extras=[str(self.chile.pk), str(self.curtido.pk), str(third.pk)])
+        response = self.client.post(self.url, self.payload(too_many), format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        for line in (self.gallo_line(quantity=0), self.gallo_line(extras=[str(self.chile.pk)] * 2)):
+            with self.subTest(line=line):
+                response = self.client.post(self.url, self.payload(line), format="json")
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Order.objects.exists())
+
+    def test_rejects_mixed_currencies(self):
+        dollars = FoodItem.objects.create(
+            business=self.business, name="Cerveza importada", price=Decimal("3"), currency="USD"
+        )
+
+        response = self.client.post(
+            self.url,
+            self.payload({"productId": str(self.quesillo.pk)}, {"productId": str(dollars.pk)}),
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.json()["items"]
+        self.assertEqual(errors[0], {})
+        self.assertIn("USD", errors[1]["productId"][0])
+        self.assertFalse(Order.objects.exists())
+
+    def test_prices_from_the_database_not_the_cached_table(self):
+        self.client.post(reverse("cart-quote"), self.payload({"productId": str(self.quesillo.pk)}), format="json")
+        # Bypasses the signals, so the cached price table is now stale.
+        FoodItem.objects.filter(pk=self.quesillo.pk).update(price=Decimal("70"))
+        FoodItem.objects.filter(pk=self.gallo.pk).update(is_available=False)
+
+        response = self.client.post(self.url, self.payload({"productId": str(self.gallo.pk)}), format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(self.url, self.payload({"productId": str(self.quesillo.pk)}), format="json")
+        self.assertEqual(response.json()["total"], "C$70.00")
+
+    def test_idempotency_key_replays_the_original_order(self):
+        headers = {"Idempotency-Key": "a1b2c3"}
+        first = self.client.post(self.url, self.payload(self.gallo_line()), format="json", headers=headers)
+        retry = self.client.post(self.url, self.payload(self.gallo_line()), format="json", headers=headers)
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_200_OK)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(Order.objects.count(), 1)
+
+        changed = self.client.post(
+            self.url, self.payload(self.gallo_line(quantity=3)), format="json", headers=headers
+        )
+        self.assertEqual(changed.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_racing_retries_return_the_winner(self):
+        headers = {"Idempotency-Key": "carrera"}
+        first = self.client.post(self.url, self.payload(self.gallo_line()), format="json", headers=headers)
+
+        # The second attempt misses the order on its first look, as if both
+        # requests checked before either committed, and hits the constraint.
+        with mock.patch.object(placement, "_replay", side_effect=[None, Order.objects.get()]):
+            retry = self.client.post(self.url, self.payload(self.gallo_line()), format="json", headers=headers)
+
+        self.assertEqual(retry.status_code, status.HTTP_200_OK)
+        self.assertEqual(retry.json()["id"], first.json()["id"])
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_orders_are_private(self):
+        order_id = self.client.post(self.url, self.payload(self.gallo_line()), format="json").json()["id"]
+        self.assertEqual(self.client.get(reverse("order-detail", args=[order_id])).status_code, status.HTTP_200_OK)
+
+        stranger = get_user_model().objects.create_user(email="otro@example.com", password="pass1234")
+        self.client.force_authenticate(user=stranger)
+        self.assertEqual(
+            self.client.get(reverse("order-detail", args=[order_id])).status_code, status.HTTP_404_NOT_FOUND
+        )
+        self.client.force_authenticate(user=None)
+        self.assertEqual(
+            self.client.post(self.url, self.payload(self.gallo_line()), format="json").status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+
+class CartQuoteTests(OrderTestCase):
+    def quote(self, *lines):
+        return self.client.post(reverse("cart-quote"), self.payload(*lines), format="json")
+
+    def test_quotes_in_cents_from_the_cached_price_table(self):
+        self.quesillo.is_discounted = True
+        self.quesillo.original_price = Decimal("75.50")
+        self.quesillo.save()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.quote(self.gallo_line(), {"productId": str(self.quesillo.pk), "quantity": 3})
+        self.assertEqual(len(queries), 1)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.json()
+        self.assertEqual(
+            [(line["unitPriceCents"], line["savingsCents"], line["lineTotalCents"]) for line in body["lines"]],
+            [(12500, 0, 25000), (6000, 4650, 18000)],
+        )
+        self.assertEqual(
+            body["lines"][0]["modifiers"],
+            [
+                {"id": str(self.chile.pk), "label": "Chile", "priceDeltaCents": 500},
+                {"id": str(self.curtido.pk), "label": "Curtido", "priceDeltaCents": 1000},
+            ],
+        )
+        self.assertEqual((body["totalCents"], body["savingsCents"]), (43000, 4650))
+
+        with CaptureQueriesContext(connection) as queries:
+            again = self.quote(*[{"productId": str(self.quesillo.pk)}] * 40)
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(again.json()["totalCents"], 40 * 6000)
+
+    def test_menu_edits_reprice_the_cart(self):
+        self.quote({"productId": str(self.quesillo.pk)})
+        self.quesillo.price = Decimal("65.25")
+        self.quesillo.save()
+
+        self.assertEqual(self.quote({"productId": str(self.quesillo.pk)}).json()["totalCents"], 6525)
+        self.quesillo.is_available = False
+        self.quesillo.save()
+        self.assertEqual(self.quote({"productId": str(self.quesillo.pk)}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rejects_invalid_lines_like_placement(self):
+        response = self.quote(self.gallo_line(extras=[]), {"productId": str(self.foreign.pk)})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([set(errors) for errors in response.json()["items"]], [{"extras"}, {"productId"}])
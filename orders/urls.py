@@ -0,0 +1,13 @@
+from django.urls import path
+from rest_framework.routers import DefaultRouter
+
+from .views import CartQuoteView, OrderViewSet
+
+router = DefaultRouter()
+router.register(r"orders", OrderViewSet, basename="order")
+
+urlpatterns = [
+    path("cart/quote/", CartQuoteView.as_view(), name="cart-quote"),
+]
+
+urlpatterns += router.urls
@@ -1,3 +1,74 @@
-from django.shortcuts import render
+from __future__ import annotations
 
-# Create your views here.
+from rest_framework import permissions, status, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from users.authentication import READ_AUTHENTICATION_CLASSES
+from .models import Order
+from .placement import place_order
+from .pricing import get_price_table, quote_cart
+from .serializers import CartQuoteSerializer, OrderCreateSerializer, order_lines, order_payload, quote_payload
+
+
+class OrderViewSet(viewsets.GenericViewSet):
+    """
+    Order placement for the signed-in user.
+
+    - POST validates every line against the live menu and places the order
+      in one transaction. Send an `Idempotency-Key` header (up to 64
+      characters) to make retries safe: repeating a request with the same
+      key returns the original order with `200` and `Idempotent-Replayed:
+      true` instead of placing another one, and reusing a key for a
+      different request is answered with `409`.
+    - GET on a single order returns one of the user's own orders.
+    """
+
+    serializer_class = OrderCreateSerializer
+
+    def get_queryset(self):
+        return Order.objects.filter(user=self.request.user)
+
+    def create(self, request, *args, **kwargs):
+        idempotency_key = request.headers.get("Idempotency-Key") or None
+        if idempotency_key is not None and len(idempotency_key) > 64:
+            raise ValidationError({"Idempotency-Key": ["Use at most 64 characters."]})
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        order, lines = place_order(request.user, serializer.validated_data, idempotency_key)
+        if lines is None:
+            response = Response(order_payload(order, order_lines(order)), status=status.HTTP_200_OK)
+            response["Idempotent-Replayed"] = "true"
+            return response
+        return Response(order_payload(order, lines), status=status.HTTP_201_CREATED)
+
+    def retrieve(self, request, *args, **kwargs):
+        order = get_object_or_404(self.get_queryset(), pk=self.kwargs["pk"])
+        return Response(order_payload(order, order_lines(order)))
+
+
+class CartQuoteView(APIView):
+    """
+    Prices a cart without placing it, with every amount in integer cents.
+
+    Takes the same `restaurantId` and `items` as order placement and
+    validates them the same way. Prices come from the restaurant's compiled
+    price table, so a quote needs no query once the table is cached for the
+    current menu version, and one query when it is not.
+    """
+
+    authentication_classes = READ_AUTHENTICATION_CLASSES
+    permission_classes = [permissions.AllowAny]
+
+    def post(self, request, *args, **kwargs):
+        serializer = CartQuoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        business_id = serializer.validated_data["restaurantId"]
+
+        quote = quote_cart(get_price_table(business_id), serializer.validated_data["items"])
+        if quote.errors:
+            raise ValidationError({"items": quote.errors})
+        return Response(quote_payload(business_id, quote))
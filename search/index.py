@@ -0,0 +1,461 @@
+from __future__ import annotations
+
+import bisect
+import heapq
+import logging
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+
+from businesses.models import Business
+from menu.models import FoodItem, FoodItemTag, FoodTag, format_price
+
+logger = logging.getLogger(__name__)
+
+# Workers keep their own in-memory index and apply their own edits to it
+# directly. Every edit also bumps this counter in the shared cache, so a
+# worker whose index is older than the counter knows another worker changed
+# the catalogue and rebuilds.
+GENERATION_KEY = "search-generation"
+
+RESTAURANT, PRODUCT, TAG = "restaurants", "products", "tags"
+KINDS = (RESTAURANT, PRODUCT, TAG)
+
+STOPWORDS = frozenset({"a", "al", "con", "de", "del", "el", "en", "la", "las", "los", "o", "para", "y"})
+PREFIX_EXPANSIONS = 50
+TYPO_MIN_LENGTH = 4
+# Scores are integers: a field weight times how closely the term matched.
+FIELD_WEIGHTS = (3, 2, 1)
+EXACT_FACTOR, PREFIX_FACTOR, TYPO_FACTOR = 10, 8, 6
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+DocKey = tuple[str, int]
+
+
+def fold(text: str) -> str:
+    """Lowercase `text` and strip accents, so "Ñoña Café" matches "nona cafe"."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str | None) -> list[str]:
+    if not text:
+        return []
+    return [token for token in _TOKEN.findall(fold(text)) if token not in STOPWORDS]
+
+
+def _deletes(term: str) -> set[str]:
+    return {term[:index] + term[index + 1 :] for index in range(len(term))}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """Whether `a` becomes `b` with one insertion, deletion, substitution or swap."""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        diffs = [index for index, (x, y) in enumerate(zip(a, b)) if x != y]
+        if len(diffs) == 1:
+            return True
+        return (
+            len(diffs) == 2
+            and diffs[1] == diffs[0] + 1
+            and (a[diffs[0]], a[diffs[1]]) == (b[diffs[1]], b[diffs[0]])
+        )
+    shorter, longer = sorted((a, b), key=len)
+    return any(longer[:index] + longer[index + 1 :] == shorter for index in range(len(longer)))
+
+
+@dataclass
+class Document:
+    data: dict[str, Any]
+    terms: dict[str, int]
+
+
+@dataclass
+class SearchIndex:
+    """
+    In-memory inverted index over restaurants, available food items and tags.
+
+    Query tokens match index terms exactly, as a prefix (last token only, so
+    results follow the user as they type), or within one typo for tokens of
+    `TYPO_MIN_LENGTH` characters or more, with lower weights for the looser
+    matches. Every token must match for a document to be returned. Results
+    are ranked by score, then name.
+
+    Besides the plain postings, each term keeps one name-ordered list per
+    (kind, field weight). A search walks those lists from the highest
+    possible score down and stops as soon as nothing further down can reach
+    the current top results, so common words do not cost a pass over every
+    document that contains them.
+
+    Searches hold `lock`, so changes to an index that is being searched must
+    hold it too.
+    """
+
+    generation: int = 0
+    documents: dict[DocKey, Document] = field(default_factory=dict)
+    postings: dict[str, dict[DocKey, int]] = field(default_factory=dict)
+    ranked: dict[tuple[str, str, int], list[tuple[str, DocKey]]] = field(default_factory=dict)
+    vocabulary: list[str] = field(default_factory=list)
+    typo_variants: dict[str, set[str]] = field(default_factory=dict)
+    _unsorted: set[tuple[str, str, int]] = field(default_factory=set)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, key: DocKey, data: dict[str, Any], fields: Iterable[tuple[str | None, int]]) -> None:
+        self.remove(key)
+        terms: dict[str, int] = {}
+        for text, weight in fields:
+            for token in tokenize(text):
+                terms[token] = max(terms.get(token, 0), weight)
+        self.documents[key] = Document(data, terms)
+        for term, weight in terms.items():
+            if term not in self.postings:
+                self.postings[term] = {}
+                bisect.insort(self.vocabulary, term)
+                for variant in _deletes(term):
+                    self.typo_variants.setdefault(variant, set()).add(term)
+            self.postings[term][key] = weight
+            tier = (term, key[0], weight)
+            self.ranked.setdefault(tier, []).append((data["name"], key))
+            self._unsorted.add(tier)
+
+    def remove(self, key: DocKey) -> None:
+        document = self.documents.pop(key, None)
+        if document is None:
+            return
+        for term, weight in document.terms.items():
+            tier = (term, key[0], weight)
+            self.ranked[tier].remove((document.data["name"], key))
+            if not self.ranked[tier]:
+                del self.ranked[tier]
+                self._unsorted.discard(tier)
+            posting = self.postings[term]
+            del posting[key]
+            if posting:
+                continue
+            del self.postings[term]
+            del self.vocabulary[bisect.bisect_left(self.vocabulary, term)]
+            for variant in _deletes(term):
+                variants = self.typo_variants[variant]
+                variants.discard(term)
+                if not variants:
+                    del self.typo_variants[variant]
+
+    def sort_tiers(self) -> None:
+        """Restore name order in the lists touched since the last search."""
+        for tier in self._unsorted:
+            self.ranked[tier].sort()
+        self._unsorted.clear()
+
+    def _matches(self, token: str, prefix: bool) -> dict[str, int]:
+        """Index terms matching a query token, with the factor for how they match."""
+        matches: dict[str, int] = {}
+        if token in self.postings:
+            matches[token] = EXACT_FACTOR
+        if prefix:
+            start = bisect.bisect_left(self.vocabulary, token)
+            for term in self.vocabulary[start : start + PREFIX_EXPANSIONS]:
+                if not term.startswith(token):
+                    break
+                matches.setdefault(term, PREFIX_FACTOR)
+        if len(token) >= TYPO_MIN_LENGTH:
+            candidates = set(self.typo_variants.get(token, ()))
+            for variant in _deletes(token):
+                if variant in self.postings:
+                    candidates.add(variant)
+                candidates |= self.typo_variants.get(variant, set())
+            for term in candidates:
+                if term not in matches and _within_one_edit(token, term):
+                    matches[term] = TYPO_FACTOR
+        return matches
+
+    def _score(self, key: DocKey, expansions: list[dict[str, int]]) -> int:
+        """The document's score for the query, or 0 when some token does not match it."""
+        terms = self.documents[key].terms
+        total = 0
+        for matches in expansions:
+            best = max(
+                (weight * matches[term] for term, weight in terms.items() if term in matches), default=0
+            )
+            if not best:
+                return 0
+            total += best
+        return total
+
+    def _top(self, kind: str, expansions: list[dict[str, int]], limit: int) -> list[DocKey]:
+        driving, others = expansions[0], expansions[1:]
+        levels: dict[int, list[list[tuple[str, DocKey]]]] = {}
+        for term, factor in driving.items():
+            for weight in FIELD_WEIGHTS:
+                entries = self.ranked.get((term, kind, weight))
+                if entries:
+                    levels.setdefault(weight * factor, []).append(entries)
+        # The most the other tokens can add to any document of this kind.
+        headroom = sum(
+            max(
+                (
+                    weight * factor
+                    for term, factor in matches.items()
+                    for weight in FIELD_WEIGHTS
+                    if (term, kind, weight) in self.ranked
+                ),
+                default=0,
+            )
+            for matches in others
+        )
+
+        top: list[tuple[int, str, DocKey]] = []  # (-score, name, key), best first
+        seen: set[DocKey] = set()
+        for contribution in sorted(levels, reverse=True):
+            bound = contribution + headroom
+            if len(top) >= limit and top[-1][0] < -bound:
+                break
+            # Documents first reached at this level score at most `bound` and
+            # come in name order, so once the last kept result outranks
+            # `bound` at the current name, the rest of the level cannot get in.
+            for name, key in heapq.merge(*levels[contribution]):
+                if len(top) >= limit and top[-1] < (-bound, name, key):
+                    break
+                if key in seen:
+                    continue
+                seen.add(key)
+                score = self._score(key, expansions)
+                if not score:
+                    continue
+                entry = (-score, name, key)
+                if len(top) < limit or entry < top[-1]:
+                    bisect.insort(top, entry)
+                    del top[limit:]
+        return [key for _, _, key in top]
+
+    def _search(self, query: str, limit: int) -> dict[str, list[dict[str, Any]]]:
+        results: dict[str, list[dict[str, Any]]] = {kind: [] for kind in KINDS}
+        tokens = tokenize(query)
+        if not tokens:
+            return results
+        expansions = [
+            self._matches(token, prefix=position == len(tokens) - 1) for position, token in enumerate(tokens)
+        ]
+        if not all(expansions):
+            return results
+        self.sort_tiers()
+
+        # Drive the search from the token with the fewest postings.
+        expansions.sort(key=lambda matches: sum(len(self.postings[term]) for term in matches))
+        for kind in KINDS:
+            results[kind] = [self.documents[key].data for key in self._top(kind, expansions, limit)]
+        return results
+
+    def search(self, query: str, limit: int = 10) -> dict[str, list[dict[str, Any]]]:
+        with self.lock:
+            return self._search(query, limit)
+
+
+def _restaurant_data(row: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": str(row["id"]),
+        "name": row["name"],
+        "tagline": row["tagline"],
+        "image": row["hero_image_url"] or row["image_url"] or "",
+    }
+
+
+def _product_data(row: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": str(row["id"]),
+        "name": row["name"],
+        "price": format_price(row["price"], row["currency"]),
+        "image": row["image_url"] or "",
+        "restaurantId": str(row["business_id"]),
+        "restaurantName": row["business__name"],
+    }
+
+
+RESTAURANT_FIELDS = ("id", "name", "tagline", "description", "hero_image_url", "image_url")
+PRODUCT_FIELDS = (
+    "id",
+    "name",
+    "description",
+    "price",
+    "currency",
+    "image_url",
+    "business_id",
+    "business__name",
+    "is_available",
+)
+
+
+def index_restaurants(index: SearchIndex, pks: Iterable[int] | None = None) -> None:
+    """(Re)index restaurants, all of them when `pks` is None."""
+    queryset = Business.objects.all() if pks is None else Business.objects.filter(pk__in=pks)
+    seen = set()
+    for row in queryset.values(*RESTAURANT_FIELDS):
+        seen.add(row["id"])
+        index.add(
+            (RESTAURANT, row["id"]),
+            _restaurant_data(row),
+            ((row["name"], 3), (row["tagline"], 2), (row["description"], 1)),
+        )
+    for pk in set(pks or ()) - seen:
+        index.remove((RESTAURANT, pk))
+
+
+def index_products(index: SearchIndex, queryset=None) -> None:
+    """(Re)index the food items in `queryset` (all when None); unavailable ones are dropped."""
+    queryset = FoodItem.objects.all() if queryset is None else queryset
+    rows = list(queryset.values(*PRODUCT_FIELDS))
+    tags: dict[int, list[str]] = {}
+    links = FoodItemTag.objects.filter(food_item_id__in=queryset.values("id"))
+    for item_id, tag_name in links.values_list("food_item_id", "tag__name"):
+        tags.setdefault(item_id, []).append(tag_name)
+    for row in rows:
+        key = (PRODUCT, row["id"])
+        if not row["is_available"]:
+            index.remove(key)
+            continue
+        index.add(
+            key,
+            _product_data(row),
+            (
+                (row["name"], 3),
+                (" ".join(tags.get(row["id"], ())), 2),
+                (row["business__name"], 1),
+                (row["description"], 1),
+            ),
+        )
+
+
+def index_tags(index: SearchIndex, pks: Iterable[int] | None = None) -> None:
+    queryset = FoodTag.objects.all() if pks is None else FoodTag.objects.filter(pk__in=pks)
+    seen = set()
+    for pk, name in queryset.values_list("id", "name"):
+        seen.add(pk)
+        index.add((TAG, pk), {"id": str(pk), "name": name}, ((name, 3),))
+    for pk in set(pks or ()) - seen:
+        index.remove((TAG, pk))
+
+
+def build_index(generation: int = 0) -> SearchIndex:
+    index = SearchIndex(generation=generation)
+    index_restaurants(index)
+    index_products(index)
+    index_tags(index)
+    index.sort_tiers()
+    return index
+
+
+def current_generation() -> int:
+    cache.add(GENERATION_KEY, 0, timeout=None)
+    return cache.get(GENERATION_KEY, 0)
+
+
+def bump_generation() -> int:
+    try:
+        return cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 1, timeout=None)
+        return 1
+
+
+_index: SearchIndex | None = None
+# Held while this worker's index is rebuilt; edits never wait for it.
+_rebuild_lock = threading.Lock()
+
+
+def _rebuild() -> None:
+    """
+    Replace this worker's index with a fresh build; the caller holds `_rebuild_lock`.
+
+    A build that an edit overtook is discarded: the edit was applied to the
+    previous index, and the build may have read the rows before it.
+    """
+    global _index
+    generation = current_generation()
+    index = build_index(generation)
+    if _index is None or current_generation() == generation:
+        _index = index
+
+
+def _rebuild_in_background() -> None:
+    try:
+        _rebuild()
+    except DatabaseError:
+        logger.exception("Rebuilding the search index failed; serving the previous one.")
+    finally:
+        _rebuild_lock.release()
+        connections.close_all()
+
+
+def start_rebuild() -> threading.Thread | None:
+    """Rebuild this worker's index in a background thread, unless a rebuild is already running."""
+    if not _rebuild_lock.acquire(blocking=False):
+        return None
+    thread = threading.Thread(target=_rebuild_in_background, name="search-index-rebuild", daemon=True)
+    thread.start()
+    return thread
+
+
+def get_index() -> SearchIndex:
+    """
+    This worker's index, rebuilt when the shared generation has moved on.
+
+    A stale index keeps answering while one background thread rebuilds it,
+    so searches do not wait for rebuilds; only a worker's first search, with
+    nothing to answer from yet, waits for the build. With
+    `SEARCH_INDEX_BACKGROUND_REBUILD` off the request that notices rebuilds
+    inline, and other threads keep the previous index meanwhile.
+    """
+    index = _index
+    if index is None:
+        with _rebuild_lock:
+            if _index is None:
+                _rebuild()
+        return _index
+    if index.generation == current_generation():
+        return index
+    if settings.SEARCH_INDEX_BACKGROUND_REBUILD:
+        start_rebuild()
+    elif _rebuild_lock.acquire(blocking=False):
+        try:
+            _rebuild()
+        finally:
+            _rebuild_lock.release()
+        return _index
+    return index
+
+
+def apply_change(update) -> None:
+    """
+    Apply `update(index)` to this worker's index and tell other workers.
+
+    When this worker's index was current before the change it stays
+    current, so the worker that made an edit never rebuilds for it. A
+    rebuild in progress is not waited for; it sees the generation move and
+    discards its result.
+    """
+    before = current_generation()
+    generation = bump_generation()
+    index = _index
+    if index is None:
+        return
+    with index.lock:
+        was_current = index.generation == before
+        update(index)
+        # Another worker's edit in between means a rebuild is still due.
+        if was_current and generation == before + 1:
+            index.generation = generation
+
+
+def reset_index() -> None:
+    """Drop this worker's index; the next search rebuilds it."""
+    global _index
+    _index = None
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from menu.synthetic import create_synthetic_catalogue
+from search.index import build_index
+
+QUERIES = (
+    "vigoron",
+    "nacatamal",
+    "indio viejo",
+    "gallo pinto",
+    "sopa mondongo",
+    "quesilo",
+    "nacatamla",
+    "vigo",
+    "restaurante 0001",
+    "receta casa",
+    "baho",
+    "rondon",
+)
+
+
+class Command(BaseCommand):
+    help = "Builds the search index over a synthetic catalogue and times queries against it (rolled back afterwards)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=200_000)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        items = options["items"]
+        businesses = max(items // 100, 1)
+
+        with transaction.atomic():
+            create_synthetic_catalogue(businesses=businesses, items_per_business=max(items // businesses, 1))
+            started = time.perf_counter()
+            index = build_index()
+            build_time = time.perf_counter() - started
+
+            self.stdout.write(
+                f"{len(index.documents)} documents, {len(index.postings)} terms, built in {build_time:.1f} s"
+            )
+            for query in QUERIES:
+                timings = []
+                for _ in range(options["repeat"]):
+                    started = time.perf_counter()
+                    results = index.search(query)
+                    timings.append(time.perf_counter() - started)
+                hits = sum(len(group) for group in results.values())
+                self.stdout.write(
+                    f"{query!r:<22} median {statistics.median(timings) * 1000:7.2f} ms   "
+                    f"max {max(timings) * 1000:7.2f} ms   {hits} hits"
+                )
+            transaction.set_rollback(True)
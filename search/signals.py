@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from businesses.models import Business
+from menu.models import FoodItem, FoodItemTag, FoodTag
+from .index import PRODUCT, RESTAURANT, TAG, apply_change, index_products, index_restaurants, index_tags
+
+# Index updates run after the surrounding transaction commits, so rolled-back
+# edits never reach the index. Primary keys are read up front because
+# `delete()` clears them before the commit. As with the menu version,
+# `QuerySet.update()` and `bulk_create()` bypass these receivers.
+
+
+def _on_commit(update) -> None:
+    transaction.on_commit(partial(apply_change, update))
+
+
+@receiver(post_save, sender=Business)
+def business_saved(sender, instance: Business, **kwargs) -> None:
+    pk = instance.pk
+
+    def update(index):
+        index_restaurants(index, [pk])
+        # Products are also found by, and show, their restaurant's name.
+        index_products(index, FoodItem.objects.filter(business_id=pk))
+
+    _on_commit(update)
+
+
+@receiver(post_delete, sender=Business)
+def business_deleted(sender, instance: Business, **kwargs) -> None:
+    # Its food items are deleted by cascade and remove themselves.
+    key = (RESTAURANT, instance.pk)
+    _on_commit(lambda index: index.remove(key))
+
+
+@receiver(post_save, sender=FoodItem)
+def food_item_saved(sender, instance: FoodItem, **kwargs) -> None:
+    items = FoodItem.objects.filter(pk=instance.pk)
+    _on_commit(lambda index: index_products(index, items))
+
+
+@receiver(post_delete, sender=FoodItem)
+def food_item_deleted(sender, instance: FoodItem, **kwargs) -> None:
+    key = (PRODUCT, instance.pk)
+    _on_commit(lambda index: index.remove(key))
+
+
+@receiver([post_save, post_delete], sender=FoodItemTag)
+def food_item_tag_changed(sender, instance: FoodItemTag, **kwargs) -> None:
+    items = FoodItem.objects.filter(pk=instance.food_item_id)
+    _on_commit(lambda index: index_products(index, items))
+
+
+@receiver(post_save, sender=FoodTag)
+def food_tag_saved(sender, instance: FoodTag, **kwargs) -> None:
+    pk = instance.pk
+
+    def update(index):
+        index_tags(index, [pk])
+        index_products(index, FoodItem.objects.filter(tags__tag_id=pk))
+
+    _on_commit(update)
+
+
+@receiver(post_delete, sender=FoodTag)
+def food_tag_deleted(sender, instance: FoodTag, **kwargs) -> None:
+    # The tag's FoodItemTag rows are deleted by cascade and reindex their items.
+    key = (TAG, instance.pk)
+    _on_commit(lambda index: index.remove(key))
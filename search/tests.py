@@ -0,0 +1,234 @@
+import random
+import threading
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from businesses.models import Business
+from menu.models import FoodItem, FoodItemTag, FoodTag
+from . import index as search_index
+from .index import SearchIndex, fold, tokenize
+
+
+class SearchIndexTests(SimpleTestCase):
+    def test_folds_accents_and_drops_stopwords(self):
+        self.assertEqual(fold("Ñoña CAFÉ"), "nona cafe")
+        self.assertEqual(tokenize("Sopa de Mondongo con Limón"), ["sopa", "mondongo", "limon"])
+
+    def test_typo_and_prefix_matching(self):
+        index = SearchIndex()
+        index.add(("products", 1), {"name": "Nacatamal"}, (("Nacatamal tradicional", 3),))
+        index.add(("products", 2), {"name": "Quesillo"}, (("Quesillo", 3),))
+
+        queries = ("nacatamal", "NACATAMAL", "nacatamla", "nactamal", "nacatamall", "naca", "tradicional naca")
+        for query in queries:
+            with self.subTest(query=query):
+                self.assertEqual([doc["name"] for doc in index.search(query)["products"]], ["Nacatamal"])
+        for query in ("nacatamal quesillo", "naca tradicional", "xyz"):
+            with self.subTest(query=query):
+                self.assertEqual(index.search(query)["products"], [])
+
+    def test_early_termination_matches_full_ranking(self):
+        rng = random.Random(3)
+        words = ["pollo", "polla", "arroz", "frijol", "queso", "quesillo", "maduro", "tajada", "cacao", "cafe"]
+        kinds = ("restaurants", "products", "tags")
+        index = SearchIndex()
+        for pk in range(400):
+            name = " ".join(rng.sample(words, 2)) + f" {pk % 37}"
+            description = " ".join(rng.sample(words, 3))
+            index.add((kinds[pk % 3], pk), {"name": name}, ((name, 3), (description, rng.choice((1, 2)))))
+
+        for query in ("pollo", "pol", "queso cafe", "quesilo arroz maduro", "cacao 1", "frijol tajada caf"):
+            tokens = tokenize(query)
+            expansions = [
+                index._matches(token, prefix=position == len(tokens) - 1) for position, token in enumerate(tokens)
+            ]
+            for kind in kinds:
+                ranked = sorted(
+                    (-index._score(key, expansions), document.data["name"], key)
+                    for key, document in index.documents.items()
+                    if key[0] == kind and index._score(key, expansions)
+                )
+                with self.subTest(query=query, kind=kind):
+                    self.assertEqual(
+                        [document["name"] for document in index.search(query, limit=7)[kind]],
+                        [name for _, name, _ in ranked[:7]],
+                    )
+
+    def test_searches_and_changes_from_other_threads(self):
+        index = SearchIndex()
+        for pk in range(200):
+            index.add(("products", pk), {"name": f"Quesillo {pk}"}, ((f"Quesillo {pk}", 3),))
+        done = threading.Event()
+
+        def edit():
+            pk = 200
+            while not done.is_set():
+                with index.lock:
+                    index.add(("products", pk), {"name": f"Quesillo {pk}"}, ((f"Quesillo {pk}", 3),))
+                    index.remove(("products", pk - 150))
+                pk += 1
+
+        editor = threading.Thread(target=edit)
+        editor.start()
+        try:
+            for _ in range(300):
+                self.assertEqual(len(index.search("quesi", limit=20)["products"]), 20)
+        finally:
+            done.set()
+            editor.join()
+
+    def test_remove_cleans_up_terms(self):
+        index = SearchIndex()
+        index.add(("tags", 1), {"name": "Picante"}, (("Picante", 3),))
+        index.remove(("tags", 1))
+
+        self.assertEqual(index.postings, {})
+        self.assertEqual(index.ranked, {})
+        self.assertEqual(index.vocabulary, [])
+        self.assertEqual(index.typo_variants, {})
+
+
+@override_settings(SEARCH_INDEX_BACKGROUND_REBUILD=False)
+class SearchEndpointTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        search_index.reset_index()
+        self.url = reverse("search-list")
+        self.business = Business.objects.create(
+            name="Fritanga Doña Ñoña", tagline="Comida típica nicaragüense"
+        )
+        self.tag = FoodTag.objects.create(name="Picante")
+        self.item = FoodItem.objects.create(
+            business=self.business,
+            name="Vigorón",
+            description="Yuca, chicharrón y ensalada",
+            price=Decimal("120"),
+        )
+        FoodItemTag.objects.create(food_item=self.item, tag=self.tag)
+        FoodItem.objects.create(business=self.business, name="Vigorón agotado", price=1, is_available=False)
+
+    def search(self, query, **params):
+        return self.client.get(self.url, {"q": query, **params}).json()
+
+    def test_ranks_each_kind(self):
+        results = self.search("vigoron")
+
+        self.assertEqual(
+            results["products"],
+            [
+                {
+                    "id": str(self.item.pk),
+                    "name": "Vigorón",
+                    "price": "C$120.00",
+                    "image": "",
+                    "restaurantId": str(self.business.pk),
+                    "restaurantName": "Fritanga Doña Ñoña",
+                }
+            ],
+        )
+        self.assertEqual(self.search("nona")["restaurants"][0]["name"], "Fritanga Doña Ñoña")
+        self.assertEqual(self.search("picnte")["tags"], [{"id": str(self.tag.pk), "name": "Picante"}])
+        self.assertEqual([item["name"] for item in self.search("picante")["products"]], ["Vigorón"])
+
+    def test_searching_does_not_query_the_database(self):
+        self.search("vigoron")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.search("chicharron")
+
+        self.assertEqual(len(queries), 0)
+
+    def test_edits_update_the_index_incrementally(self):
+        self.search("vigoron")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item.name = "Nacatamal"
+            self.item.save()
+            self.business.name = "La Cocina de Doña Haydée"
+            self.business.save()
+        with CaptureQueriesContext(connection) as queries:
+            results = self.search("nacatamal")
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(results["products"][0]["restaurantName"], "La Cocina de Doña Haydée")
+        self.assertEqual(self.search("vigoron")["products"], [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item.delete()
+        self.assertEqual(self.search("nacatamal")["products"], [])
+
+    def test_other_workers_edits_trigger_a_rebuild(self):
+        self.search("vigoron")
+        FoodItem.objects.filter(pk=self.item.pk).update(name="Baho")
+
+        self.assertEqual(self.search("baho")["products"], [])
+        search_index.bump_generation()
+        self.assertEqual([item["name"] for item in self.search("baho")["products"]], ["Baho"])
+
+    def test_limit(self):
+        for index in range(5):
+            FoodItem.objects.create(business=self.business, name=f"Quesillo {index}", price=30)
+
+        self.assertEqual(len(self.search("quesillo", limit=3)["products"]), 3)
+        self.assertEqual(self.search("", limit=3), {"restaurants": [], "products": [], "tags": []})
+
+
+class BackgroundRebuildTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        search_index.reset_index()
+        self.business = Business.objects.create(name="Fritanga")
+        self.item = FoodItem.objects.create(business=self.business, name="Vigorón", price=Decimal("120"))
+
+    def search(self, query):
+        return [item["name"] for item in self.client.get(reverse("search-list"), {"q": query}).json()["products"]]
+
+    def test_stale_index_answers_while_rebuilding(self):
+        self.assertEqual(self.search("vigoron"), ["Vigorón"])
+        FoodItem.objects.filter(pk=self.item.pk).update(name="Baho")
+        search_index.bump_generation()
+
+        self.assertEqual(self.search("vigoron"), ["Vigorón"])
+        for thread in threading.enumerate():
+            if thread.name == "search-index-rebuild":
+                thread.join()
+
+        self.assertEqual(self.search("baho"), ["Baho"])
+        self.assertEqual(self.search("vigoron"), [])
+
+    def test_edits_do_not_wait_for_a_rebuild(self):
+        self.assertEqual(self.search("vigoron"), ["Vigorón"])
+        serving = search_index.get_index()
+        building, release = threading.Event(), threading.Event()
+        build_index = search_index.build_index
+
+        def slow_build(generation):
+            index = build_index(generation)
+            building.set()
+            release.wait(5)
+            return index
+
+        search_index.bump_generation()
+        with mock.patch.object(search_index, "build_index", slow_build):
+            try:
+                self.search("vigoron")
+                self.assertTrue(building.wait(5))
+                self.item.name = "Baho"
+                self.item.save()  # Would block on the rebuild if edits took its lock.
+                self.assertEqual(self.search("baho"), ["Baho"])
+            finally:
+                release.set()
+                for thread in threading.enumerate():
+                    if thread.name == "search-index-rebuild":
+                        thread.join()
+
+        # The build read the rows before the edit, so it was discarded.
+        self.assertIs(search_index.get_index(), serving)
+        self.assertEqual(self.search("baho"), ["Baho"])
+        self.assertEqual(self.search("vigoron"), [])
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from rest_framework import permissions, viewsets
+from rest_framework.response import Response
+
+from users.authentication import READ_AUTHENTICATION_CLASSES
+from .index import get_index
+
+
+class SearchViewSet(viewsets.ViewSet):
+    """
+    Catalogue search.
+
+    `?q=` is matched against restaurants, available products and food tags,
+    ignoring case and accents and tolerating one typo per word; the last word
+    also matches as a prefix. `?limit=` caps each group (default 10, max 50).
+    """
+
+    authentication_classes = READ_AUTHENTICATION_CLASSES
+    permission_classes = [permissions.AllowAny]
+    default_limit = 10
+    max_limit = 50
+
+    def list(self, request):
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        limit = max(1, min(limit, self.max_limit))
+        return Response(get_index().search(request.query_params.get("q", ""), limit=limit))
@@ -0,0 +1,88 @@
+﻿from __future__ import annotations
+
+import threading
+import time
+from typing import Dict
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.settings import api_settings as drf_settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from .tokens import CLAIMS_AT
+
+
+class RevokedUsers:
+    """
+    This worker's snapshot of users whose token claims may be out of date.
+
+    Maps user ids to when their role or active flag last changed. Only
+    changes newer than `ACCESS_TOKEN_LIFETIME` matter, since every older
+    access token has expired, so the snapshot stays small and reloading it
+    every `CLAIMS_AUTH_REVOCATION_TTL` seconds is one indexed query. Saves
+    made by this worker reload it on the next request.
+    """
+
+    def __init__(self):
+        self._changed: Dict[str, float] = {}
+        self._loaded_at = float('-inf')
+        self._lock = threading.Lock()
+
+    def changed_at(self, user_id) -> float | None:
+        """Unix time of the user's last claims change, if recent."""
+        if time.monotonic() - self._loaded_at >= settings.CLAIMS_AUTH_REVOCATION_TTL:
+            with self._lock:
+                if time.monotonic() - self._loaded_at >= settings.CLAIMS_AUTH_REVOCATION_TTL:
+                    self._load()
+        return self._changed.get(str(user_id))
+
+    def forget(self) -> None:
+        self._loaded_at = float('-inf')
+
+    def _load(self) -> None:
+        from .models import User
+
+        cutoff = timezone.now() - api_settings.ACCESS_TOKEN_LIFETIME
+        rows = User.objects.filter(claims_changed_at__gte=cutoff).values_list('pk', 'claims_changed_at')
+        self._changed = {str(pk): changed.timestamp() for pk, changed in rows}
+        self._loaded_at = time.monotonic()
+
+
+revoked_users = RevokedUsers()
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that trusts the token's claims instead of loading the user.
+
+    Returns a `TokenUser`, whose `id`, `email` and `role` come from the
+    token, so authenticated reads cost no user query. The database is still
+    used for tokens issued before claims were stamped, for tokens whose
+    claims are older than an access token can live, and for users whose
+    role or active flag changed after the token's `claims_at`; a demoted or
+    deactivated user is therefore seen as such within
+    `CLAIMS_AUTH_REVOCATION_TTL` seconds. Deleted users keep working until
+    their access token expires. Only use it on views that do not need a
+    `User` instance.
+    """
+
+    def get_user(self, validated_token):
+        claims_at = validated_token.get(CLAIMS_AT)
+        if claims_at is None or 'role' not in validated_token:
+            return super().get_user(validated_token)
+        if claims_at < time.time() - api_settings.ACCESS_TOKEN_LIFETIME.total_seconds():
+            return super().get_user(validated_token)
+        if settings.CLAIMS_AUTH_CHECK_REVOCATIONS:
+            changed_at = revoked_users.changed_at(validated_token.get(api_settings.USER_ID_CLAIM))
+            if changed_at is not None and changed_at >= claims_at:
+                return super().get_user(validated_token)
+        return api_settings.TOKEN_USER_CLASS(validated_token)
+
+
+# The default authentication classes with `ClaimsJWTAuthentication` in place
+# of `JWTAuthentication`, for read-heavy views.
+READ_AUTHENTICATION_CLASSES = [
+    ClaimsJWTAuthentication if issubclass(auth, JWTAuthentication) else auth
+    for auth in drf_settings.DEFAULT_AUTHENTICATION_CLASSES
+]
@@ -0,0 +1,62 @@
+﻿from __future__ import annotations
+
+import threading
+import time
+from typing import Dict
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+
+class BlacklistFilter:
+    """
+    This worker's copy of the blacklisted refresh-token ids that have not expired.
+
+    Checking a token is a set lookup. Every `TOKEN_BLACKLIST_SYNC_INTERVAL`
+    seconds the rows blacklisted since the last sync are fetched (one query
+    on the primary key, usually empty) and expired ids are dropped, so the
+    set holds at most one refresh-token lifetime of rotations. Tokens
+    blacklisted by another worker can pass the check until the next sync;
+    `UserRefreshToken.blacklist()` refuses them, so they still cannot be
+    rotated twice.
+    """
+
+    def __init__(self):
+        self._expires: Dict[str, float] = {}
+        self._last_id = 0
+        self._synced_at = float('-inf')
+        self._lock = threading.Lock()
+
+    def __contains__(self, jti: str) -> bool:
+        if time.monotonic() - self._synced_at >= settings.TOKEN_BLACKLIST_SYNC_INTERVAL:
+            with self._lock:
+                if time.monotonic() - self._synced_at >= settings.TOKEN_BLACKLIST_SYNC_INTERVAL:
+                    self._sync()
+        return jti in self._expires
+
+    def add(self, jti: str, expires_at: float) -> None:
+        self._expires[jti] = expires_at
+
+    def clear(self) -> None:
+        with self._lock:
+            self._expires = {}
+            self._last_id = 0
+            self._synced_at = float('-inf')
+
+    def _sync(self) -> None:
+        now = timezone.now()
+        rows = (
+            BlacklistedToken.objects.filter(id__gt=self._last_id, token__expires_at__gt=now)
+            .order_by('id')
+            .values_list('id', 'token__jti', 'token__expires_at')
+        )
+        expires = {jti: at for jti, at in self._expires.items() if at > now.timestamp()}
+        for pk, jti, expires_at in rows:
+            expires[jti] = expires_at.timestamp()
+            self._last_id = pk
+        self._expires = expires
+        self._synced_at = time.monotonic()
+
+
+blacklisted_tokens = BlacklistFilter()
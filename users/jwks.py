@@ -0,0 +1,169 @@
+﻿from __future__ import annotations
+
+import email.utils
+import logging
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, Mapping
+
+logger = logging.getLogger(__name__)
+
+_MAX_AGE = re.compile(r'(?:^|,)\s*max-age\s*=\s*"?(\d+)"?', re.IGNORECASE)
+
+
+class KeySetError(Exception):
+    """The key set could not be fetched, or has no key with the requested id."""
+
+
+@lru_cache(maxsize=None)
+def http_session() -> 'requests.Session':
+    """A process-wide session, so key fetches reuse pooled keep-alive connections."""
+    try:
+        import requests  # type: ignore
+        from requests.adapters import HTTPAdapter  # type: ignore
+    except ImportError:  # pragma: no cover - optional dependency
+        raise KeySetError('requests library is not installed. Install it with "pip install requests".') from None
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=1)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def cache_lifetime(headers: Mapping[str, str], default: float) -> float:
+    """Seconds a response may be reused, from `Cache-Control: max-age` or `Expires`."""
+    match = _MAX_AGE.search(headers.get('Cache-Control', ''))
+    if match:
+        return float(match.group(1)) - float(headers.get('Age', 0) or 0)
+    expires = headers.get('Expires')
+    if expires:
+        try:
+            return email.utils.parsedate_to_datetime(expires).timestamp() - time.time()
+        except (TypeError, ValueError):
+            pass
+    return default
+
+
+class KeySet:
+    """
+    A provider's JSON Web Key Set, fetched once and kept in memory per process.
+
+    Keys are parsed once and looked up by `kid`. The set is reused for as
+    long as the provider's `Cache-Control` allows (clamped to
+    `[min_ttl, max_ttl]`), and once `refresh_ahead` of that time has passed
+    a background thread fetches a fresh copy while the current keys keep
+    being served, so sign-ins do not wait on the provider. A `kid` that is
+    not in the set triggers an immediate refetch, for keys rotated since
+    the last fetch, but at most once per `unknown_kid_interval` seconds so
+    tokens with made-up ids cannot make us hammer the provider. If a
+    refresh fails, the previous keys stay in use.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        default_ttl: float = 60 * 60,
+        min_ttl: float = 60,
+        max_ttl: float = 24 * 60 * 60,
+        refresh_ahead: float = 0.8,
+        unknown_kid_interval: float = 60,
+        timeout: float = 5,
+    ):
+        self.url = url
+        self.default_ttl = default_ttl
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.refresh_ahead = refresh_ahead
+        self.unknown_kid_interval = unknown_kid_interval
+        self.timeout = timeout
+        self._keys: Dict[str, Any] = {}
+        self._refresh_at = 0.0
+        self._expires_at = 0.0
+        self._last_unknown_fetch = float('-inf')
+        self._lock = threading.Lock()
+        self._background: threading.Thread | None = None
+
+    def get(self, kid: str | None) -> Any:
+        """The `jwt.PyJWK` with id `kid`."""
+        now = time.monotonic()
+        if now >= self._expires_at:
+            with self._lock:
+                if time.monotonic() >= self._expires_at:
+                    self._refresh()
+        elif now >= self._refresh_at:
+            self._refresh_in_background()
+
+        key = self._keys.get(kid or '')
+        if key is None:
+            with self._lock:
+                key = self._keys.get(kid or '')
+                if key is None and time.monotonic() - self._last_unknown_fetch >= self.unknown_kid_interval:
+                    self._last_unknown_fetch = time.monotonic()
+                    self._refresh()
+                    key = self._keys.get(kid or '')
+        if key is None:
+            raise KeySetError(f'No key with id {kid!r} in {self.url}.')
+        return key
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys = {}
+            self._refresh_at = self._expires_at = 0.0
+            self._last_unknown_fetch = float('-inf')
+
+    def _refresh(self) -> None:
+        """Fetch the set; the caller holds `_lock`."""
+        try:
+            response = http_session().get(self.url, timeout=self.timeout)
+            response.raise_for_status()
+            keys = self._parse(response.json())
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            if not self._keys:
+                raise KeySetError(f'Unable to fetch keys from {self.url}.') from exc
+            logger.warning('Refreshing %s failed, keeping the cached keys: %s', self.url, exc)
+            # Try again soon rather than on every call.
+            self._refresh_at = time.monotonic() + self.min_ttl
+            self._expires_at = max(self._expires_at, self._refresh_at)
+            return
+
+        lifetime = cache_lifetime(response.headers, self.default_ttl)
+        lifetime = min(self.max_ttl, max(self.min_ttl, lifetime))
+        fetched = time.monotonic()
+        self._keys = keys
+        self._refresh_at = fetched + lifetime * self.refresh_ahead
+        self._expires_at = fetched + lifetime
+
+    def _refresh_in_background(self) -> None:
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            if self._background is not None and self._background.is_alive():
+                return
+            self._background = threading.Thread(target=self._background_refresh, daemon=True)
+            self._background.start()
+        finally:
+            self._lock.release()
+
+    def _background_refresh(self) -> None:
+        with self._lock:
+            if time.monotonic() >= self._refresh_at:
+                try:
+                    self._refresh()
+                except KeySetError:
+                    logger.warning('Background refresh of %s failed.', self.url)
+
+    @staticmethod
+    def _parse(data: Mapping[str, Any]) -> Dict[str, Any]:
+        try:
+            import jwt  # type: ignore
+        except ImportError:  # pragma: no cover - optional dependency
+            raise KeySetError('PyJWT is required. Install it with "pip install pyjwt[crypto]".') from None
+        keys = {}
+        for jwk in data.get('keys', []):
+            try:
+                keys[jwk.get('kid', '')] = jwt.PyJWK(jwk)
+            except jwt.PyJWKError as exc:
+                logger.warning('Skipping unusable key %s: %s', jwk.get('kid'), exc)
+        return keys
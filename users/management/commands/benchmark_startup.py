@@ -0,0 +1,71 @@
+﻿from __future__ import annotations
+
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# What a worker does before serving: import the entry point, then load the
+# URLconf, which Django otherwise defers to the first request.
+SCRIPT = 'import {module}; from django.urls import get_resolver; get_resolver().url_patterns'
+ENTRY_POINTS = ('hartazone.wsgi', 'hartazone.asgi')
+# Modules that should only be imported when a request needs them.
+LAZY_MODULES = ('jwt', 'users.jwks')
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int, int]]:
+    """`-X importtime` output as (module, depth, self us, cumulative us) rows."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or '[us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), depth, int(own), int(cumulative)))
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Reports `python -X importtime` totals, per top-level package, for loading the WSGI and ASGI "
+        "applications and their URLconf."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--top', type=int, default=10)
+
+    def handle(self, *args, **options):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'hartazone.settings')}
+        for module in ENTRY_POINTS:
+            totals, packages = [], defaultdict(list)
+            for _ in range(options['runs']):
+                result = subprocess.run(
+                    [sys.executable, '-X', 'importtime', '-c', SCRIPT.format(module=module)],
+                    capture_output=True,
+                    text=True,
+                    cwd=settings.BASE_DIR,
+                    env=env,
+                    check=True,
+                )
+                rows = parse_importtime(result.stderr)
+                totals.append(sum(own for _, _, own, _ in rows))
+                by_package = defaultdict(int)
+                for name, _, own, _ in rows:
+                    by_package[name.split('.')[0]] += own
+                for name, own in by_package.items():
+                    packages[name].append(own)
+
+            self.stdout.write(
+                f'{module}: {statistics.median(totals) / 1000:.1f} ms median import time '
+                f"over {options['runs']} runs, {len(rows)} modules"
+            )
+            slowest = sorted(packages.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+            for name, samples in slowest[: options['top']]:
+                self.stdout.write(f'  {statistics.median(samples) / 1000:8.1f} ms  {name}')
+            loaded = [name for name in LAZY_MODULES if any(row[0] == name for row in rows)] or ['none']
+            self.stdout.write(f"  lazy modules imported at startup: {', '.join(loaded)}")
@@ -0,0 +1,26 @@
+﻿from django.core.management.base import BaseCommand
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+
+class Command(BaseCommand):
+    help = "Deletes expired outstanding and blacklisted refresh tokens in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        # Short transactions keep locks brief while the app keeps rotating tokens.
+        now = aware_utcnow()
+        total = 0
+        while True:
+            ids = list(
+                OutstandingToken.objects.filter(expires_at__lte=now)
+                .order_by('id')
+                .values_list('id', flat=True)[: options['batch_size']]
+            )
+            if not ids:
+                break
+            OutstandingToken.objects.filter(id__in=ids).delete()
+            total += len(ids)
+        self.stdout.write(self.style.SUCCESS(f'Pruned {total} expired tokens.'))
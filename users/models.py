@@ -22,6 +22,9 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
     date_joined = models.DateTimeField(default=timezone.now)
+    # When `role` or `is_active` last changed, so tokens carrying older claims
+    # are re-checked against the database (see `users.authentication`).
+    claims_changed_at = models.DateTimeField(null=True, blank=True, editable=False, db_index=True)
 
     objects = UserManager()
 
@@ -35,6 +38,20 @@ class User(AbstractBaseUser, PermissionsMixin):
     def __str__(self) -> str:
         return self.email
 
+    def save(self, *args, **kwargs):
+        # `QuerySet.update()` bypasses this; set `claims_changed_at` there too.
+        update_fields = kwargs.get("update_fields")
+        if self.pk is not None and (update_fields is None or {"role", "is_active"} & set(update_fields)):
+            previous = User.objects.filter(pk=self.pk).values_list("role", "is_active").first()
+            if previous is not None and previous != (self.role, self.is_active):
+                self.claims_changed_at = timezone.now()
+                if update_fields is not None:
+                    kwargs["update_fields"] = {*update_fields, "claims_changed_at"}
+                from .authentication import revoked_users
+
+                revoked_users.forget()
+        super().save(*args, **kwargs)
+
     @property
     def full_name(self) -> str:
         return f"{self.first_name} {self.last_name}".strip()
@@ -1,30 +1,13 @@
 ﻿from __future__ import annotations
 
-import json
 import logging
 from dataclasses import dataclass
-from typing import Any, Dict
-
-try:
-    import requests  # type: ignore
-except ImportError:  # pragma: no cover - optional dependency
-    requests = None  # type: ignore
+from typing import TYPE_CHECKING, Any, Callable, Dict
 
 from django.conf import settings
 
-try:
-    from google.auth.transport import requests as google_requests  # type: ignore
-    from google.oauth2 import id_token as google_id_token  # type: ignore
-except ImportError:  # pragma: no cover - optional dependency
-    google_requests = None  # type: ignore
-    google_id_token = None  # type: ignore
-
-try:
-    import jwt  # type: ignore
-    from jwt.algorithms import RSAAlgorithm  # type: ignore
-except (ImportError, AttributeError):  # pragma: no cover - optional dependency
-    jwt = None  # type: ignore
-    RSAAlgorithm = None  # type: ignore
+if TYPE_CHECKING:  # pragma: no cover
+    from .jwks import KeySet
 
 logger = logging.getLogger(__name__)
 
@@ -55,25 +38,63 @@ class SocialProfile:
 
 
 GOOGLE_ISSUERS = {'accounts.google.com', 'https://accounts.google.com'}
+GOOGLE_KEYS_URL = 'https://www.googleapis.com/oauth2/v3/certs'
 APPLE_KEYS_URL = 'https://appleid.apple.com/auth/keys'
 APPLE_ISSUER = 'https://appleid.apple.com'
 
+# Signing keys are cached per process (see `KeySet`), created on first use.
+_key_sets: Dict[str, KeySet] = {}
 
-def verify_google_token(id_token: str) -> SocialProfile:
-    if google_id_token is None or google_requests is None:
+
+def signing_keys(provider: str) -> KeySet:
+    keys = _key_sets.get(provider)
+    if keys is None:
+        from .jwks import KeySet
+
+        keys = _key_sets.setdefault(provider, KeySet(PROVIDERS[provider].keys_url))
+    return keys
+
+
+def _decode(provider: str, label: str, id_token: str, **claims: Any) -> Dict[str, Any]:
+    """Verify `id_token` against the provider's cached signing keys and return its claims."""
+    # PyJWT and the key-fetching code are imported here rather than at module
+    # level, so URL loading does not pay for them; social login is rare.
+    try:
+        import jwt  # type: ignore
+    except ImportError:  # pragma: no cover - optional dependency
         raise SocialVerificationError(
-            'google',
-            'google-auth library is not installed. Install it with "pip install google-auth".',
-        )
+            provider,
+            'PyJWT with cryptography support is required. Install it with "pip install pyjwt[crypto]".',
+        ) from None
+    from .jwks import KeySetError
 
-    audience = settings.GOOGLE_CLIENT_ID or None
+    try:
+        headers = jwt.get_unverified_header(id_token)
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        raise SocialVerificationError(provider, f'Invalid {label} token header.') from exc
+
+    try:
+        key = signing_keys(provider).get(headers.get('kid'))
+    except KeySetError as exc:
+        logger.warning('No usable %s signing key: %s', label, exc)
+        raise SocialVerificationError(provider, f'Unable to match {label} signing key.') from exc
 
     try:
-        request = google_requests.Request()
-        payload = google_id_token.verify_oauth2_token(id_token, request, audience=audience)
+        return jwt.decode(
+            id_token,
+            key.key,
+            algorithms=[key.algorithm_name],
+            options={'verify_aud': claims.get('audience') is not None},
+            **claims,
+        )
     except Exception as exc:  # pylint: disable=broad-exception-caught
-        logger.exception('Failed to verify Google token: %s', exc)
-        raise SocialVerificationError('google', 'Google token validation failed.') from exc
+        logger.exception('Failed to verify %s token: %s', label, exc)
+        raise SocialVerificationError(provider, f'{label} token validation failed.') from exc
+
+
+def verify_google_token(id_token: str) -> SocialProfile:
+    audience = settings.GOOGLE_CLIENT_ID or None
+    payload = _decode('google', 'Google', id_token, audience=audience)
 
     issuer = payload.get('iss')
     if issuer not in GOOGLE_ISSUERS:
@@ -96,57 +117,12 @@ def verify_google_token(id_token: str) -> SocialProfile:
     )
 
 
-def _fetch_apple_keys() -> Dict[str, Any]:
-    if requests is None:
-        raise SocialVerificationError(
-            'apple',
-            'requests library is not installed. Install it with "pip install requests".',
-        )
-
-    try:
-        response = requests.get(APPLE_KEYS_URL, timeout=5)
-        response.raise_for_status()
-        return response.json()
-    except Exception as exc:  # pragma: no cover - network issue
-        logger.exception('Failed to fetch Apple public keys: %s', exc)
-        raise SocialVerificationError('apple', 'Unable to fetch Apple public keys.') from exc
-
-
 def verify_apple_token(id_token: str) -> SocialProfile:
-    if jwt is None or RSAAlgorithm is None:
-        raise SocialVerificationError(
-            'apple',
-            'PyJWT with cryptography support is required. Install it with "pip install pyjwt[crypto]".',
-        )
-
     audience = settings.APPLE_CLIENT_ID or None
     if not audience:
         raise SocialVerificationError('apple', 'Apple client identifier is not configured.')
 
-    try:
-        headers = jwt.get_unverified_header(id_token)
-    except Exception as exc:  # pylint: disable=broad-exception-caught
-        raise SocialVerificationError('apple', 'Invalid Apple identity token header.') from exc
-
-    key_set = _fetch_apple_keys()
-    keys = key_set.get('keys', [])
-    matching_key = next((key for key in keys if key.get('kid') == headers.get('kid')), None)
-
-    if not matching_key:
-        raise SocialVerificationError('apple', 'Unable to match Apple signing key.')
-
-    try:
-        public_key = RSAAlgorithm.from_jwk(json.dumps(matching_key))
-        payload = jwt.decode(
-            id_token,
-            public_key,
-            algorithms=[headers.get('alg', 'RS256')],
-            audience=audience,
-            issuer=APPLE_ISSUER,
-        )
-    except Exception as exc:  # pylint: disable=broad-exception-caught
-        logger.exception('Failed to decode Apple identity token: %s', exc)
-        raise SocialVerificationError('apple', 'Apple token validation failed.') from exc
+    payload = _decode('apple', 'Apple', id_token, audience=audience, issuer=APPLE_ISSUER)
 
     email = payload.get('email')
     if not email:
@@ -165,13 +141,23 @@ def verify_apple_token(id_token: str) -> SocialProfile:
     )
 
 
+@dataclass(frozen=True)
+class Provider:
+    keys_url: str
+    verify: Callable[[str], SocialProfile]
+    missing_token: str
+
+
+PROVIDERS: Dict[str, Provider] = {
+    'google': Provider(GOOGLE_KEYS_URL, verify_google_token, 'Google ID token was not provided.'),
+    'apple': Provider(APPLE_KEYS_URL, verify_apple_token, 'Apple identity token was not provided.'),
+}
+
+
 def verify_social_token(provider: str, id_token: str | None) -> SocialProfile:
-    if provider == 'google':
-        if not id_token:
-            raise SocialVerificationError('google', 'Google ID token was not provided.')
-        return verify_google_token(id_token)
-    if provider == 'apple':
-        if not id_token:
-            raise SocialVerificationError('apple', 'Apple identity token was not provided.')
-        return verify_apple_token(id_token)
-    raise SocialVerificationError(provider, 'Provider is not supported.')
+    entry = PROVIDERS.get(provider)
+    if entry is None:
+        raise SocialVerificationError(provider, 'Provider is not supported.')
+    if not id_token:
+        raise SocialVerificationError(provider, entry.missing_token)
+    return entry.verify(id_token)
@@ -2,9 +2,10 @@
 
 from django.contrib.auth import authenticate
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
 
 from .models import User
+from .tokens import UserRefreshToken
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -75,12 +76,7 @@ class LoginSerializer(serializers.Serializer):
 
 
 class UserTokenObtainPairSerializer(TokenObtainPairSerializer):
-    @classmethod
-    def get_token(cls, user):
-        token = super().get_token(user)
-        token['email'] = user.email
-        token['role'] = user.role
-        return token
+    token_class = UserRefreshToken
 
     def validate(self, attrs):
         data = super().validate(attrs)
@@ -88,6 +84,10 @@ class UserTokenObtainPairSerializer(TokenObtainPairSerializer):
         return data
 
 
+class UserTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = UserRefreshToken
+
+
 class SocialLoginSerializer(serializers.Serializer):
     PROVIDER_CHOICES = (
         ('google', 'Google'),
@@ -1,3 +1,311 @@
-from django.test import TestCase
+﻿import io
+import json
+import logging
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
 
-# Create your tests here.
+from datetime import timedelta
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from jwt.algorithms import RSAAlgorithm
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from . import providers
+from .authentication import revoked_users
+from .blacklist import blacklisted_tokens
+from .jwks import KeySet, KeySetError, cache_lifetime
+from .management.commands.benchmark_startup import LAZY_MODULES, SCRIPT
+from .models import User
+from .providers import SocialVerificationError, verify_apple_token, verify_google_token, verify_social_token
+from .tokens import UserRefreshToken
+
+
+class JWKSServer:
+    """A local stand-in for a provider's key endpoint that counts its fetches."""
+
+    def __init__(self):
+        self.keys = {}
+        self.cache_control = 'public, max-age=3600'
+        self.fetches = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.fetches += 1
+                body = json.dumps({'keys': list(server.keys.values())}).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Cache-Control', server.cache_control)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.httpd.server_port}/keys'
+        threading.Thread(target=self.httpd.serve_forever, args=(0.01,), daemon=True).start()
+
+    def add_key(self, kid):
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.keys[kid] = {**RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True), 'kid': kid, 'alg': 'RS256'}
+        return private_key
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class KeySetTests(SimpleTestCase):
+    def setUp(self):
+        self.server = JWKSServer()
+        self.addCleanup(self.server.close)
+        self.server.add_key('a')
+        self.keys = KeySet(self.server.url, unknown_kid_interval=60)
+        self.now = time.monotonic()
+        clock = mock.patch('users.jwks.time.monotonic', side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def test_keys_are_fetched_once_and_reused(self):
+        first = self.keys.get('a')
+        self.now += 3000
+        self.assertIs(self.keys.get('a'), first)
+        self.assertEqual(self.server.fetches, 1)
+
+    def test_refreshes_in_the_background_before_expiry(self):
+        self.server.cache_control = 'max-age=100'
+        self.keys.get('a')
+        self.server.add_key('b')
+
+        self.now += 85
+        self.keys.get('a')
+        self.keys._background.join(timeout=5)
+        self.assertEqual(self.server.fetches, 2)
+        self.keys.get('b')
+        self.assertEqual(self.server.fetches, 2)
+
+    def test_expired_keys_are_refetched(self):
+        self.server.cache_control = 'max-age=100'
+        self.keys.get('a')
+        self.now += 101
+        self.keys.get('a')
+        self.assertEqual(self.server.fetches, 2)
+
+    def test_unknown_kid_refetches_at_most_once_per_interval(self):
+        self.keys.get('a')
+        self.server.add_key('rotated')
+        self.assertIsNotNone(self.keys.get('rotated'))
+        self.assertEqual(self.server.fetches, 2)
+
+        self.now += 61
+        for _ in range(5):
+            with self.assertRaises(KeySetError):
+                self.keys.get('made-up')
+        self.assertEqual(self.server.fetches, 3)
+
+        self.now += 61
+        with self.assertRaises(KeySetError):
+            self.keys.get('made-up')
+        self.assertEqual(self.server.fetches, 4)
+
+    def test_failed_refresh_keeps_the_cached_keys(self):
+        self.server.cache_control = 'max-age=100'
+        key = self.keys.get('a')
+        self.server.close()
+        self.now += 101
+        with self.assertLogs('users.jwks', 'WARNING'):
+            self.assertIs(self.keys.get('a'), key)
+
+    def test_cache_lifetime(self):
+        self.assertEqual(cache_lifetime({'Cache-Control': 'public, max-age=19383, must-revalidate'}, 5), 19383)
+        self.assertEqual(cache_lifetime({'Cache-Control': 'max-age=600', 'Age': '100'}, 5), 500)
+        self.assertEqual(cache_lifetime({'Cache-Control': 'no-cache'}, 5), 5)
+        self.assertAlmostEqual(
+            cache_lifetime({'Expires': 'Thu, 01 Jan 2099 00:00:00 GMT'}, 5), 4070908800 - time.time(), delta=5
+        )
+
+
+@override_settings(GOOGLE_CLIENT_ID='google-client', APPLE_CLIENT_ID='apple-client')
+class SocialTokenTests(SimpleTestCase):
+    def setUp(self):
+        self.server = JWKSServer()
+        self.addCleanup(self.server.close)
+        self.private_key = self.server.add_key('signing')
+        patcher = mock.patch.dict(
+            providers._key_sets, {name: KeySet(self.server.url) for name in providers.PROVIDERS}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def token(self, kid='signing', **claims):
+        payload = {'sub': '123', 'email': 'ana@example.com', 'exp': int(time.time()) + 300, **claims}
+        return jwt.encode(payload, self.private_key, algorithm='RS256', headers={'kid': kid})
+
+    def test_google_tokens_are_verified_with_cached_keys(self):
+        token = self.token(iss='https://accounts.google.com', aud='google-client', given_name='Ana')
+        for _ in range(3):
+            profile = verify_google_token(token)
+
+        self.assertEqual((profile.provider, profile.subject, profile.first_name), ('google', '123', 'Ana'))
+        self.assertEqual(self.server.fetches, 1)
+
+    def test_apple_tokens_are_verified_with_cached_keys(self):
+        token = self.token(iss='https://appleid.apple.com', aud='apple-client')
+        self.assertEqual(verify_apple_token(token).email, 'ana@example.com')
+        self.assertEqual(verify_apple_token(token).subject, '123')
+        self.assertEqual(self.server.fetches, 1)
+
+    def test_rejects_bad_tokens(self):
+        tokens = {
+            'wrong audience': self.token(iss='https://accounts.google.com', aud='someone-else'),
+            'wrong issuer': self.token(iss='https://evil.example.com', aud='google-client'),
+            'expired': self.token(iss='accounts.google.com', aud='google-client', exp=int(time.time()) - 60),
+            'unknown key': self.token(kid='other', iss='accounts.google.com', aud='google-client'),
+            'not a token': 'abc',
+        }
+        logging.disable(logging.CRITICAL)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        for reason, token in tokens.items():
+            with self.subTest(reason=reason), self.assertRaises(SocialVerificationError):
+                verify_google_token(token)
+
+    def test_providers_are_dispatched_from_the_registry(self):
+        with self.assertRaisesMessage(SocialVerificationError, 'Apple identity token was not provided.'):
+            verify_social_token('apple', '')
+        with self.assertRaisesMessage(SocialVerificationError, 'Provider is not supported.'):
+            verify_social_token('facebook', 'token')
+        token = self.token(iss='https://accounts.google.com', aud='google-client')
+        self.assertEqual(verify_social_token('google', token).provider, 'google')
+
+
+class ClaimsAuthenticationTests(APITestCase):
+    def setUp(self):
+        revoked_users.forget()
+        self.user = User.objects.create_user(email='admin@example.com', password='pass1234', role=User.Roles.ADMIN)
+
+    def login(self):
+        response = self.client.post(
+            reverse('auth-login'), {'email': 'admin@example.com', 'password': 'pass1234'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_read_views_do_not_load_the_user(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.login()['access']}")
+        self.client.get(reverse('api-root'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('api-root'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Admin-only writes are allowed from the role claim.
+        response = self.client.post(reverse('restaurant-list'), {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_role_changes_are_seen_before_the_token_expires(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.login()['access']}")
+        self.client.get(reverse('api-root'))
+        self.user.role = User.Roles.USER
+        self.user.save()
+
+        response = self.client.post(reverse('restaurant-list'), {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_deactivated_users_are_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.login()['access']}")
+        self.user.is_active = False
+        self.user.save(update_fields=['is_active'])
+
+        self.user.refresh_from_db()
+        self.assertIsNotNone(self.user.claims_changed_at)
+        response = self.client.get(reverse('api-root'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_refresh_stamps_the_current_role(self):
+        refresh = self.login()['refresh']
+        User.objects.filter(pk=self.user.pk).update(role=User.Roles.DRIVER)
+
+        response = self.client.post(reverse('auth-token-refresh'), {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(AccessToken(response.data['access'])['role'], User.Roles.DRIVER)
+        self.assertEqual(RefreshToken(response.data['refresh'])['role'], User.Roles.DRIVER)
+
+    def test_tokens_without_claims_load_the_user(self):
+        access = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('api-root'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class TokenBlacklistTests(APITestCase):
+    def setUp(self):
+        blacklisted_tokens.clear()
+        self.user = User.objects.create_user(email='ana@example.com', password='pass1234')
+        self.refresh = str(UserRefreshToken.for_user(self.user))
+
+    def rotate(self, refresh):
+        return self.client.post(reverse('auth-token-refresh'), {'refresh': refresh}, format='json')
+
+    def test_rotated_tokens_are_rejected(self):
+        self.assertEqual(self.rotate(self.refresh).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.rotate(self.refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_rotated_elsewhere_tokens_are_rejected_before_the_next_sync(self):
+        UserRefreshToken(self.refresh).blacklist()
+        blacklisted_tokens.clear()
+        blacklisted_tokens._synced_at = time.monotonic()
+
+        self.assertEqual(self.rotate(self.refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_checks_are_answered_from_memory(self):
+        self.assertNotIn('unknown', blacklisted_tokens)
+        UserRefreshToken(self.refresh).blacklist()
+        with self.assertNumQueries(0):
+            self.assertIn(UserRefreshToken(self.refresh, verify=False)['jti'], blacklisted_tokens)
+            self.assertNotIn('unknown', blacklisted_tokens)
+
+    def test_sync_picks_up_new_rows_and_drops_expired_ones(self):
+        self.assertNotIn('unknown', blacklisted_tokens)
+        jti = UserRefreshToken(self.refresh)['jti']
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=jti))
+        blacklisted_tokens.add('expired', time.time() - 1)
+        blacklisted_tokens._synced_at = float('-inf')
+
+        self.assertIn(jti, blacklisted_tokens)
+        self.assertNotIn('expired', blacklisted_tokens)
+
+    def test_prune_tokens_deletes_expired_rows_in_batches(self):
+        expired = [
+            OutstandingToken.objects.create(jti=f'old-{n}', token='', expires_at=aware_utcnow() - timedelta(days=1))
+            for n in range(5)
+        ]
+        BlacklistedToken.objects.create(token=expired[0])
+
+        call_command('prune_tokens', batch_size=2, stdout=io.StringIO())
+
+        remaining = OutstandingToken.objects.values_list('jti', flat=True)
+        self.assertEqual(list(remaining), [UserRefreshToken(self.refresh)['jti']])
+        self.assertFalse(BlacklistedToken.objects.exists())
+
+
+class StartupImportTests(SimpleTestCase):
+    def test_url_loading_does_not_import_provider_libraries(self):
+        script = SCRIPT.format(module='hartazone.wsgi') + f'; import sys; print(sorted(set({LAZY_MODULES!r}) & set(sys.modules)))'
+        result = subprocess.run(
+            [sys.executable, '-c', script], capture_output=True, text=True, cwd=settings.BASE_DIR, check=True
+        )
+        self.assertEqual(result.stdout.strip(), '[]')
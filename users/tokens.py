@@ -0,0 +1,78 @@
+﻿from __future__ import annotations
+
+import time
+
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .blacklist import blacklisted_tokens
+
+CLAIMS_AT = 'claims_at'
+
+
+class UserRefreshToken(RefreshToken):
+    """
+    A refresh token carrying the user's email and role.
+
+    `claims_at` records when those claims were read from the database, so
+    `ClaimsJWTAuthentication` can tell whether they predate a role change or
+    a deactivation. Refreshing re-reads them, so the rotated refresh token
+    and the new access token carry the user's current role.
+
+    The blacklist is checked against this worker's `BlacklistFilter`
+    instead of a query per refresh. Blacklisting is what rotation already
+    writes, and fails for a token some other request blacklisted first.
+    """
+
+    @classmethod
+    def for_user(cls, user) -> 'UserRefreshToken':
+        token = super().for_user(user)
+        token.stamp(user)
+        return token
+
+    def stamp(self, user) -> None:
+        self['email'] = user.email
+        self['role'] = user.role
+        self[CLAIMS_AT] = int(time.time())
+
+    @property
+    def access_token(self) -> AccessToken:
+        if self.token is not None:
+            user = get_user_model().objects.filter(
+                **{api_settings.USER_ID_FIELD: self.payload.get(api_settings.USER_ID_CLAIM)}
+            ).first()
+            if user is not None:
+                self.stamp(user)
+        return super().access_token
+
+    def check_blacklist(self) -> None:
+        if self.payload[api_settings.JTI_CLAIM] in blacklisted_tokens:
+            raise TokenError(_('Token is blacklisted'))
+
+    def blacklist(self) -> tuple[BlacklistedToken, bool]:
+        token, _created = OutstandingToken.objects.get_or_create(
+            jti=self.payload[api_settings.JTI_CLAIM], defaults=self._outstanding_defaults()
+        )
+        blacklisted, created = BlacklistedToken.objects.get_or_create(token=token)
+        if not created:
+            raise TokenError(_('Token is blacklisted'))
+        blacklisted_tokens.add(token.jti, self.payload['exp'])
+        return blacklisted, created
+
+    def outstand(self) -> tuple[OutstandingToken, bool]:
+        return OutstandingToken.objects.get_or_create(
+            jti=self.payload[api_settings.JTI_CLAIM], defaults=self._outstanding_defaults()
+        )
+
+    def _outstanding_defaults(self) -> dict:
+        return {
+            'user_id': self.payload.get(api_settings.USER_ID_CLAIM),
+            'created_at': self.current_time,
+            'token': str(self),
+            'expires_at': datetime_from_epoch(self.payload['exp']),
+        }
@@ -5,7 +5,6 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.exceptions import TokenError
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 
 from .models import SocialAccount, User
@@ -16,6 +15,7 @@ from .serializers import (
     UserSerializer,
     UserTokenObtainPairSerializer,
 )
+from .tokens import UserRefreshToken
 
 
 class RegisterView(generics.GenericAPIView):
@@ -27,7 +27,7 @@ class RegisterView(generics.GenericAPIView):
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
 
-        refresh = RefreshToken.for_user(user)
+        refresh = UserRefreshToken.for_user(user)
         data = {
             'user': UserSerializer(user).data,
             'refresh': str(refresh),
@@ -65,7 +65,7 @@ class LogoutView(APIView):
             return Response({'detail': 'Refresh token is required.'}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            token = RefreshToken(refresh_token)
+            token = UserRefreshToken(refresh_token)
             token.blacklist()
         except TokenError:
             return Response({'detail': 'Invalid refresh token.'}, status=status.HTTP_400_BAD_REQUEST)
@@ -123,7 +123,7 @@ class SocialLoginView(generics.GenericAPIView):
             account.user = user
             account.save(update_fields=['user'])
 
-        refresh = RefreshToken.for_user(user)
+        refresh = UserRefreshToken.for_user(user)
         data = {
             'user': UserSerializer(user).data,
             'refresh': str(refresh),